@@ -6,9 +6,11 @@ from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from .config import Config  # Az önce oluşturduğumuz config dosyasını import et
+from .replicas import RoutingSession
 
 # Eklentileri başlatıyoruz
-db = SQLAlchemy()
+# Oturum, @read_only endpoint'lerin okumalarını replikalara yönlendirir (app/replicas.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 bcrypt = Bcrypt()
 jwt = JWTManager()
@@ -18,12 +20,52 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Decimal/datetime/enum'u doğrudan kodlayan hızlı JSON sağlayıcı (orjson varsa)
+    from .json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
+    # Sadece PostgreSQL / SQLite; desteklenmeyen veritabanı başlangıçta reddedilir
+    from .db_pool import check_dialects, engine_options
+    check_dialects(app.config)
+
+    # Bağlantı havuzu ayarları (app/db_pool.py): DB_POOL_* -> SQLALCHEMY_ENGINE_OPTIONS
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+    # Okuma replikaları: DB_REPLICA_URLS -> 'replica_N' bind'leri
+    from .replicas import replica_binds
+    app.config['SQLALCHEMY_BINDS'] = {**(app.config.get('SQLALCHEMY_BINDS') or {}),
+                                      **replica_binds(app.config)}
+
     # Eklentileri uygulama ile ilişkilendiriyoruz
     db.init_app(app)
     migrate.init_app(app, db) # migrate'i db ile ilişkilendir
     bcrypt.init_app(app)
     jwt.init_app(app)
 
+    # bcrypt işlemleri için sınırlı thread havuzu (app/hashing.py)
+    from .hashing import password_hasher
+    password_hasher.init_app(app)
+
+    # İstek başına sorgu sayacı, bütçe ve N+1 dedektörü (app/query_budget.py)
+    from .query_budget import query_monitor
+    query_monitor.init_app(app)
+
+    # Okuma/yazma ayrımı ve yazma sonrası primary'ye yapışıklık
+    from .replicas import replica_router
+    replica_router.init_app(app)
+
+    # Serileştirilmiş varlık önbelleği (ilan detayları)
+    from .cache import entity_cache
+    entity_cache.init_app(app)
+
+    # Soğuk başlangıç / ilk istek gecikmesi raporu (app/warmup.py)
+    from .warmup import startup_report
+    startup_report.init_app(app)
+
+    # Takas eşleştirme indeksi (app/matchmaking.py)
+    from .matchmaking import swap_matcher
+    swap_matcher.init_app(app)
+
     # --- Blueprint Kayıtları Buraya Gelecek ---
     
     # 1. Auth (Kullanıcı Giriş/Kayıt) Blueprint'i
@@ -44,6 +86,14 @@ def create_app(config_class=Config):
     from .api.transactions import transactions_bp
     app.register_blueprint(transactions_bp, url_prefix='/api/transactions')
 
+    # Satıcı analitiği (özet tablolar)
+    from .api.analytics import analytics_bp
+    app.register_blueprint(analytics_bp, url_prefix='/api/analytics')
+
+    # İç (operasyonel) endpoint'ler: önbellek istatistikleri vb.
+    from .api.internal import internal_bp
+    app.register_blueprint(internal_bp, url_prefix='/api/internal')
+
     @app.route('/')
     def hello():
         return "Ürün Kiralama API'si Çalışıyor!"
@@ -0,0 +1,320 @@
+# /app/analytics.py
+
+"""
+Satıcı analitiği için artımlı olarak güncellenen özet tablolar.
+
+  seller_daily_stats       (seller_id, day)  satış/kiralama geliri, adetler, takas oranları
+  listing_daily_occupancy  (listing_id, day) onaylanmış kiralamaların kapsadığı günler
+
+Her işlem/teklif, oluşturulduğu güne (day) bir "katkı" yazar. Durum
+değiştiğinde eski durumun katkısı çıkarılıp yenisininki eklenir; bu yüzden
+tablolar her zaman rebuild_all() ile sıfırdan hesaplanacak değerlere eşittir.
+Güncellemeler, durumu değiştiren isteğin veritabanı işlemi (transaction)
+içinde tek bir INSERT ... ON CONFLICT DO UPDATE ile yapılır.
+
+/api/analytics/seller sadece bu tabloları okur; transactions ve swap_offers
+tablolarına dokunmaz.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, func, delete, text
+
+from app import db
+from app.models import (Listing, Transaction, SwapOffer, SellerDailyStats, ListingDailyOccupancy,
+                        ListingType, TransactionStatus, OfferStatus)
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+STATS_COUNTERS = ('sale_count', 'sale_revenue',
+                  'rental_request_count', 'rental_completed_count', 'rental_cancelled_count',
+                  'rental_revenue',
+                  'swap_offer_count', 'swap_accepted_count', 'swap_rejected_count')
+
+
+class InvalidAnalyticsParam(ValueError):
+    """from / to parametreleri geçersiz olduğunda fırlatılır."""
+
+
+# --- Katkılar (bir kaydın özet tablolara eklediği değerler) ---
+
+def _transaction_contribution(transaction_type, status, total_price):
+    if transaction_type == ListingType.SALE:
+        if status == TransactionStatus.COMPLETED:
+            return {'sale_count': 1, 'sale_revenue': total_price}
+        return {}
+
+    contribution = {'rental_request_count': 1}
+    if status == TransactionStatus.COMPLETED:
+        contribution.update(rental_completed_count=1, rental_revenue=total_price)
+    elif status == TransactionStatus.CANCELLED:
+        contribution['rental_cancelled_count'] = 1
+    return contribution
+
+
+def _offer_contribution(status):
+    contribution = {'swap_offer_count': 1}
+    if status == OfferStatus.ACCEPTED:
+        contribution['swap_accepted_count'] = 1
+    elif status == OfferStatus.REJECTED:
+        contribution['swap_rejected_count'] = 1
+    return contribution
+
+
+def _difference(new, old):
+    """new - old (sıfır olan sayaçlar atılır)."""
+    deltas = dict(new)
+    for key, value in old.items():
+        deltas[key] = deltas.get(key, 0) - value
+    return {key: value for key, value in deltas.items() if value}
+
+
+def _rental_days(transaction):
+    """Kiralamanın kapsadığı günler: [start_date, end_date)."""
+    day = transaction.start_date
+    while day < transaction.end_date:
+        yield day
+        day += timedelta(days=1)
+
+
+# --- Artımlı yazma ---
+
+def _insert_for_dialect():
+    # Desteklenen veritabanları (PostgreSQL, SQLite) create_app'te kontrol edilir
+    if db.session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _increment(model, key_columns, rows):
+    """
+    rows: [{anahtar kolonlar..., sayaç: artış, ...}, ...]
+    Satır yoksa oluşturur, varsa sayaçları artırır (upsert).
+    Tüm satırlar aynı sayaç kolonlarını içermelidir.
+    """
+    if not rows:
+        return
+    insert = _insert_for_dialect()
+    stmt = insert(model).values(rows)
+    counters = [key for key in rows[0] if key not in key_columns]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={name: getattr(model, name) + stmt.excluded[name] for name in counters}
+    )
+    db.session.execute(stmt)
+
+
+def _bump_seller_day(seller_id, created_at, deltas):
+    if deltas:
+        _increment(SellerDailyStats, ('seller_id', 'day'),
+                   [{'seller_id': seller_id, 'day': created_at.date(), **deltas}])
+
+
+def _bump_occupancy(transaction, seller_id, delta):
+    _increment(ListingDailyOccupancy, ('listing_id', 'day'), [
+        {'listing_id': transaction.listing_id, 'day': day, 'seller_id': seller_id, 'booked_count': delta}
+        for day in _rental_days(transaction)
+    ])
+
+
+def record_transaction(transaction, seller_id):
+    """Yeni bir işlemi (satış veya kiralama talebi) özetlere ekler. İşlem flush edilmiş olmalı."""
+    _bump_seller_day(seller_id, transaction.created_at, _transaction_contribution(
+        transaction.transaction_type, transaction.status, transaction.total_price))
+    if transaction.transaction_type == ListingType.RENT and transaction.status == TransactionStatus.COMPLETED:
+        _bump_occupancy(transaction, seller_id, 1)
+
+
+def record_transaction_status(transaction, seller_id, old_status, new_status):
+    """Bir işlemin durum değişikliğini (ör. PENDING -> COMPLETED) özetlere yansıtır."""
+    price = transaction.total_price
+    _bump_seller_day(seller_id, transaction.created_at, _difference(
+        _transaction_contribution(transaction.transaction_type, new_status, price),
+        _transaction_contribution(transaction.transaction_type, old_status, price)))
+
+    if transaction.transaction_type == ListingType.RENT:
+        if new_status == TransactionStatus.COMPLETED and old_status != TransactionStatus.COMPLETED:
+            _bump_occupancy(transaction, seller_id, 1)
+        elif old_status == TransactionStatus.COMPLETED and new_status != TransactionStatus.COMPLETED:
+            _bump_occupancy(transaction, seller_id, -1)
+
+
+def record_cancelled_requests(seller_id, created_ats):
+    """Toplu iptal edilen PENDING kiralama taleplerini (bkz. booking) özetlere yansıtır."""
+    per_day = defaultdict(int)
+    for created_at in created_ats:
+        per_day[created_at.date()] += 1
+    _increment(SellerDailyStats, ('seller_id', 'day'), [
+        {'seller_id': seller_id, 'day': day, 'rental_cancelled_count': count}
+        for day, count in per_day.items()
+    ])
+
+
+def record_offer(offer, seller_id):
+    """Yeni bir takas teklifini özetlere ekler. Teklif flush edilmiş olmalı."""
+    _bump_seller_day(seller_id, offer.created_at, _offer_contribution(offer.status))
+
+
+def record_offer_status(offer, seller_id, old_status, new_status):
+    """Bir teklifin durum değişikliğini özetlere yansıtır."""
+    _bump_seller_day(seller_id, offer.created_at,
+                     _difference(_offer_contribution(new_status), _offer_contribution(old_status)))
+
+
+# --- Yeniden hesaplama (backfill) ---
+
+def rebuild_all(batch_size=1000):
+    """
+    Özet tabloları transactions ve swap_offers'tan sıfırdan hesaplar.
+    Tek bir veritabanı işleminde çalışır; okuyucular eski ya da yeni
+    değerleri görür. Dönüş: (seller_daily_stats satırı, doluluk satırı).
+
+    Artımlı upsert'ler (record_*) yeniden hesaplama boyunca bekler: özet
+    tablolar kaynaklar okunmadan önce kilitlenir (bkz. _lock_summary_tables).
+    Aksi halde okumadan sonra commit edilen bir katkı DELETE ile silinir,
+    INSERT edilen yeni değerlerde de yer almaz.
+    """
+    _lock_summary_tables()
+    day_of = func.date(Transaction.created_at, type_=db.Date)
+    stats = defaultdict(lambda: dict.fromkeys(STATS_COUNTERS, 0))
+
+    # --- 1. İşlemler: (satıcı, gün, tür, durum) başına tek satır ---
+    transaction_groups = db.session.execute(
+        select(Listing.lister_id, day_of, Transaction.transaction_type, Transaction.status,
+               func.count(Transaction.id), func.coalesce(func.sum(Transaction.total_price), 0))
+        .join(Listing, Listing.id == Transaction.listing_id)
+        .group_by(Listing.lister_id, day_of, Transaction.transaction_type, Transaction.status)
+    )
+    for seller_id, day, transaction_type, status, count, total in transaction_groups:
+        contribution = _transaction_contribution(transaction_type, status, Decimal(1))
+        counters = stats[(seller_id, day)]
+        for name, value in contribution.items():
+            # Gelir kolonları toplam fiyat, adet kolonları satır sayısı kadar artar
+            counters[name] += total if name.endswith('_revenue') else count * value
+
+    # --- 2. Takas teklifleri ---
+    offer_day = func.date(SwapOffer.created_at, type_=db.Date)
+    offer_groups = db.session.execute(
+        select(Listing.lister_id, offer_day, SwapOffer.status, func.count(SwapOffer.id))
+        .join(Listing, Listing.id == SwapOffer.target_listing_id)
+        .group_by(Listing.lister_id, offer_day, SwapOffer.status)
+    )
+    for seller_id, day, status, count in offer_groups:
+        counters = stats[(seller_id, day)]
+        for name, value in _offer_contribution(status).items():
+            counters[name] += count * value
+
+    # --- 3. Doluluk: onaylanmış kiralamaların günleri ---
+    occupancy = defaultdict(int)
+    completed_rentals = db.session.execute(
+        select(Transaction.listing_id, Transaction.start_date, Transaction.end_date, Listing.lister_id)
+        .join(Listing, Listing.id == Transaction.listing_id)
+        .where(Transaction.transaction_type == ListingType.RENT,
+               Transaction.status == TransactionStatus.COMPLETED)
+        .execution_options(yield_per=batch_size)
+    )
+    for rental in completed_rentals:
+        for day in _rental_days(rental):
+            occupancy[(rental.listing_id, day, rental.lister_id)] += 1
+
+    # --- 4. Tabloları değiştir (eski satırlar _lock_summary_tables'ta silindi) ---
+    stats_rows = [{'seller_id': seller_id, 'day': day, **counters}
+                  for (seller_id, day), counters in stats.items()]
+    occupancy_rows = [{'listing_id': listing_id, 'day': day, 'seller_id': seller_id, 'booked_count': count}
+                      for (listing_id, day, seller_id), count in occupancy.items()]
+    for rows, model in ((stats_rows, SellerDailyStats), (occupancy_rows, ListingDailyOccupancy)):
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(model.__table__.insert(), rows[start:start + batch_size])
+    db.session.commit()
+    return len(stats_rows), len(occupancy_rows)
+
+
+def _lock_summary_tables():
+    """
+    rebuild_all'un işlemi commit edilene kadar özet tablolara başka yazma yapılamaz.
+    PostgreSQL: EXCLUSIVE kilit; düz SELECT'lere izin verir, INSERT/UPDATE'leri
+    bekletir. Kilit, tabloya yazmış ama henüz commit etmemiş işlemleri de bekler;
+    kaynaklar ancak onlar bittikten sonra okunur.
+    Eski satırlar burada silinir; SQLite'ta bu ilk yazma veritabanının yazma
+    kilidini alır ve diğer yazanları commit'e kadar bekletir.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text(f'LOCK TABLE {SellerDailyStats.__tablename__}, '
+                                f'{ListingDailyOccupancy.__tablename__} IN EXCLUSIVE MODE'))
+    db.session.execute(delete(SellerDailyStats))
+    db.session.execute(delete(ListingDailyOccupancy))
+
+
+# --- Okuma ---
+
+def parse_range(args, today=None):
+    """?from=YYYY-MM-DD&to=YYYY-MM-DD (iki uç dahil). Varsayılan: son 30 gün."""
+    today = today or datetime.utcnow().date()
+    try:
+        end = date.fromisoformat(args['to']) if args.get('to') else today
+        start = date.fromisoformat(args['from']) if args.get('from') \
+            else end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    except ValueError:
+        raise InvalidAnalyticsParam('Tarih formatı geçersiz. Lütfen "YYYY-MM-DD" formatını kullanın.')
+
+    if end < start:
+        raise InvalidAnalyticsParam('to tarihi, from tarihinden önce olamaz.')
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise InvalidAnalyticsParam(f'Tarih aralığı en fazla {MAX_RANGE_DAYS} gün olabilir.')
+    return start, end
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def seller_summary(seller_id, start, end):
+    """Satıcının [start, end] aralığındaki günlük serisi, toplamları ve ilan doluluğu."""
+    rows = SellerDailyStats.query.filter(
+        SellerDailyStats.seller_id == seller_id,
+        SellerDailyStats.day >= start,
+        SellerDailyStats.day <= end
+    ).order_by(SellerDailyStats.day).all()
+
+    days = []
+    totals = dict.fromkeys(STATS_COUNTERS, 0)
+    for row in rows:
+        day_data = {name: getattr(row, name) for name in STATS_COUNTERS}
+        for name, value in day_data.items():
+            totals[name] += value
+        day_data['revenue'] = row.sale_revenue + row.rental_revenue
+        days.append({'day': row.day.isoformat(), **day_data})
+
+    totals['revenue'] = totals['sale_revenue'] + totals['rental_revenue']
+    # Kabul oranı: yanıtlanan teklifler içinde kabul edilenler
+    totals['swap_acceptance_rate'] = _rate(
+        totals['swap_accepted_count'], totals['swap_accepted_count'] + totals['swap_rejected_count'])
+
+    window_days = (end - start).days + 1
+    booked = db.session.execute(
+        select(ListingDailyOccupancy.listing_id, func.count())
+        .where(ListingDailyOccupancy.seller_id == seller_id,
+               ListingDailyOccupancy.day >= start,
+               ListingDailyOccupancy.day <= end,
+               ListingDailyOccupancy.booked_count > 0)
+        .group_by(ListingDailyOccupancy.listing_id)
+        .order_by(ListingDailyOccupancy.listing_id)
+    ).all()
+    occupancy = [{
+        'listing_id': listing_id,
+        'booked_days': booked_days,
+        'occupancy_rate': _rate(booked_days, window_days)
+    } for listing_id, booked_days in booked]
+
+    return {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'days': days,
+        'totals': totals,
+        'occupancy': occupancy
+    }
@@ -0,0 +1,29 @@
+# /app/api/analytics.py
+
+from flask import request, jsonify, Blueprint
+from app import analytics
+from app.query_budget import query_budget
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+analytics_bp = Blueprint('analytics', __name__)
+
+
+@analytics_bp.route('/seller', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_seller_analytics():
+    """
+    Giriş yapmış satıcının günlük gelir serisi, kiralama doluluk oranları ve
+    takas kabul oranı. ?from=YYYY-MM-DD&to=YYYY-MM-DD (varsayılan: son 30 gün)
+
+    Sadece özet tabloları okur (bkz. app/analytics.py); maliyet işlem
+    sayısından değil, tarih aralığındaki gün sayısından bağımsızdır.
+    """
+    current_user_id = int(get_jwt_identity())
+
+    try:
+        start, end = analytics.parse_range(request.args)
+    except analytics.InvalidAnalyticsParam as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify(analytics.seller_summary(current_user_id, start, end)), 200
@@ -3,12 +3,20 @@
 from flask import request, jsonify, Blueprint
 from app.models import User
 from app import db, bcrypt, jwt
+from app.hashing import password_hasher, HasherBusy
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 
 # 'auth' adında yeni bir Blueprint (alt-rota grubu) oluşturuyoruz
 auth_bp = Blueprint('auth', __name__)
 
 
+def _busy_response():
+    """Şifre hash havuzu dolu: istemci kısa süre sonra tekrar denemeli."""
+    response = jsonify({'message': 'Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin.'})
+    response.headers['Retry-After'] = '1'
+    return response, 503 # 503 Service Unavailable
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Kullanıcı Kayıt Endpoint'i"""
@@ -35,7 +43,10 @@ def register():
         email=email
     )
     # Şifreyi modeldeki set_password metoduyla hash'leyerek ata
-    new_user.set_password(password)
+    try:
+        new_user.set_password(password)
+    except HasherBusy:
+        return _busy_response()
     
     # 4. Veritabanına kaydet
     db.session.add(new_user)
@@ -62,8 +73,23 @@ def login():
 
     # 3. Kullanıcı var mı ve şifre doğru mu kontrol et
     #    (models.py'de yazdığımız check_password metodunu kullanıyoruz)
-    if not user or not user.check_password(password):
-        return jsonify({'message': 'Geçersiz kullanıcı adı veya şifre.'}), 401 # 401 Unauthorized
+    #    Kullanıcı yoksa bcrypt havuzunda yer tutmayan sahte bir kontrol yapılır;
+    #    yanıt bir bcrypt doğrulaması kadar bekletilir, süreden kullanıcı adının
+    #    var olup olmadığı anlaşılamaz (bkz. PasswordHasher.verify_dummy).
+    try:
+        if not user:
+            password_hasher.verify_dummy(password)
+            return jsonify({'message': 'Geçersiz kullanıcı adı veya şifre.'}), 401 # 401 Unauthorized
+
+        if not user.check_password(password):
+            return jsonify({'message': 'Geçersiz kullanıcı adı veya şifre.'}), 401
+
+        # Maliyet faktörü değiştiyse, elimizde düz şifre varken yeniden hash'le
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+    except HasherBusy:
+        return _busy_response()
 
     # 4. Şifre doğruysa, bir JWT (JSON Web Token) oluştur
     #    Bu token, kullanıcının kimliğini kanıtlar
@@ -0,0 +1,78 @@
+# /app/api/internal.py
+
+import hmac
+from functools import wraps
+
+from flask import request, jsonify, Blueprint, current_app
+from app import db
+from app.cache import entity_cache
+from app.db_pool import pool_status
+from app.matchmaking import swap_matcher
+from app.query_budget import query_monitor
+from app.replicas import replica_router
+from app.warmup import startup_report
+
+# Operasyonel (iç) endpoint'ler. X-Internal-Token başlığı INTERNAL_API_TOKEN ile
+# eşleşmelidir. Token ayarlı değilse endpoint'ler kapalıdır (404); sadece
+# DEBUG / TESTING modunda token olmadan açılır.
+internal_bp = Blueprint('internal', __name__)
+
+
+def internal_token_error():
+    """İstek iç token'ı taşımıyorsa hata yanıtı, taşıyorsa None."""
+    expected = current_app.config.get('INTERNAL_API_TOKEN')
+    if not expected:
+        if current_app.debug or current_app.testing:
+            return None
+        return jsonify({'message': 'Bulunamadı.'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Internal-Token', '').encode(), expected.encode()):
+        return jsonify({'message': 'Yetkisiz erişim.'}), 403
+    return None
+
+
+def internal_token_required(view):
+    """Blueprint dışındaki iç endpoint'ler (ör. ilan kataloğu dışa aktarımı) için aynı kontrol."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return internal_token_error() or view(*args, **kwargs)
+    return wrapper
+
+
+@internal_bp.before_request
+def check_internal_token():
+    return internal_token_error()
+
+
+@internal_bp.route('/cache', methods=['GET'])
+def get_cache_stats():
+    """Varlık önbelleğinin hit/miss/eviction sayaçlarını döner."""
+    return jsonify({'entity_cache': entity_cache.stats_dict()}), 200
+
+
+@internal_bp.route('/db-pool', methods=['GET'])
+def get_db_pool_stats():
+    """
+    Bağlantı havuzlarının anlık durumu (checked_out, overflow) ve birikmiş
+    metrikleri (checkout bekleme süresi, zaman aşımları). Bind başına bir kayıt;
+    'routing' replika yönlendirme sayaçlarını içerir.
+    """
+    pools = {bind_key or 'default': pool_status(engine) for bind_key, engine in db.engines.items()}
+    return jsonify({'pools': pools, 'routing': replica_router.status()}), 200
+
+
+@internal_bp.route('/queries', methods=['GET'])
+def get_query_stats():
+    """Endpoint bazında istek, sorgu sayısı, veritabanı süresi ve bütçe ihlalleri."""
+    return jsonify({'endpoints': query_monitor.stats.as_dict()}), 200
+
+
+@internal_bp.route('/startup', methods=['GET'])
+def get_startup_report():
+    """Bu worker'ın soğuk başlangıç süresi, ısıtma adımları ve ilk isteğinin gecikmesi."""
+    return jsonify({'startup': startup_report.as_dict()}), 200
+
+
+@internal_bp.route('/matchmaking', methods=['GET'])
+def get_matchmaking_status():
+    """Takas eşleştirme indeksinin boyutu, son tam kurulum ve son artımlı güncelleme."""
+    return jsonify({'matchmaking': swap_matcher.status()}), 200
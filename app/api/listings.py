@@ -1,14 +1,94 @@
 # /app/api/listings.py
 
 from flask import request, jsonify, Blueprint
+from datetime import datetime, timedelta
 from app.models import Product, Listing, ListingType
 from app import db
+from app.pagination import parse_limit, InvalidPageParam
+from app.search import search_active_listings
+from app.availability import load_rental_index, default_window
+from app.versioning import conditional_get, request_collection_version
+from app.cache import entity_cache
+from app.export import parse_export_args, stream_export, listings_export_statement, InvalidExportParam
+from app.api.internal import internal_token_required
+from app import bulk, feed, reads
+from app.bulk import parse_listing_type, listing_type_values, ListingDefinitionError
+from app.query_budget import query_budget
+from app.replicas import read_only
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 
 # 'listings' adında yeni bir Blueprint oluşturuyoruz
 listings_bp = Blueprint('listings', __name__)
 
 
+def _load_listing_details(listing_id):
+    """
+    Önbellek yükleyicisi: ilanı ürün ve ilan sahibiyle tek sorguda okur.
+    Dönüş: (serileştirilmiş ilan veya None, geçersiz kılma etiketleri)
+    """
+    listing = db.session.execute(reads.listing_details_statement([listing_id])).scalar()
+    if not listing:
+        return None, ()
+    return reads.serialize_listing(listing), reads.listing_cache_tags(listing)
+
+
+def _load_many_listing_details(keys):
+    """
+    Çoklu önbellek yükleyicisi: eksik ilanları tek bir IN sorgusuyla okur.
+    Dönüş: {'listing:<id>': (serileştirilmiş ilan, etiketler)}
+    """
+    ids = [int(key.split(':', 1)[1]) for key in keys]
+    listings = db.session.execute(reads.listing_details_statement(ids)).scalars()
+    return {
+        f'listing:{listing.id}': (reads.serialize_listing(listing), reads.listing_cache_tags(listing))
+        for listing in listings
+    }
+
+
+# Çoklu okumada (ids) tek istekte istenebilecek en fazla ilan
+MAX_MULTI_GET_IDS = 100
+
+
+def _parse_id(value):
+    """Sadece tam sayı (bool değil) veya rakamlardan oluşan metin; 1.5, true, '1e3' reddedilir."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value.strip())
+    raise InvalidPageParam('ids sadece tam sayılardan oluşmalıdır.')
+
+
+def _parse_ids(raw_ids):
+    """'1,2,3' veya [1, 2, 3] -> tekrarsız, sırası korunmuş id listesi."""
+    if isinstance(raw_ids, str):
+        raw_ids = [part for part in raw_ids.split(',') if part.strip()]
+    if not isinstance(raw_ids, list) or not raw_ids:
+        raise InvalidPageParam('ids boş olmayan bir id listesi olmalıdır.')
+    ids = list(dict.fromkeys(_parse_id(value) for value in raw_ids))
+    if len(ids) > MAX_MULTI_GET_IDS:
+        raise InvalidPageParam(f'Tek istekte en fazla {MAX_MULTI_GET_IDS} ilan istenebilir.')
+    return ids
+
+
+def _multi_get_response(raw_ids, version=None):
+    """
+    İlanları istenen sırada döner; bulunamayan id'ler 'missing_ids' içinde.
+    version: ETag'li yolda isteğin koleksiyon sürümü (eski önbellek kayıtları kullanılmaz).
+    """
+    try:
+        ids = _parse_ids(raw_ids)
+    except InvalidPageParam as e:
+        return jsonify({'message': str(e)}), 400
+
+    found = entity_cache.get_many_or_load([f'listing:{listing_id}' for listing_id in ids],
+                                          _load_many_listing_details, version=version)
+    return jsonify({
+        'listings': [found[f'listing:{listing_id}'] for listing_id in ids if f'listing:{listing_id}' in found],
+        'missing_ids': [listing_id for listing_id in ids if f'listing:{listing_id}' not in found]
+    }), 200
+
+
 @listings_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_listing():
@@ -26,9 +106,9 @@ def create_listing():
         return jsonify({'message': 'product_id ve listing_type zorunludur.'}), 400
 
     try:
-        listing_type = ListingType(listing_type_str)
-    except ValueError:
-        return jsonify({'message': "Geçersiz listing_type. 'sale', 'rent' veya 'swap' olmalı."}), 400
+        listing_type = parse_listing_type(listing_type_str)
+    except ListingDefinitionError as e:
+        return jsonify({'message': str(e)}), 400
 
     # --- 2. Ürün Sahipliği Doğrulaması ---
     product = Product.query.get(product_id)
@@ -39,30 +119,18 @@ def create_listing():
     if product.owner_id != current_user_id:
         return jsonify({'message': 'Sadece kendi ürünleriniz için ilan oluşturabilirsiniz.'}), 403
 
-    # --- 3. İlan Türüne Göre Veri Doğrulaması ---
+    # --- 3. İlan Türüne Göre Veri Doğrulaması (kurallar app/bulk.py'de, toplu ekleme ile ortak) ---
+    try:
+        type_values = listing_type_values(listing_type, data)
+    except ListingDefinitionError as e:
+        return jsonify({'message': str(e)}), 400
+
     new_listing = Listing(
         product_id=product_id,
         lister_id=current_user_id,
-        listing_type=listing_type
+        listing_type=listing_type,
+        **type_values
     )
-
-    if listing_type == ListingType.SALE:
-        price = data.get('price')
-        if not price:
-            return jsonify({'message': 'Satış ilanları için "price" zorunludur.'}), 400
-        new_listing.price = price
-
-    elif listing_type == ListingType.RENT:
-        rental_price_per_day = data.get('rental_price_per_day')
-        if not rental_price_per_day:
-            return jsonify({'message': 'Kiralama ilanları için "rental_price_per_day" zorunludur.'}), 400
-        new_listing.rental_price_per_day = rental_price_per_day
-
-    elif listing_type == ListingType.SWAP:
-        swap_preference = data.get('swap_preference')
-        if not swap_preference:
-            return jsonify({'message': 'Takas ilanları için "swap_preference" (takasta ne istediğiniz) zorunludur.'}), 400
-        new_listing.swap_preference = swap_preference
     
     # --- 4. Kaydetme ---
     try:
@@ -78,89 +146,263 @@ def create_listing():
     }), 201
 
 
+@listings_bp.route('/bulk', methods=['POST'])
+@query_budget(6)
+@jwt_required()
+def create_listings_bulk():
+    """
+    Mevcut ürünler için toplu ilan oluşturur: {"items": [{product_id, listing_type, ...}, ...]}
+    Önce tüm öğeler doğrulanır; hatalı öğe varsa hiçbir ilan oluşturulmaz.
+    """
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+
+    count_error = bulk.check_item_count(items)
+    if count_error:
+        return jsonify({'message': count_error}), 400
+
+    # --- 1. Doğrulama (yazmadan önce, tek sorguda sahiplik kontrolü) ---
+    listing_rows, errors = bulk.validate_listing_items(current_user_id, items)
+    if errors:
+        return jsonify({'message': 'Hatalı öğeler var, hiçbir ilan oluşturulmadı.', 'errors': errors}), 400
+
+    # --- 2. Toplu ekleme (tek işlem) ---
+    try:
+        results = bulk.create_listings(listing_rows)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'message': 'Ürünlerden biri için bu arada ilan oluşturulmuş olabilir.', 'error': str(e.orig)}), 409
+
+    return jsonify({
+        'message': f'{len(results)} ilan başarıyla oluşturuldu.',
+        'results': results
+    }), 201
+
+
 @listings_bp.route('/', methods=['GET'])
+@query_budget(3)
+@read_only
+@conditional_get()
 def get_all_active_listings():
     """
     Tüm aktif ilanları (satış, kiralama, takas) listeler.
     Bu herkese açık bir rotadır, token gerektirmez.
+
+    Keyset (cursor) sayfalama kullanır: ?limit=20&after=<next_cursor>
+    Ürün ve ilan sahibi aynı sorguda (JOIN) yüklenir; her sayfa sabit
+    sayıda sorguyla döner.
+
+    Filtreler ve sıralama (app/feed.py): ?listing_type= ?category=
+    ?min_price= ?max_price= ?sort=newest|price_asc|price_desc
+    ?facets=1 ile kategori ve tür sayıları tek bir GROUP BY sorgusuyla eklenir.
+
+    ?ids=1,2,3 verilirse akış yerine bu ilanlar (aktif olmasalar da) istenen
+    sırada tek sorguda döner (sepet, kayıtlı ilanlar vb.).
     """
-    listings = Listing.query.filter_by(is_active=True).all()
-    
-    output = []
-    for listing in listings:
-        product = listing.product 
-        lister = listing.lister
+    if 'ids' in request.args:
+        return _multi_get_response(request.args['ids'], version=request_collection_version())
 
-        listing_data = {
-            'listing_id': listing.id,
-            'listing_type': listing.listing_type.value,
-            'is_active': listing.is_active,
-            'created_at': listing.created_at,
-            'product_details': {
-                'product_id': product.id,
-                'title': product.title,
-                'description': product.description,
-                'category': product.category,
-                'image_url': product.image_url
-            },
-            'lister_details': {
-                'username': lister.username
-            }
-        }
-        
-        if listing.listing_type == ListingType.SALE:
-            listing_data['price'] = float(listing.price)
-        elif listing.listing_type == ListingType.RENT:
-            listing_data['rental_price_per_day'] = float(listing.rental_price_per_day)
-        elif listing.listing_type == ListingType.SWAP:
-            listing_data['swap_preference'] = listing.swap_preference
-            
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        filters = feed.parse_feed_filters(request.args)
+        stmt = reads.feed_statement(limit, after=request.args.get('after'), filters=filters)
+    except (InvalidPageParam, feed.InvalidFeedParam) as e:
+        return jsonify({'message': str(e)}), 400
+
+    rows = db.session.execute(stmt).scalars().all()
+    listings, next_cursor = feed.split_feed_page(rows, filters, limit)
+    output = [reads.serialize_listing(listing) for listing in listings]
+
+    response = {'listings': output, 'next_cursor': next_cursor}
+    if feed.wants_facets(request.args):
+        response['facets'] = feed.fold_facets(db.session.execute(feed.facets_statement(filters)).all(), filters)
+    return jsonify(response), 200
+
+
+@listings_bp.route('/batch', methods=['POST'])
+@query_budget(2)
+@read_only
+def get_listings_batch():
+    """
+    ?ids= ile aynı, ancak id listesi gövdede gelir: {"ids": [1, 2, 3]}
+    veya doğrudan [1, 2, 3]. (Uzun listeler URL sınırına takılmasın diye.)
+    ETag yoktur; koleksiyon sürümü yine okunur ki başka bir worker'ın
+    değişikliğinden önce yazılmış önbellek kayıtları kullanılmasın.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('ids')
+    return _multi_get_response(data, version=request_collection_version())
+
+
+@listings_bp.route('/search', methods=['GET'])
+@query_budget(2)
+@read_only
+@conditional_get()
+def search_listings():
+    """
+    Aktif ilanlarda ürün başlığı, açıklaması ve kategorisi üzerinden
+    tam metin arama yapar: ?q=kamera&limit=20&page=1
+    Sonuçlar alakaya (rank) göre sıralanır. Herkese açık bir rotadır.
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'message': '"q" (arama ifadesi) zorunludur.'}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        page = int(request.args.get('page', 1))
+    except InvalidPageParam as e:
+        return jsonify({'message': str(e)}), 400
+    except ValueError:
+        return jsonify({'message': 'page bir tam sayı olmalıdır.'}), 400
+    if page < 1:
+        return jsonify({'message': 'page en az 1 olmalıdır.'}), 400
+
+    results = search_active_listings(q, limit, offset=(page - 1) * limit)
+    has_more = len(results) > limit
+
+    output = []
+    for listing, rank in results[:limit]:
+        listing_data = reads.serialize_listing(listing)
+        listing_data['rank'] = rank
         output.append(listing_data)
-        
-    return jsonify({'listings': output}), 200
+
+    return jsonify({
+        'listings': output,
+        'page': page,
+        'next_page': page + 1 if has_more else None
+    }), 200
+
+
+@listings_bp.route('/export', methods=['GET'])
+@internal_token_required
+def export_listings():
+    """
+    Tüm ilan kataloğunu (aktif ve pasif) NDJSON veya CSV olarak akıtır.
+    ?format=ndjson|csv&updated_since=2025-01-31T00:00:00
+    updated_since verilirse sadece ilanı veya ürünü o tarihten sonra
+    değişmiş satırlar döner (artımlı çekim). Analitik ve iş ortağı
+    beslemeleri içindir: X-Internal-Token başlığı zorunludur.
+    """
+    try:
+        fmt, updated_since = parse_export_args(request.args)
+    except InvalidExportParam as e:
+        return jsonify({'message': str(e)}), 400
+
+    return stream_export(listings_export_statement(updated_since), fmt, 'listings')
 
 
 @listings_bp.route('/<int:listing_id>', methods=['GET'])
+@query_budget(2)
+@read_only
+@conditional_get()
 def get_listing_details(listing_id):
     """
     Belirli bir ilanın tüm detaylarını getirir.
     Bu herkese açık bir rotadır.
     """
     
-    # 1. İlanı bul
+    # 1. İlanı önbellekten al; yoksa tek sorguda yükleyip serileştir.
+    #    ETag'in sürümünden eski önbellek kaydı kullanılmaz (bkz. app/cache.py)
+    listing_data = entity_cache.get_or_load(
+        f'listing:{listing_id}',
+        lambda: _load_listing_details(listing_id),
+        version=request_collection_version()
+    )
+    if listing_data is None:
+        return jsonify({'message': 'İlan bulunamadı.'}), 404
+
+    return jsonify({'listing': listing_data}), 200
+
+
+# Tek istekte sorgulanabilecek en uzun takvim penceresi
+MAX_AVAILABILITY_DAYS = 366
+# ?check= ile tek istekte sorulabilecek en fazla aday aralık
+MAX_AVAILABILITY_CHECKS = 50
+
+
+def _parse_check_ranges(raw):
+    """'2026-01-01..2026-01-05,2026-02-01..2026-02-03' -> [(start, end), ...]; hatalıysa ValueError."""
+    ranges = []
+    for part in raw.split(','):
+        start_str, separator, end_str = part.strip().partition('..')
+        if not separator:
+            raise ValueError(part)
+        start = datetime.strptime(start_str, '%Y-%m-%d').date()
+        end = datetime.strptime(end_str, '%Y-%m-%d').date()
+        if end <= start:
+            raise ValueError(part)
+        ranges.append((start, end))
+    return ranges
+
+
+@listings_bp.route('/<int:listing_id>/availability', methods=['GET'])
+@query_budget(2)
+@read_only
+def get_listing_availability(listing_id):
+    """
+    Bir kiralama ilanının takvimini döner: ?from=YYYY-MM-DD&to=YYYY-MM-DD
+    Dolu (birleştirilmiş) aralıklar ve boş aralıklar tek sorguyla hesaplanır.
+    Aralıklar [start, end) şeklindedir: end günü yeni kiralama başlayabilir.
+
+    ?check=2026-07-01..2026-07-05,2026-08-10..2026-08-12 ile aday aralıkların
+    her biri için 'free' döner; kiralamalar yine tek sorguda okunur, her aday
+    IntervalIndex.is_free ile O(log n) sürede kontrol edilir.
+    Bu herkese açık bir rotadır.
+    """
     listing = Listing.query.get(listing_id)
     if not listing:
         return jsonify({'message': 'İlan bulunamadı.'}), 404
+    if listing.listing_type != ListingType.RENT:
+        return jsonify({'message': 'Takvim sadece "rent" (kiralama) tipindeki ilanlar içindir.'}), 400
 
-    # 3. İlan detaylarını JSON formatına dönüştür
-    product = listing.product 
-    lister = listing.lister
-
-    listing_data = {
+    # --- 1. Tarih penceresini ve aday aralıkları belirle ---
+    try:
+        window_start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() \
+            if request.args.get('from') else datetime.utcnow().date()
+        window_start, window_end = default_window(window_start)
+        if request.args.get('to'):
+            window_end = datetime.strptime(request.args['to'], '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'message': 'Tarih formatı geçersiz. Lütfen "YYYY-MM-DD" formatını kullanın.'}), 400
+
+    if window_end <= window_start:
+        return jsonify({'message': '"to" tarihi "from" tarihinden sonra olmalıdır.'}), 400
+    if window_end - window_start > timedelta(days=MAX_AVAILABILITY_DAYS):
+        return jsonify({'message': f'Takvim penceresi en fazla {MAX_AVAILABILITY_DAYS} gün olabilir.'}), 400
+
+    checks = []
+    if request.args.get('check'):
+        try:
+            checks = _parse_check_ranges(request.args['check'])
+        except ValueError:
+            return jsonify({'message': '"check" biçimi geçersiz. Örnek: '
+                                       '"2026-07-01..2026-07-05,2026-08-10..2026-08-12" (bitiş > başlangıç).'}), 400
+        if len(checks) > MAX_AVAILABILITY_CHECKS:
+            return jsonify({'message': f'En fazla {MAX_AVAILABILITY_CHECKS} aralık kontrol edilebilir.'}), 400
+
+    # --- 2. Pencere ve adayları kapsayan kiralamaları tek sorguda oku, aralık yapısını kur ---
+    load_start = min([window_start] + [start for start, _ in checks])
+    load_end = max([window_end] + [end for _, end in checks])
+    index = load_rental_index(listing_id, load_start, load_end)
+
+    def as_json(intervals):
+        return [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in intervals]
+
+    response = {
         'listing_id': listing.id,
-        'listing_type': listing.listing_type.value,
-        'is_active': listing.is_active, 
-        'created_at': listing.created_at,
-        'product_details': {
-            'product_id': product.id,
-            'title': product.title,
-            'description': product.description,
-            'category': product.category,
-            'image_url': product.image_url
-        },
-        'lister_details': {
-            'username': lister.username
-        }
+        'from': window_start.isoformat(),
+        'to': window_end.isoformat(),
+        'busy': as_json(index.busy_between(window_start, window_end)),
+        'free': as_json(index.free_between(window_start, window_end))
     }
-    
-    if listing.listing_type == ListingType.SALE:
-        listing_data['price'] = float(listing.price)
-    elif listing.listing_type == ListingType.RENT:
-        listing_data['rental_price_per_day'] = float(listing.rental_price_per_day)
-    elif listing.listing_type == ListingType.SWAP:
-        listing_data['swap_preference'] = listing.swap_preference
-            
-    return jsonify({'listing': listing_data}), 200
+    if checks:
+        response['checks'] = [{'start': start.isoformat(), 'end': end.isoformat(),
+                               'free': index.is_free(start, end)} for start, end in checks]
+    return jsonify(response), 200
 
 
 @listings_bp.route('/<int:listing_id>', methods=['PUT'])
@@ -251,7 +493,7 @@ def get_my_listings():
         
         listing_data = {
             'listing_id': listing.id,
-            'listing_type': listing.listing_type.value,
+            'listing_type': listing.listing_type,
             'is_active': listing.is_active, # Durumu (aktif/satılmış/silinmiş)
             'product_title': product.title,
             'created_at': listing.created_at
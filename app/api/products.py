@@ -3,6 +3,9 @@
 from flask import request, jsonify, Blueprint
 from app.models import Product, User
 from app import db
+from app import search, bulk
+from app.query_budget import query_budget
+from sqlalchemy.exc import IntegrityError
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 # 'products' adında yeni bir Blueprint oluşturuyoruz
@@ -34,6 +37,8 @@ def create_product():
     )
     
     db.session.add(new_product)
+    db.session.flush() # id'nin oluşması için
+    search.index_product(new_product) # Tam metin arama indeksini güncelle
     db.session.commit()
     
     # (Daha iyi bir API için, oluşturulan ürünün JSON halini döndürmek iyidir)
@@ -47,6 +52,43 @@ def create_product():
     }), 201
 
 
+@products_bp.route('/bulk', methods=['POST'])
+@query_budget(10)
+@jwt_required()
+def create_products_bulk():
+    """
+    Toplu ürün (ve isteğe bağlı ilan) oluşturur. Envanter içe aktarımı içindir.
+    {"items": [{"title", "category", "description"?, "image_url"?,
+                "listing"?: {"listing_type", "price" | "rental_price_per_day" | "swap_preference"}}, ...]}
+    Önce tüm öğeler doğrulanır; hatalı öğe varsa hiçbir şey yazılmaz.
+    """
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+
+    count_error = bulk.check_item_count(items)
+    if count_error:
+        return jsonify({'message': count_error}), 400
+
+    # 1. Doğrulama (veritabanına dokunmadan)
+    valid_items, errors = bulk.validate_product_items(items)
+    if errors:
+        return jsonify({'message': 'Hatalı öğeler var, hiçbir ürün oluşturulmadı.', 'errors': errors}), 400
+
+    # 2. Toplu ekleme (tek işlem, tek commit)
+    try:
+        results = bulk.create_products_with_listings(current_user_id, valid_items)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'message': 'Toplu ekleme sırasında bir hata oluştu.', 'error': str(e.orig)}), 409
+
+    return jsonify({
+        'message': f'{len(results)} ürün başarıyla eklendi.',
+        'results': results
+    }), 201
+
+
 @products_bp.route('/', methods=['GET'])
 @jwt_required() # Bu rota da token gerektirir
 def get_my_products():
@@ -102,6 +144,10 @@ def update_product(product_id):
         product.category = data['category']
     if 'image_url' in data:
         product.image_url = data['image_url']
+
+    # Aranan alanlardan biri değiştiyse arama indeksini güncelle
+    if any(field in data for field in ('title', 'description', 'category')):
+        search.index_product(product)
     
     db.session.commit()
 
@@ -156,6 +202,7 @@ def delete_product(product_id):
     # Şimdilik 'hard delete' (gerçek silme) deneyelim:
     
     try:
+        search.remove_product(product.id)
         db.session.delete(product)
         db.session.commit()
     except Exception as e:
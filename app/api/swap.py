@@ -2,8 +2,13 @@
 
 from flask import request, jsonify, Blueprint
 from app.models import Listing, Product, SwapOffer, ListingType, OfferStatus
-from app import db
+from app import db, atomic, analytics, offers, matchmaking
+from app.matchmaking import swap_matcher
+from app.pagination import parse_limit, InvalidPageParam
+from app.query_budget import query_budget
+from app.replicas import read_only
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select
 
 swap_bp = Blueprint('swap', __name__)
 
@@ -59,57 +64,70 @@ def make_swap_offer():
     )
 
     db.session.add(new_offer)
+    db.session.flush()
+    analytics.record_offer(new_offer, target_listing.lister_id)
     db.session.commit()
 
     return jsonify({
         'message': 'Takas teklifi başarıyla gönderildi.',
         'offer_id': new_offer.id,
-        'status': new_offer.status.value
+        'status': new_offer.status
     }), 201
 @swap_bp.route('/offers/received/<int:listing_id>', methods=['GET'])
+@query_budget(2)
+@read_only
 @jwt_required()
 def get_offers_for_my_listing(listing_id):
     """
-    Kullanıcının, belirli bir ilanına gelen tüm takas tekliflerini listeler.
+    Kullanıcının, belirli bir ilanına gelen takas tekliflerini listeler (yeniden eskiye).
     Sadece ilan sahibi bu teklifleri görebilir.
+
+    Filtre: ?status=pending|accepted|rejected
+    Sayfalama: ?limit=20&after=<next_cursor>
     """
     current_user_id = int(get_jwt_identity())
-    
-    # 1. İlanı bul
-    listing = Listing.query.get(listing_id)
 
-    if not listing:
+    try:
+        filters = offers.parse_offer_filters(request.args)
+        limit = parse_limit(request.args.get('limit'))
+        stmt = offers.received_offers_statement(listing_id, filters, limit,
+                                                after=request.args.get('after'))
+    except (offers.InvalidOfferParam, InvalidPageParam) as e:
+        return jsonify({'message': str(e)}), 400
+
+    # 1. İlanı bul (sadece sahiplik kontrolü için gereken kolon)
+    lister_id = db.session.execute(
+        select(Listing.lister_id).where(Listing.id == listing_id)
+    ).scalar()
+
+    if lister_id is None:
         return jsonify({'message': 'İlan bulunamadı.'}), 404
 
     # 2. Güvenlik: Giriş yapan kullanıcı, bu ilanın sahibi mi?
-    if listing.lister_id != current_user_id:
+    if lister_id != current_user_id:
         return jsonify({'message': 'Sadece kendi ilanlarınıza gelen teklifleri görebilirsiniz.'}), 403
 
-    # 3. İlana ait teklifleri bul (models.py'deki 'backref' sayesinde)
-    offers = listing.swap_offers_received
-    
-    output = []
-    for offer in offers:
-        # Teklifi yapanı ve teklif edilen ürünü al
-        offerer = offer.offerer 
-        offered_product = offer.offered_product
-
-        offer_data = {
-            'offer_id': offer.id,
-            'status': offer.status.value,
-            'message': offer.message,
-            'created_at': offer.created_at,
-            'offerer_username': offerer.username,
-            'offered_product': {
-                'product_id': offered_product.id,
-                'title': offered_product.title,
-                'description': offered_product.description,
-                'category': offered_product.category
-            }
-        }
-        output.append(offer_data)
-
-    return jsonify({'offers': output}), 200
+    # 3. Teklifler; teklif veren ve teklif edilen ürün aynı sorguda (JOIN)
+    rows = db.session.execute(stmt).all()
+    page, next_cursor = offers.split_offer_rows(rows, limit)
+    output = [offers.serialize_received_offer(row) for row in page]
+
+    return jsonify({'offers': output, 'next_cursor': next_cursor}), 200
+
+
+@swap_bp.route('/offers/inbox', methods=['GET'])
+@query_budget(1)
+@read_only
+@jwt_required()
+def get_offer_inbox():
+    """
+    Kullanıcının tüm ilanlarındaki bekleyen (pending) teklif sayıları, ilan başına.
+    En son teklif alan ilan önce gelir; tek bir GROUP BY sorgusuyla hesaplanır.
+    """
+    current_user_id = int(get_jwt_identity())
+
+    rows = db.session.execute(offers.inbox_statement(current_user_id)).all()
+    return jsonify(offers.serialize_inbox(rows)), 200
 
 
 @swap_bp.route('/offers/respond/<int:offer_id>', methods=['POST'])
@@ -141,59 +159,117 @@ def respond_to_offer(offer_id):
         return jsonify({'message': f'Bu teklif zaten yanıtlanmış (Durum: {offer.status.value}).'}), 400
 
     # 4. İşlemi gerçekleştir
+    # Her iki durum geçişi de koşullu UPDATE ile yapılır (compare-and-set);
+    # aynı anda gelen iki yanıttan sadece biri kazanır.
     if action == 'accept':
-        offer.status = OfferStatus.ACCEPTED
-        
+        if atomic.set_offer_status(offer.id, OfferStatus.ACCEPTED) is None:
+            db.session.rollback()
+            return jsonify({'message': 'Bu teklif zaten yanıtlanmış.'}), 400
+
         # --- ÖNEMLİ İŞ MANTIĞI ---
         # Teklif kabul edildiğinde, ilgili ilanları deaktive etmeliyiz.
         # 1. Takas ilanı (Eski Ekran Kartı) artık 'is_active = False' olmalı.
-        target_listing.is_active = False
+        #    İlan bu arada başka bir teklifle kapatıldıysa kabul geri alınır.
         
         # 2. Teklif edilen ürünün (8GB RAM) durumu ne olacak?
         #    Belki onun da başka ilanları vardı? Şimdilik sadece ürünü 'değiştirildi'
         #    olarak işaretleyebiliriz (models.py'de 'status' ekleyerek)
         #    Şimdilik basit tutalım: Sadece ilanı deaktive edelim.
-        
+        if atomic.deactivate_listing(target_listing.id) is None:
+            db.session.rollback()
+            return jsonify({'message': 'Bu ilan artık aktif değil.'}), 410 # 410 Gone
+
+        analytics.record_offer_status(offer, current_user_id, OfferStatus.PENDING, OfferStatus.ACCEPTED)
         db.session.commit()
         return jsonify({'message': 'Teklif kabul edildi. İlan devre dışı bırakıldı.', 'status': 'accepted'}), 200
 
     elif action == 'reject':
-        offer.status = OfferStatus.REJECTED
+        if atomic.set_offer_status(offer.id, OfferStatus.REJECTED) is None:
+            db.session.rollback()
+            return jsonify({'message': 'Bu teklif zaten yanıtlanmış.'}), 400
+
+        analytics.record_offer_status(offer, current_user_id, OfferStatus.PENDING, OfferStatus.REJECTED)
         db.session.commit()
         return jsonify({'message': 'Teklif reddedildi.', 'status': 'rejected'}), 200   
 
 @swap_bp.route('/offers/sent', methods=['GET'])
+@query_budget(1)
+@read_only
 @jwt_required()
 def get_my_sent_offers():
     """
-    Giriş yapmış kullanıcının 'yaptığı' (gönderdiği) tüm takas tekliflerini listeler.
+    Giriş yapmış kullanıcının 'yaptığı' (gönderdiği) takas tekliflerini listeler (yeniden eskiye).
+
+    Filtre: ?status=pending|accepted|rejected
+    Sayfalama: ?limit=20&after=<next_cursor>
+    """
+    current_user_id = int(get_jwt_identity())
+
+    try:
+        filters = offers.parse_offer_filters(request.args)
+        limit = parse_limit(request.args.get('limit'))
+        stmt = offers.sent_offers_statement(current_user_id, filters, limit,
+                                            after=request.args.get('after'))
+    except (offers.InvalidOfferParam, InvalidPageParam) as e:
+        return jsonify({'message': str(e)}), 400
+
+    # Teklif edilen ürün, hedef ilan, ilanın ürünü ve sahibi aynı sorguda (JOIN)
+    rows = db.session.execute(stmt).all()
+    page, next_cursor = offers.split_offer_rows(rows, limit)
+    output = [offers.serialize_sent_offer(row) for row in page]
+
+    return jsonify({'sent_offers': output, 'next_cursor': next_cursor}), 200
+
+
+def _int_arg(name):
+    """İsteğe bağlı tam sayı parametresi; verilmişse ve sayı değilse InvalidPageParam."""
+    raw = request.args.get(name)
+    if raw is None or raw == '':
+        return None
+    if not (raw.isascii() and raw.isdigit()):
+        raise InvalidPageParam(f'{name} bir tam sayı olmalıdır.')
+    return int(raw)
+
+
+@swap_bp.route('/matches', methods=['GET'])
+@query_budget(3)
+@read_only
+@jwt_required()
+def get_swap_matches():
+    """
+    Kullanıcının aktif takas ilanları için eşleşmeler (app/matchmaking.py):
+      mutual   karşılıklı: ben onun ürününü, o benimkini istiyor
+      cycles   çok taraflı döngüler (A -> B -> C -> A); 'trades' kimin kimden ne aldığını söyler
+
+    Parametreler: ?listing_id=<kendi ilanım> ?max_length=2..MATCH_MAX_CYCLE_LENGTH
+                  ?limit=10 (ilan başına eşleşme / döngü sayısı)
     """
     current_user_id = int(get_jwt_identity())
-    
-    # Sadece bu kullanıcıya ait (offerer_id) teklifleri bul
-    sent_offers = SwapOffer.query.filter_by(
-        offerer_id=current_user_id
-    ).order_by(SwapOffer.created_at.desc()).all() # Yeniden eskiye sırala
-
-    output = []
-    for offer in sent_offers:
-        # Teklifin yapıldığı ilanı ve o ilanın ürününü alalım
-        target_listing = offer.target_listing
-        target_product = target_listing.product
-        
-        offer_data = {
-            'offer_id': offer.id,
-            'status': offer.status.value, # pending, accepted, rejected
-            'date_offered': offer.created_at,
-            'my_offered_product': { # Benim teklif ettiğim ürün
-                'title': offer.offered_product.title
-            },
-            'target_listing': { # Teklif yaptığım ilan
-                'listing_id': target_listing.id,
-                'title': target_product.title,
-                'owner_username': target_listing.lister.username # İlan sahibinin adı
-            }
-        }
-        output.append(offer_data)
-
-    return jsonify({'sent_offers': output}), 200     
\ No newline at end of file
+
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10, maximum=50)
+        listing_id = _int_arg('listing_id')
+        max_length = _int_arg('max_length')
+    except InvalidPageParam as e:
+        return jsonify({'message': str(e)}), 400
+    if max_length is not None and max_length < 2:
+        return jsonify({'message': 'max_length en az 2 olmalıdır.'}), 400
+
+    # 1. İndeksi güncelle (koleksiyon sürümü değişmediyse sadece sürüm okunur)
+    swap_matcher.refresh()
+
+    # 2. Bellekteki indeksten aday eşleşmeler ve döngüler
+    results = swap_matcher.matches_for_user(current_user_id, listing_id=listing_id,
+                                            max_length=max_length, limit=limit)
+    if not results:
+        return jsonify({'matches': []}), 200
+
+    # 3. Adaylar tek sorguda doğrulanır; bayatlar (silinmiş / pasif) indeksten çıkar
+    rows = db.session.execute(
+        matchmaking.summaries_statement(matchmaking.result_listing_ids(results))
+    ).all()
+    output, stale = matchmaking.serialize_matches(results, rows)
+    if stale:
+        swap_matcher.discard(stale)
+
+    return jsonify({'matches': output}), 200
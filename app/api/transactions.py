@@ -3,9 +3,16 @@
 from flask import request, jsonify, Blueprint
 # datetime'i tarih işlemleri için import ediyoruz
 from datetime import datetime
-from app.models import Listing, Transaction, ListingType, TransactionStatus,User
+from app.models import Listing, Product, Transaction, ListingType, TransactionStatus,User
 from app import db
+from app import booking, atomic, dashboard, analytics, reads
+from app.pagination import parse_limit, InvalidPageParam
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.export import parse_export_args, stream_export, InvalidExportParam
+from app.query_budget import query_budget
+from app.replicas import read_only
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 
 transactions_bp = Blueprint('transactions', __name__)
@@ -25,44 +32,53 @@ def buy_listing():
     if not listing_id:
         return jsonify({'message': 'listing_id zorunludur.'}), 400
 
-    # --- 1. İlanı Doğrula ---
-    listing = Listing.query.get(listing_id)
-
-    if not listing:
-        return jsonify({'message': 'İlan bulunamadı.'}), 404
-    
-    if not listing.is_active:
-        return jsonify({'message': 'Bu ilan artık aktif (satışta) değil.'}), 410 # 410 Gone
-
-    # --- 2. İş Mantığını Doğrula ---
-    if listing.listing_type != ListingType.SALE:
-        return jsonify({'message': 'Bu API sadece "sale" (satış) tipindeki ilanları satın almak içindir.'}), 400
+    # --- 1. İlanı Tek Sorguda "Kap" (compare-and-set) ---
+    # UPDATE listings SET is_active = false
+    #  WHERE id = ? AND is_active AND listing_type = 'SALE' AND lister_id != ?
+    #  RETURNING id, price
+    # Aynı anda gelen alıcılardan sadece biri satırı değiştirebilir.
+    claimed = atomic.deactivate_listing(
+        listing_id,
+        Listing.listing_type == ListingType.SALE,
+        Listing.lister_id != current_user_id,
+        returning=(Listing.id, Listing.price, Listing.lister_id)
+    )
 
-    if listing.lister_id == current_user_id:
+    if claimed is None:
+        # Kaybeden/geçersiz istek: nedenini bulmak için tek bir PK okuması
+        db.session.rollback()
+        listing = Listing.query.get(listing_id)
+
+        if not listing:
+            return jsonify({'message': 'İlan bulunamadı.'}), 404
+        if not listing.is_active:
+            return jsonify({'message': 'Bu ilan artık aktif (satışta) değil.'}), 410 # 410 Gone
+        if listing.listing_type != ListingType.SALE:
+            return jsonify({'message': 'Bu API sadece "sale" (satış) tipindeki ilanları satın almak içindir.'}), 400
         return jsonify({'message': 'Kendi ilanınızı satın alamazsınız.'}), 400
 
-    # --- 3. Satış İşlemini Gerçekleştir ---
-    listing.is_active = False
-    
+    # --- 2. Satış İşlemini Kaydet (aynı veritabanı işlemi içinde) ---
     new_transaction = Transaction(
-        listing_id=listing_id,
+        listing_id=claimed.id,
         buyer_or_renter_id=current_user_id,
         transaction_type=ListingType.SALE,
-        total_price=listing.price,
+        total_price=claimed.price,
         status=TransactionStatus.COMPLETED
     )
     
     try:
         db.session.add(new_transaction)
+        db.session.flush()
+        analytics.record_transaction(new_transaction, claimed.lister_id)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'İşlem sırasında bir hata oluştu.', 'error': str(e)}), 500
 
     return jsonify({
-        'message': f'Satın alma işlemi başarılı. (İlan: {listing.product.title})',
+        'message': f'Satın alma işlemi başarılı. (İlan: {new_transaction.listing.product.title})',
         'transaction_id': new_transaction.id,
-        'total_price_paid': float(new_transaction.total_price)
+        'total_price_paid': new_transaction.total_price
     }), 201
 
 
@@ -113,6 +129,9 @@ def rent_listing():
 
     # --- 4. TARİH ÇAKIŞMASI KONTROLÜ (En Önemli Kısım) ---
     # Bu ilana ait, istenen tarih aralığıyla çakışan başka bir kiralama (transaction) var mı?
+    # Not: Bu kontrol kullanıcıya erken 409 vermek içindir. Aynı anda gelen iki
+    # istek ikisi de PENDING olarak kaydedilebilir; iki onaylı kiralamanın
+    # çakışmasını veritabanı kısıtı engeller (bkz. app/booking.py).
     
     # SQLAlchemy'nin 'and_' ve 'or_' fonksiyonlarını import etmemiz gerekebilir,
     # ama şimdilik basit filtreleme ile deneyelim.
@@ -150,6 +169,8 @@ def rent_listing():
     )
     
     db.session.add(new_transaction)
+    db.session.flush()
+    analytics.record_transaction(new_transaction, listing.lister_id)
     db.session.commit()
 
     return jsonify({
@@ -157,10 +178,12 @@ def rent_listing():
         'transaction_id': new_transaction.id,
         'start_date': new_transaction.start_date.isoformat(),
         'end_date': new_transaction.end_date.isoformat(),
-        'total_price': float(new_transaction.total_price)
+        'total_price': new_transaction.total_price
     }), 201
 
 @transactions_bp.route('/my_purchases', methods=['GET'])
+@query_budget(1)
+@read_only
 @jwt_required()
 def get_my_purchases():
     """
@@ -168,36 +191,16 @@ def get_my_purchases():
     """
     current_user_id = int(get_jwt_identity())
     
-    # Sadece bu kullanıcıya ait ve tipi 'sale' olan işlemleri bul
-    purchases = Transaction.query.filter_by(
-        buyer_or_renter_id=current_user_id,
-        transaction_type=ListingType.SALE,
-        status=TransactionStatus.COMPLETED
-    ).order_by(Transaction.created_at.desc()).all() # Yeniden eskiye sırala
-
-    output = []
-    for purchase in purchases:
-        # İşleme bağlı ilanı ve ürünü alalım
-        listing = purchase.listing
-        product = listing.product
-        
-        purchase_data = {
-            'transaction_id': purchase.id,
-            'date_purchased': purchase.created_at,
-            'price_paid': float(purchase.total_price),
-            'product_details': {
-                'title': product.title,
-                'description': product.description,
-                'category': product.category
-            },
-            'seller_username': listing.lister.username # Satıcının kullanıcı adı
-        }
-        output.append(purchase_data)
+    # Sadece bu kullanıcıya ait, tamamlanmış satın alımlar; ilan, ürün ve satıcı aynı sorguda
+    purchases = db.session.execute(reads.purchases_statement(current_user_id)).scalars()
+    output = [reads.serialize_purchase(purchase) for purchase in purchases]
 
     return jsonify({'purchases': output}), 200
 
 
 @transactions_bp.route('/my_rentals', methods=['GET'])
+@query_budget(1)
+@read_only
 @jwt_required()
 def get_my_rentals():
     """
@@ -205,73 +208,82 @@ def get_my_rentals():
     """
     current_user_id = int(get_jwt_identity())
     
-    # Sadece bu kullanıcıya ait ve tipi 'rent' olan işlemleri bul
-    rentals = Transaction.query.filter_by(
-        buyer_or_renter_id=current_user_id,
-        transaction_type=ListingType.RENT
-    ).order_by(Transaction.start_date.desc()).all() # Başlangıç tarihine göre sırala
-
-    output = []
-    for rental in rentals:
-        listing = rental.listing
-        product = listing.product
-        
-        rental_data = {
-            'transaction_id': rental.id,
-            'status': rental.status.value,
-            'start_date': rental.start_date.isoformat(),
-            'end_date': rental.end_date.isoformat(),
-            'total_price_paid': float(rental.total_price),
-            'product_details': {
-                'title': product.title,
-                'description': product.description
-            },
-            'owner_username': listing.lister.username # Ürün sahibinin kullanıcı adı
-        }
-        output.append(rental_data)
+    # Sadece bu kullanıcıya ait kiralamalar; ilan, ürün ve ilan sahibi aynı sorguda
+    rentals = db.session.execute(reads.rentals_statement(current_user_id)).scalars()
+    output = [reads.serialize_rental(rental) for rental in rentals]
 
     return jsonify({'rentals': output}), 200  
 
 @transactions_bp.route('/received', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_received_transactions():
     """
     Giriş yapmış kullanıcının ilanlarına gelen 'tüm' işlemleri (satışlar ve kiralamalar) listeler.
     Bu, bir "Satıcı Paneli" API'sidir.
+
+    Filtreler: ?type=sale|rent&status=pending|completed|cancelled&from=YYYY-MM-DD&to=YYYY-MM-DD
+    Sayfalama: ?limit=20&after=<next_cursor>
+    Sayfa satırları ve filtrelenmiş kümenin toplamları (gelir, duruma göre
+    adetler) tek bir SQL sorgusuyla okunur (bkz. app/dashboard.py).
     """
     current_user_id = int(get_jwt_identity())
-    
-    # 1. Bu kullanıcıya ait tüm ilan ID'lerini bul
-    my_listing_ids = [listing.id for listing in Listing.query.filter_by(lister_id=current_user_id).all()]
-
-    if not my_listing_ids:
-        return jsonify({'message': 'Henüz yayınlanmış bir ilanınız bulunmuyor.', 'transactions': []}), 200
-
-    # 2. 'listing_id'si bu listede olan tüm 'transactions' kayıtlarını bul
-    received_transactions = Transaction.query.filter(
-        Transaction.listing_id.in_(my_listing_ids)
-    ).order_by(Transaction.created_at.desc()).all()
-
-    output = []
-    for transaction in received_transactions:
-        # Bu işlemi yapan kişiyi (alıcı/kiralayan) ve ilgili ürünü al
-        buyer_or_renter = User.query.get(transaction.buyer_or_renter_id)
-        product = transaction.listing.product
-        
-        transaction_data = {
-            'transaction_id': transaction.id,
-            'type': transaction.transaction_type.value, # 'sale' veya 'rent'
-            'status': transaction.status.value,
-            'date': transaction.created_at,
-            'product_title': product.title,
-            'total_price': float(transaction.total_price),
-            'client_username': buyer_or_renter.username, # İşlemi yapan kişinin adı
-            'start_date': transaction.start_date.isoformat() if transaction.start_date else None,
-            'end_date': transaction.end_date.isoformat() if transaction.end_date else None,
-        }
-        output.append(transaction_data)
-
-    return jsonify({'received_transactions': output}), 200  
+
+    try:
+        filters = dashboard.parse_received_filters(request.args)
+        limit = parse_limit(request.args.get('limit'))
+        stmt = dashboard.received_statement(current_user_id, filters, limit,
+                                            after=request.args.get('after'))
+    except (dashboard.InvalidDashboardParam, InvalidPageParam) as e:
+        return jsonify({'message': str(e)}), 400
+
+    rows = db.session.execute(stmt).all()
+    output, totals, next_cursor = dashboard.split_received_rows(rows, limit)
+
+    return jsonify({
+        'received_transactions': output,
+        'totals': totals,
+        'next_cursor': next_cursor
+    }), 200
+
+
+@transactions_bp.route('/received/export', methods=['GET'])
+@jwt_required()
+def export_received_transactions():
+    """
+    Satıcının ilanlarına gelen tüm işlemleri NDJSON veya CSV olarak akıtır.
+    ?format=ndjson|csv&updated_since=2025-01-31T00:00:00
+    """
+    current_user_id = int(get_jwt_identity())
+
+    try:
+        fmt, updated_since = parse_export_args(request.args)
+    except InvalidExportParam as e:
+        return jsonify({'message': str(e)}), 400
+
+    stmt = select(
+        Transaction.id.label('transaction_id'),
+        Transaction.transaction_type.label('type'),
+        Transaction.status,
+        Transaction.total_price,
+        Transaction.start_date,
+        Transaction.end_date,
+        Transaction.created_at,
+        Transaction.updated_at,
+        Listing.id.label('listing_id'),
+        Product.title.label('product_title'),
+        User.username.label('client_username')
+    ).join(Listing, Listing.id == Transaction.listing_id) \
+     .join(Product, Product.id == Listing.product_id) \
+     .join(User, User.id == Transaction.buyer_or_renter_id) \
+     .where(Listing.lister_id == current_user_id) \
+     .order_by(Transaction.id)
+
+    if updated_since is not None:
+        stmt = stmt.where(Transaction.updated_at >= updated_since)
+
+    return stream_export(stmt, fmt, 'received_transactions')
+
 
 @transactions_bp.route('/rent/respond/<int:transaction_id>', methods=['POST'])
 @jwt_required()
@@ -303,14 +315,53 @@ def respond_to_rent_transaction(transaction_id):
     
     # 4. İşlemi gerçekleştir
     if action == 'accept':
-        # (Burada tekrar tarih çakışması kontrolü yapılabilir, ama 'rent'
-        # fonksiyonu zaten bunu yaptığı için 'pending'e düşmüştür.)
-        
-        transaction.status = TransactionStatus.COMPLETED # Veya 'CONFIRMED' olabilirdi
-        db.session.commit()
-        return jsonify({'message': 'Kiralama talebi kabul edildi.', 'status': 'completed'}), 200
+        # Koşullu UPDATE: talep hâlâ PENDING ise onayla. Tarih çakışmasını
+        # veritabanı kısıtı kontrol eder (aynı anda iki onay da güvenli).
+        try:
+            updated = Transaction.query.filter_by(
+                id=transaction.id,
+                status=TransactionStatus.PENDING
+            ).update({Transaction.status: TransactionStatus.COMPLETED}, synchronize_session=False)
+
+            if not updated:
+                db.session.rollback()
+                return jsonify({'message': 'Bu talep zaten yanıtlanmış.'}), 409
+
+            analytics.record_transaction_status(transaction, current_user_id,
+                                                TransactionStatus.PENDING, TransactionStatus.COMPLETED)
+
+            # Çakışan diğer bekleyen talepleri tek sorguda iptal et
+            cancelled_count = 0
+            if transaction.transaction_type == ListingType.RENT:
+                cancelled = booking.cancel_overlapping_pending(transaction)
+                analytics.record_cancelled_requests(current_user_id, cancelled)
+                cancelled_count = len(cancelled)
+
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if booking.is_rental_overlap_error(e):
+                return jsonify({'message': 'Bu tarihler onaylanmış başka bir kiralamayla çakışıyor.'}), 409
+            raise
+
+        return jsonify({
+            'message': 'Kiralama talebi kabul edildi.',
+            'status': 'completed',
+            'auto_cancelled_requests': cancelled_count
+        }), 200
 
     elif action == 'reject':
-        transaction.status = TransactionStatus.CANCELLED
+        # Onayla aynı anda gelirse sadece biri kazanır (özet sayaçlar iki kez değişmez)
+        updated = Transaction.query.filter_by(
+            id=transaction.id,
+            status=TransactionStatus.PENDING
+        ).update({Transaction.status: TransactionStatus.CANCELLED}, synchronize_session=False)
+
+        if not updated:
+            db.session.rollback()
+            return jsonify({'message': 'Bu talep zaten yanıtlanmış.'}), 409
+
+        analytics.record_transaction_status(transaction, current_user_id,
+                                            TransactionStatus.PENDING, TransactionStatus.CANCELLED)
         db.session.commit()
         return jsonify({'message': 'Kiralama talebi reddedildi.', 'status': 'cancelled'}), 200
\ No newline at end of file
@@ -0,0 +1,272 @@
+# /app/asgi.py
+
+"""
+ASGI sunum modu: I/O ağırlıklı okuma endpoint'leri async veritabanı oturumlarıyla.
+
+    uvicorn --factory app.asgi:create_asgi_app --workers 2
+
+Aşağıdaki endpoint'ler native async handler'larla sunulur; veritabanını
+beklerken worker başka istekleri işler:
+
+  GET /api/listings/                    aktif ilan akışı (filtreler, facet'ler, keyset sayfalama, ETag)
+  GET /api/listings/<id>                ilan detayı (entity_cache, ETag)
+  GET /api/transactions/my_purchases
+  GET /api/transactions/my_rentals
+  GET /api/transactions/received        satıcı paneli (filtreler, toplamlar)
+
+Sorgular ve JSON biçimi Flask blueprint'leriyle aynıdır (app/reads.py,
+app/dashboard.py); yanıtlar birebir aynı gövdeyi döner. Diğer tüm istekler
+(yazmalar dahil) ve async handler'ın kendisi cevaplamadığı durumlar
+(?ids= çoklu okuma, geçersiz/eksik token) aynı süreçteki Flask uygulamasına
+WsgiToAsgi üzerinden, bir thread havuzunda iletilir; hata yanıtları bu yüzden
+sync yolla aynıdır.
+
+@read_only okumalar DB_REPLICA_URLS varsa replikalardan yapılır; yazma sonrası
+yapışıklık (read-your-writes) kayıtları sync yolla ortaktır (bkz. app/replicas.py).
+Sorgu bütçesi / Server-Timing (app/query_budget.py) sadece Flask yolunda çalışır.
+
+Gerekli paketler requirements-asgi.txt'tedir: sqlalchemy[asyncio], asgiref, bir ASGI
+sunucusu (uvicorn) ve async sürücü (psycopg veya aiosqlite; bkz. app/async_db.py).
+Flask yoluyla eşlik testleri: tests/test_asgi.py.
+"""
+
+import re
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+from app import create_app, dashboard, feed, reads
+from app.async_db import async_db
+from app.cache import entity_cache
+from app.config import Config
+from app.pagination import parse_limit, InvalidPageParam
+from app.replicas import replica_router
+from app.versioning import collection_version_statement, make_etag
+
+
+class AsyncRequest:
+    """ASGI scope'unun handler'ların ihtiyaç duyduğu kadarı."""
+
+    def __init__(self, scope):
+        self.path = scope['path']
+        self.query_string = scope['query_string'].decode('latin-1')
+        self.args = {}
+        for name, value in parse_qsl(self.query_string, keep_blank_values=True):
+            self.args.setdefault(name, value)  # Flask'taki request.args.get gibi ilk değer
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope['headers']}
+
+    @property
+    def full_path(self):
+        # Flask'taki request.full_path ile aynı (ETag kapsamı)
+        return f'{self.path}?{self.query_string}'
+
+    def etag_matches(self, etag):
+        header = self.headers.get('if-none-match')
+        if not header:
+            return False
+        # Güçlü karşılaştırma: zayıf (W/) etiketler eşleşmez
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or f'"{etag}"' in tags
+
+
+class Response:
+    def __init__(self, body=b'', status=200, headers=()):
+        self.body = body
+        self.status = status
+        self.headers = list(headers)
+
+    async def send(self, send):
+        headers = [(b'content-length', str(len(self.body)).encode('latin-1'))]
+        headers += [(name.encode('latin-1'), value.encode('latin-1')) for name, value in self.headers]
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': self.body})
+
+
+class AsyncApp:
+    """Async handler'lı endpoint'ler + geri kalanı için Flask (WSGI)."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.json = flask_app.json
+        self.routes = [
+            ('GET', re.compile(r'^/api/listings/$'), self.listings_feed),
+            ('GET', re.compile(r'^/api/listings/(?P<listing_id>\d+)$'), self.listing_details),
+            ('GET', re.compile(r'^/api/transactions/my_purchases$'), self.my_purchases),
+            ('GET', re.compile(r'^/api/transactions/my_rentals$'), self.my_rentals),
+            ('GET', re.compile(r'^/api/transactions/received$'), self.received)
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http':
+            for method, pattern, handler in self.routes:
+                match = pattern.match(scope['path'])
+                if match and scope['method'] == method:
+                    response = await handler(AsyncRequest(scope), **match.groupdict())
+                    if response is not None:
+                        return await response.send(send)
+                    break
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_db.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # --- Yardımcılar ---
+
+    def json_response(self, data, status=200, headers=()):
+        return Response(self.json.dumps_bytes(data), status,
+                        [('content-type', 'application/json'), *headers])
+
+    def identity(self, request):
+        """
+        Geçerli bir access token'ın kimliği (int). Token yoksa veya geçersizse None;
+        handler'lar o zaman isteği Flask'a bırakır ve hata yanıtını jwt_required üretir.
+        """
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        if scheme != 'Bearer' or not token:
+            return None
+        try:
+            with self.flask_app.app_context():
+                claims = decode_token(token.strip())
+                identity_claim = self.flask_app.config['JWT_IDENTITY_CLAIM']
+        except (JWTExtendedException, PyJWTError):
+            return None
+        if claims.get('type') != 'access':
+            return None
+        return int(claims[identity_claim])
+
+    def read_session(self, request, user_id=None):
+        """@read_only endpoint'ler gibi: replika varsa ve kullanıcı yapışık değilse replikadan."""
+        if user_id is None and replica_router.replicas:
+            # Herkese açık endpoint'lerde de yazan kullanıcı kendi değişikliğini görmeli
+            user_id = self.identity(request)
+        return async_db.session(replica_router.pick_replica(user_id))
+
+    async def conditional(self, session, request):
+        """
+        Koleksiyon sürümünden ETag (bkz. app/versioning.py).
+        Dönüş: (sürüm, ETag, eşleşirse 304 yanıtı veya None)
+        """
+        version = (await session.execute(collection_version_statement())).scalar() or 0
+        etag = make_etag(version, request.full_path)
+        if request.etag_matches(etag):
+            return version, etag, Response(status=304, headers=self._etag_headers(etag))
+        return version, etag, None
+
+    @staticmethod
+    def _etag_headers(etag):
+        return [('etag', f'"{etag}"'), ('cache-control', 'no-cache')]
+
+    # --- İlanlar ---
+
+    async def listings_feed(self, request):
+        if 'ids' in request.args:
+            return None  # çoklu okuma Flask'ta
+
+        async with self.read_session(request) as session:
+            _, etag, not_modified = await self.conditional(session, request)
+            if not_modified:
+                return not_modified
+            try:
+                limit = parse_limit(request.args.get('limit'))
+                filters = feed.parse_feed_filters(request.args)
+                stmt = reads.feed_statement(limit, after=request.args.get('after'), filters=filters)
+            except (InvalidPageParam, feed.InvalidFeedParam) as e:
+                return self.json_response({'message': str(e)}, 400)
+
+            rows = (await session.execute(stmt)).scalars().all()
+            listings, next_cursor = feed.split_feed_page(rows, filters, limit)
+            output = [reads.serialize_listing(listing) for listing in listings]
+
+            response = {'listings': output, 'next_cursor': next_cursor}
+            if feed.wants_facets(request.args):
+                facet_rows = (await session.execute(feed.facets_statement(filters))).all()
+                response['facets'] = feed.fold_facets(facet_rows, filters)
+
+        return self.json_response(response, headers=self._etag_headers(etag))
+
+    async def listing_details(self, request, listing_id):
+        listing_id = int(listing_id)
+
+        async with self.read_session(request) as session:
+            version, etag, not_modified = await self.conditional(session, request)
+            if not_modified:
+                return not_modified
+
+            async def load():
+                listing = (await session.execute(reads.listing_details_statement([listing_id]))).scalar()
+                if not listing:
+                    return None, ()
+                return reads.serialize_listing(listing), reads.listing_cache_tags(listing)
+
+            listing_data = await entity_cache.get_or_load_async(f'listing:{listing_id}', load, version=version)
+
+        if listing_data is None:
+            return self.json_response({'message': 'İlan bulunamadı.'}, 404)
+        return self.json_response({'listing': listing_data}, headers=self._etag_headers(etag))
+
+    # --- İşlemler ---
+
+    async def my_purchases(self, request):
+        user_id = self.identity(request)
+        if user_id is None:
+            return None
+
+        async with self.read_session(request, user_id) as session:
+            purchases = (await session.execute(reads.purchases_statement(user_id))).scalars().all()
+            output = [reads.serialize_purchase(purchase) for purchase in purchases]
+        return self.json_response({'purchases': output})
+
+    async def my_rentals(self, request):
+        user_id = self.identity(request)
+        if user_id is None:
+            return None
+
+        async with self.read_session(request, user_id) as session:
+            rentals = (await session.execute(reads.rentals_statement(user_id))).scalars().all()
+            output = [reads.serialize_rental(rental) for rental in rentals]
+        return self.json_response({'rentals': output})
+
+    async def received(self, request):
+        user_id = self.identity(request)
+        if user_id is None:
+            return None
+
+        try:
+            filters = dashboard.parse_received_filters(request.args)
+            limit = parse_limit(request.args.get('limit'))
+            stmt = dashboard.received_statement(user_id, filters, limit, after=request.args.get('after'))
+        except (dashboard.InvalidDashboardParam, InvalidPageParam) as e:
+            return self.json_response({'message': str(e)}, 400)
+
+        # Flask yolunda olduğu gibi primary'den (satıcı paneli @read_only değil)
+        async with async_db.session() as session:
+            rows = (await session.execute(stmt)).all()
+        output, totals, next_cursor = dashboard.split_received_rows(rows, limit)
+
+        return self.json_response({
+            'received_transactions': output,
+            'totals': totals,
+            'next_cursor': next_cursor
+        })
+
+
+def create_asgi_app(config_class=Config):
+    """ASGI uygulama fabrikası (uvicorn --factory app.asgi:create_asgi_app)."""
+    flask_app = create_app(config_class)
+    async_db.init_app(flask_app)
+    return AsyncApp(flask_app)
@@ -0,0 +1,88 @@
+# /app/async_db.py
+
+"""
+ASGI yolu (app/asgi.py) için async SQLAlchemy engine'leri ve oturumları.
+
+Modeller (app/models.py) ve sorgular (app/reads.py, app/dashboard.py) sync
+Flask yoluyla ortaktır; sadece sürücü ve oturum sınıfı farklıdır. URL'ler
+sync ayarlardan türetilir:
+
+  postgresql[+psycopg2|+psycopg]://...  ->  postgresql+psycopg://...  (psycopg 3, async destekli)
+  sqlite:///...                          ->  sqlite+aiosqlite:///...
+
+Config:
+  ASYNC_DATABASE_URL   türetilen URL yerine kullanılacak async URL (örn. postgresql+asyncpg://...)
+  DB_POOL_*            sync havuzla aynı ayarlar; async engine'lerin kendi havuzu vardır,
+                       yani süreç başına bağlantı sayısı iki katına çıkabilir.
+  DB_REPLICA_URLS      her replika için ayrı bir async engine açılır (bkz. app/replicas.py)
+
+Gerekli paketler: sqlalchemy[asyncio] (greenlet) ve sürücü (psycopg veya aiosqlite).
+"""
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db_pool import engine_options
+
+# sync sürücü -> async sürücü
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+psycopg',
+    'postgresql+psycopg2': 'postgresql+psycopg',
+    'postgresql+psycopg': 'postgresql+psycopg',
+    'postgresql+asyncpg': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'sqlite+aiosqlite': 'sqlite+aiosqlite'
+}
+
+
+def async_database_url(url):
+    """Sync veritabanı URL'ini async sürücülü karşılığına çevirir."""
+    url = make_url(url)
+    try:
+        return url.set(drivername=_ASYNC_DRIVERS[url.drivername])
+    except KeyError:
+        raise NotImplementedError(f'{url.drivername} için async sürücü tanımlı değil.')
+
+
+def async_engine_options(config, url):
+    """Sync engine_options'tan async engine'e uygun olanlar (havuz sınıfı hariç)."""
+    options = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': url})
+    # InstrumentedQueuePool sync'tir; async engine varsayılan AsyncAdaptedQueuePool'u kullanır
+    options.pop('poolclass', None)
+    return options
+
+
+class AsyncDatabase:
+    """Flask eklentisi gibi kurulur; primary ve replika async engine'lerini tutar."""
+
+    def __init__(self):
+        self.engines = {}
+        self._sessions = None
+
+    def init_app(self, app):
+        config = app.config
+        primary = config.get('ASYNC_DATABASE_URL') or \
+            async_database_url(config['SQLALCHEMY_DATABASE_URI'])
+        self.engines = {None: create_async_engine(primary, **async_engine_options(config, str(primary)))}
+
+        # Replika bind adları sync tarafla aynıdır ('replica_0', ...)
+        from app.replicas import replica_binds
+        for name, url in replica_binds(config).items():
+            async_url = async_database_url(url)
+            self.engines[name] = create_async_engine(async_url, **async_engine_options(config, str(async_url)))
+
+        # Oturum kapandıktan sonra serileştirilen nesneler yeniden yüklenmeye çalışılmasın
+        self._sessions = async_sessionmaker(class_=AsyncSession, expire_on_commit=False)
+        app.extensions['async_db'] = self
+
+    def session(self, bind=None):
+        """bind: replika adı veya primary için None. 'async with' ile kullanılır."""
+        return self._sessions(bind=self.engines[bind])
+
+    async def dispose(self):
+        for engine in self.engines.values():
+            await engine.dispose()
+
+
+async_db = AsyncDatabase()
@@ -0,0 +1,64 @@
+# /app/atomic.py
+
+"""
+Durum geçişleri için tek sorguluk "compare-and-set" yardımcıları.
+
+Önce satırı okuyup Python'da kontrol edip sonra yazmak (read-modify-write)
+eşzamanlı isteklerde iki kazanan üretebilir. Buradaki fonksiyonlar koşulu
+doğrudan UPDATE ... WHERE içine koyar; koşulu sağlayan satırı değiştiren
+tek istek kazanır, diğerleri 0 satır etkiler ve hemen geri döner.
+Satır kilidi sadece UPDATE ile commit arasında tutulur.
+"""
+
+from sqlalchemy import update, select
+
+from app import db
+from app import versioning
+from app.cache import invalidate_after_commit
+from app.models import Listing, SwapOffer, OfferStatus
+
+
+def _compare_and_set(model, criteria, values, returning):
+    """
+    UPDATE model SET values WHERE criteria RETURNING returning.
+    Dönüş: etkilenen satır (Row) veya koşul sağlanmadıysa None.
+    Çağıran taraf commit/rollback'ten sorumludur.
+    """
+    stmt = update(model).where(*criteria).values(**values) \
+        .execution_options(synchronize_session=False)
+
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(*returning)).first()
+
+    # RETURNING desteklemeyen veritabanları: rowcount + aynı işlem içinde okuma
+    if db.session.execute(stmt).rowcount != 1:
+        return None
+    return db.session.execute(select(*returning).where(*criteria[:1])).first()
+
+
+def deactivate_listing(listing_id, *criteria, returning=(Listing.id,)):
+    """
+    İlan hâlâ aktifse (ve ek koşullar sağlanıyorsa) tek sorguda pasife çeker.
+    Satış ve takas kabulünde ilanı "kapmak" için kullanılır.
+    """
+    row = _compare_and_set(
+        Listing,
+        (Listing.id == listing_id, Listing.is_active == True) + criteria,
+        {'is_active': False},
+        returning
+    )
+    if row is not None:
+        # ORM flush'ı olmadığı için sürümü (commit'ten hemen önce) ve önbelleği elle güncelle
+        versioning.bump_before_commit()
+        invalidate_after_commit(db.session, {f'listing:{listing_id}'})
+    return row
+
+
+def set_offer_status(offer_id, new_status):
+    """Teklif hâlâ PENDING ise durumunu tek sorguda günceller."""
+    return _compare_and_set(
+        SwapOffer,
+        (SwapOffer.id == offer_id, SwapOffer.status == OfferStatus.PENDING),
+        {'status': new_status},
+        (SwapOffer.id,)
+    )
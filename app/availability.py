@@ -0,0 +1,101 @@
+# /app/availability.py
+
+"""
+Kiralama takvimi için sıralı aralık (interval) yapısı.
+
+Tarih aralıkları rent_listing'deki çakışma kuralıyla aynı şekilde yarı açık
+kabul edilir: [start_date, end_date). Yani end_date günü teslim günüdür ve
+bir sonraki kiralama o gün başlayabilir.
+"""
+
+from bisect import bisect_right
+from datetime import timedelta
+
+from app.models import Transaction, ListingType, TransactionStatus
+
+
+class IntervalIndex:
+    """
+    Birleştirilmiş (merge edilmiş), sıralı ve ayrık dolu aralıklar listesi.
+
+    Kurulum O(n log n); ardından her aday aralığın boş olup olmadığı
+    bisect ile O(log n) sürede kontrol edilir. Böylece bir takvim ekranı
+    veya çok sayıda aday tarih, her biri için ayrı sorgu atmadan yanıtlanır.
+    """
+
+    def __init__(self, intervals=()):
+        merged = []
+        for start, end in sorted(i for i in intervals if i[0] < i[1]):
+            if merged and start <= merged[-1][1]:
+                # Çakışan veya uç uca değen aralıkları birleştir
+                if end > merged[-1][1]:
+                    merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def __len__(self):
+        return len(self._starts)
+
+    @property
+    def busy(self):
+        """Birleştirilmiş dolu aralıklar: [(start, end), ...]"""
+        return list(zip(self._starts, self._ends))
+
+    def is_free(self, start, end):
+        """[start, end) aralığı hiçbir dolu aralıkla çakışmıyorsa True."""
+        # start'tan önce veya aynı anda başlayan son dolu aralık
+        i = bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] > start:
+            return False
+        # start'tan sonra başlayan ilk dolu aralık, end'den önce başlamamalı
+        j = i + 1
+        return j >= len(self._starts) or self._starts[j] >= end
+
+    def busy_between(self, window_start, window_end):
+        """Pencereye giren dolu aralıklar (pencere sınırlarına kırpılmış)."""
+        i = bisect_right(self._ends, window_start)
+        result = []
+        while i < len(self._starts) and self._starts[i] < window_end:
+            result.append((max(self._starts[i], window_start), min(self._ends[i], window_end)))
+            i += 1
+        return result
+
+    def free_between(self, window_start, window_end):
+        """Pencere içindeki boş aralıklar (dolu aralıkların tümleyeni)."""
+        gaps = []
+        cursor = window_start
+        for start, end in self.busy_between(window_start, window_end):
+            if start > cursor:
+                gaps.append((cursor, start))
+            cursor = max(cursor, end)
+        if cursor < window_end:
+            gaps.append((cursor, window_end))
+        return gaps
+
+
+def load_rental_index(listing_id, window_start=None, window_end=None):
+    """
+    İlanın iptal edilmemiş kiralamalarını TEK sorguyla okuyup IntervalIndex kurar.
+    Pencere verilirse sadece pencereyle çakışan kiralamalar okunur.
+    """
+    query = Transaction.query.with_entities(
+        Transaction.start_date, Transaction.end_date
+    ).filter(
+        Transaction.listing_id == listing_id,
+        Transaction.transaction_type == ListingType.RENT,
+        Transaction.status != TransactionStatus.CANCELLED
+    )
+    if window_start is not None and window_end is not None:
+        query = query.filter(
+            Transaction.start_date < window_end,
+            Transaction.end_date > window_start
+        )
+    return IntervalIndex((row.start_date, row.end_date) for row in query)
+
+
+def default_window(start, days=90):
+    """'to' verilmezse kullanılan takvim penceresi: start'tan itibaren 'days' gün."""
+    return start, start + timedelta(days=days)
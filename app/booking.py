@@ -0,0 +1,91 @@
+# /app/booking.py
+
+"""
+Kiralama çakışmalarının veritabanı seviyesinde engellenmesi.
+
+Kural: Aynı ilan için, tarihleri [start_date, end_date) olarak çakışan iki
+ONAYLI (COMPLETED) kiralama olamaz. Beklemedeki (PENDING) talepler birer
+rezervasyon isteğidir; aynı anda gelen iki istek ikisi de PENDING olarak
+kaydedilebilir, fakat sadece biri onaylanabilir.
+
+- PostgreSQL: btree_gist + daterange EXCLUDE kısıtı.
+- SQLite: aynı koşulu kontrol eden BEFORE INSERT/UPDATE tetikleyicileri.
+  SQLite yazma işlemlerini tek bir veritabanı kilidiyle sıraya koyduğu için
+  tetikleyicideki kontrol ile yazma aynı kilit altında, atomik çalışır.
+"""
+
+from sqlalchemy import event, text, and_, update, select
+
+from app import db
+from app.models import Transaction, ListingType, TransactionStatus
+
+CONSTRAINT_NAME = 'ex_transactions_rental_no_overlap'
+
+POSTGRES_DDL = [
+    'CREATE EXTENSION IF NOT EXISTS btree_gist',
+    f"ALTER TABLE transactions ADD CONSTRAINT {CONSTRAINT_NAME} "
+    "EXCLUDE USING gist (listing_id WITH =, daterange(start_date, end_date, '[)') WITH &&) "
+    "WHERE (transaction_type = 'RENT' AND status = 'COMPLETED')",
+]
+
+_SQLITE_OVERLAP_WHEN = (
+    "NEW.transaction_type = 'RENT' AND NEW.status = 'COMPLETED' AND EXISTS ("
+    "SELECT 1 FROM transactions t WHERE t.listing_id = NEW.listing_id "
+    "AND t.id IS NOT NEW.id AND t.transaction_type = 'RENT' AND t.status = 'COMPLETED' "
+    "AND t.start_date < NEW.end_date AND t.end_date > NEW.start_date)"
+)
+
+SQLITE_DDL = [
+    f"CREATE TRIGGER IF NOT EXISTS {CONSTRAINT_NAME}_insert BEFORE INSERT ON transactions "
+    f"WHEN {_SQLITE_OVERLAP_WHEN} "
+    f"BEGIN SELECT RAISE(ABORT, '{CONSTRAINT_NAME}'); END",
+    f"CREATE TRIGGER IF NOT EXISTS {CONSTRAINT_NAME}_update "
+    "BEFORE UPDATE OF status, start_date, end_date, listing_id ON transactions "
+    f"WHEN {_SQLITE_OVERLAP_WHEN} "
+    f"BEGIN SELECT RAISE(ABORT, '{CONSTRAINT_NAME}'); END",
+]
+
+
+def is_rental_overlap_error(exc):
+    """Yakalanan IntegrityError bu çakışma kısıtından mı geliyor?"""
+    return CONSTRAINT_NAME in str(getattr(exc, 'orig', exc))
+
+
+def cancel_overlapping_pending(transaction):
+    """
+    Onaylanan kiralamayla çakışan, aynı ilana ait diğer PENDING talepleri
+    tek bir toplu UPDATE ile iptal eder. Çağıran taraf commit'ten sorumludur.
+    Dönüş: iptal edilen taleplerin created_at değerleri (analitik özetler için).
+    """
+    criteria = (
+        Transaction.listing_id == transaction.listing_id,
+        Transaction.id != transaction.id,
+        Transaction.transaction_type == ListingType.RENT,
+        Transaction.status == TransactionStatus.PENDING,
+        and_(Transaction.start_date < transaction.end_date,
+             Transaction.end_date > transaction.start_date)
+    )
+    stmt = update(Transaction).where(*criteria) \
+        .values(status=TransactionStatus.CANCELLED) \
+        .execution_options(synchronize_session=False)
+
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(stmt.returning(Transaction.created_at)).scalars().all()
+
+    # RETURNING yoksa: aynı işlem içinde önce oku, sonra güncelle
+    created_ats = db.session.execute(select(Transaction.created_at).where(*criteria)).scalars().all()
+    db.session.execute(stmt)
+    return created_ats
+
+
+@event.listens_for(Transaction.__table__, 'after_create')
+def _create_rental_overlap_guard(target, connection, **kw):
+    """db.create_all() ile de (migration olmadan) aynı korumayı kurar."""
+    if connection.dialect.name == 'postgresql':
+        statements = POSTGRES_DDL
+    elif connection.dialect.name == 'sqlite':
+        statements = SQLITE_DDL
+    else:
+        return
+    for statement in statements:
+        connection.execute(text(statement))
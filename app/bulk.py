@@ -0,0 +1,282 @@
+# /app/bulk.py
+
+"""
+Toplu ürün / ilan oluşturma (envanter içe aktarımı).
+
+Akış:
+  1. Tüm öğeler veritabanına yazmadan önce doğrulanır. Tek bir hatalı öğe
+     varsa hiçbir şey yazılmaz ve öğe bazında hatalar döner.
+  2. Ürünler ve ilanlar, tek bir veritabanı işlemi içinde birer toplu
+     INSERT ... RETURNING (executemany) ile eklenir.
+  3. Arama indeksi tek sorguda doldurulur, 'listings' koleksiyon sürümü
+     bir kez artırılır (ORM flush'ı olmadığı için elle).
+
+İlan türü kuralları create_listing ile ortaktır (parse_listing_type,
+listing_type_values). Fiyatlar burada Decimal'e çevrilir: pozitif, en fazla
+iki ondalık ve Numeric(10, 2) sınırında olmalıdır; böylece hatalı bir değer
+INSERT sırasında değil, öğe bazında hata olarak döner.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from flask import current_app
+from sqlalchemy import insert, select
+
+from app import db
+from app import search, versioning
+from app.models import Product, Listing, ListingType
+
+DEFAULT_BULK_MAX_ITEMS = 500
+# listings.price / rental_price_per_day: Numeric(10, 2)
+MAX_PRICE = Decimal('99999999.99')
+
+
+class ListingDefinitionError(ValueError):
+    """İlan tanımı (tür ve türe özel alanlar) geçersiz olduğunda fırlatılır."""
+
+
+def parse_listing_type(value):
+    try:
+        return ListingType(value)
+    except (ValueError, TypeError):
+        raise ListingDefinitionError("Geçersiz listing_type. 'sale', 'rent' veya 'swap' olmalı.")
+
+
+def parse_price(value, name):
+    """JSON sayı veya metin -> pozitif Decimal (en fazla iki ondalık)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ListingDefinitionError(f'"{name}" bir sayı olmalıdır.')
+    try:
+        # float'lar metin üzerinden: 19.99 -> Decimal('19.99')
+        price = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ListingDefinitionError(f'"{name}" bir sayı olmalıdır.')
+    if not price.is_finite() or price <= 0:
+        raise ListingDefinitionError(f'"{name}" sıfırdan büyük olmalıdır.')
+    if price.as_tuple().exponent < -2:
+        raise ListingDefinitionError(f'"{name}" en fazla iki ondalık basamak içerebilir.')
+    if price > MAX_PRICE:
+        raise ListingDefinitionError(f'"{name}" en fazla {MAX_PRICE} olabilir.')
+    return price
+
+
+def listing_type_values(listing_type, data):
+    """İlan türüne göre zorunlu alanı doğrular ve Listing kolonlarını döner."""
+    if listing_type == ListingType.SALE:
+        if data.get('price') in (None, ''):
+            raise ListingDefinitionError('Satış ilanları için "price" zorunludur.')
+        return {'price': parse_price(data['price'], 'price')}
+
+    if listing_type == ListingType.RENT:
+        if data.get('rental_price_per_day') in (None, ''):
+            raise ListingDefinitionError('Kiralama ilanları için "rental_price_per_day" zorunludur.')
+        return {'rental_price_per_day': parse_price(data['rental_price_per_day'], 'rental_price_per_day')}
+
+    if not data.get('swap_preference'):
+        raise ListingDefinitionError('Takas ilanları için "swap_preference" (takasta ne istediğiniz) zorunludur.')
+    if not isinstance(data['swap_preference'], str):
+        raise ListingDefinitionError('"swap_preference" bir metin olmalıdır.')
+    return {'swap_preference': data['swap_preference']}
+
+
+def _listing_definition(data):
+    if not data.get('listing_type'):
+        raise ListingDefinitionError('listing_type zorunludur.')
+    listing_type = parse_listing_type(data['listing_type'])
+    return {'listing_type': listing_type, **listing_type_values(listing_type, data)}
+
+
+# Ürün metin alanları ve kolon uzunlukları (None: sınırsız)
+_PRODUCT_FIELDS = (('title', 200), ('category', 100), ('description', None), ('image_url', 500))
+
+
+def _product_field_error(item):
+    for name, max_length in _PRODUCT_FIELDS:
+        value = item.get(name)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return f'"{name}" bir metin olmalıdır.'
+        if max_length is not None and len(value) > max_length:
+            return f'"{name}" en fazla {max_length} karakter olabilir.'
+    return None
+
+
+def check_item_count(items):
+    """'items' bir liste mi ve sınır içinde mi? Hata mesajı veya None döner."""
+    max_items = current_app.config.get('BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+    if not isinstance(items, list) or not items:
+        return '"items" boş olmayan bir liste olmalıdır.'
+    if len(items) > max_items:
+        return f'Tek istekte en fazla {max_items} öğe gönderilebilir.'
+    return None
+
+
+# --- Ürün + ilan ---
+
+def validate_product_items(items):
+    """
+    [{title, category, description?, image_url?, listing?: {listing_type, ...}}, ...]
+    Dönüş: (geçerli öğeler, [{'index', 'message'}, ...])
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('title') or not item.get('category'):
+            errors.append({'index': index, 'message': 'Eksik bilgi (title ve category zorunludur).'})
+            continue
+        field_error = _product_field_error(item)
+        if field_error:
+            errors.append({'index': index, 'message': field_error})
+            continue
+        listing = None
+        if item.get('listing') is not None:
+            if not isinstance(item['listing'], dict):
+                errors.append({'index': index, 'message': '"listing" bir nesne olmalıdır.'})
+                continue
+            try:
+                listing = _listing_definition(item['listing'])
+            except ListingDefinitionError as e:
+                errors.append({'index': index, 'message': str(e)})
+                continue
+        valid.append({
+            'product': {
+                'title': item['title'],
+                'description': item.get('description'),
+                'category': item['category'],
+                'image_url': item.get('image_url')
+            },
+            'listing': listing
+        })
+    return valid, errors
+
+
+def _insert_returning_ids(model, rows):
+    """
+    Satırları toplu ekler; oluşan id'leri gönderilen sırayla döner.
+    PostgreSQL'de sort_by_parameter_order toplu (sentinel'li) çalışır.
+    SQLite'ta ise satır satır INSERT'e düşer; orada tek çok satırlı INSERT
+    kullanılır: rowid'ler VALUES sırasıyla arttığı için sıralanmış id'ler
+    parametre sırasına denk gelir.
+    ORM toplu ekleme, None olan kolonları atlayıp satırları kolon kümesine
+    göre ayrı ifadelere böler (ör. satış satırında price, takasta
+    swap_preference); eksik kolonlar None ile tamamlanıp render_nulls ile
+    tüm satırlar tek ifadede tutulur.
+    """
+    if not rows:
+        return []
+    columns = {key for row in rows for key in row}
+    rows = [dict.fromkeys(columns) | row for row in rows]
+    ordered = db.session.get_bind().dialect.name != 'sqlite'
+    ids = db.session.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=ordered)
+        .execution_options(render_nulls=True),
+        rows
+    ).scalars().all()
+    return ids if ordered else sorted(ids)
+
+
+def create_products_with_listings(owner_id, valid_items):
+    """
+    Doğrulanmış öğeleri ekler. Çağıran taraf commit/rollback'ten sorumludur.
+    Dönüş: [{'index', 'product_id', 'listing_id'}, ...]
+    """
+    # --- 1. Ürünler: tek executemany, id'ler sırayla ---
+    product_ids = _insert_returning_ids(
+        Product, [{**item['product'], 'owner_id': owner_id} for item in valid_items])
+
+    # --- 2. İlanı olan ürünler için ilanlar ---
+    listing_owners = [index for index, item in enumerate(valid_items) if item['listing']]
+    listing_ids = _insert_returning_ids(Listing, [
+        {**valid_items[index]['listing'], 'product_id': product_ids[index], 'lister_id': owner_id}
+        for index in listing_owners
+    ])
+    listing_by_index = dict(zip(listing_owners, listing_ids))
+
+    # --- 3. Arama indeksi ve koleksiyon sürümü ---
+    search.index_products(product_ids)
+    versioning.bump_before_commit()
+
+    return [{
+        'index': index,
+        'product_id': product_id,
+        'listing_id': listing_by_index.get(index)
+    } for index, product_id in enumerate(product_ids)]
+
+
+# --- Mevcut ürünler için ilan ---
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_listing_items(owner_id, items):
+    """
+    [{product_id, listing_type, ...}, ...] — create_listing ile aynı kurallar.
+    Ürün sahipliği ve mevcut ilanlar tek sorguda kontrol edilir.
+    Dönüş: (geçerli ilan satırları, [{'index', 'message'}, ...])
+    """
+    product_ids = {item['product_id'] for item in items
+                   if isinstance(item, dict) and _is_id(item.get('product_id'))}
+    owners = {}
+    listed = set()
+    if product_ids:
+        rows = db.session.execute(
+            select(Product.id, Product.owner_id, Listing.id)
+            .outerjoin(Listing, Listing.product_id == Product.id)
+            .where(Product.id.in_(product_ids))
+        )
+        for product_id, product_owner_id, listing_id in rows:
+            owners[product_id] = product_owner_id
+            if listing_id is not None:
+                listed.add(product_id)
+
+    valid, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        def fail(message):
+            errors.append({'index': index, 'message': message})
+
+        if not isinstance(item, dict) or not item.get('product_id') or not item.get('listing_type'):
+            fail('product_id ve listing_type zorunludur.')
+            continue
+        if not _is_id(item['product_id']):
+            fail('product_id bir tam sayı olmalıdır.')
+            continue
+        product_id = item['product_id']
+        try:
+            listing_type = parse_listing_type(item['listing_type'])
+        except ListingDefinitionError as e:
+            fail(str(e))
+            continue
+        if product_id not in owners:
+            fail('Ürün bulunamadı.')
+            continue
+        if owners[product_id] != owner_id:
+            fail('Sadece kendi ürünleriniz için ilan oluşturabilirsiniz.')
+            continue
+        if product_id in listed or product_id in seen:
+            fail('Bu ürün için zaten bir ilan mevcut.')
+            continue
+        try:
+            values = listing_type_values(listing_type, item)
+        except ListingDefinitionError as e:
+            fail(str(e))
+            continue
+
+        seen.add(product_id)
+        valid.append({'product_id': product_id, 'lister_id': owner_id,
+                      'listing_type': listing_type, **values})
+    return valid, errors
+
+
+def create_listings(listing_rows):
+    """
+    Doğrulanmış ilan satırlarını ekler. Çağıran taraf commit/rollback'ten sorumludur.
+    Dönüş: [{'index', 'product_id', 'listing_id'}, ...]
+    """
+    listing_ids = _insert_returning_ids(Listing, listing_rows)
+    versioning.bump_before_commit()
+    return [{
+        'index': index,
+        'product_id': row['product_id'],
+        'listing_id': listing_id
+    } for index, (row, listing_id) in enumerate(zip(listing_rows, listing_ids))]
@@ -0,0 +1,392 @@
+# /app/cache.py
+
+"""
+Serileştirilmiş varlıklar (ilan detayları vb.) için okuma-arkası (read-through) önbellek.
+
+Katmanlar:
+  1. LRUCache: süreç içi, boyut (max_entries) ve süre (TTL) sınırlı.
+  2. SharedCacheBackend: süreçler arası paylaşılan önbellek arayüzü
+     (ör. Redis). LocalSharedCache bu arayüzün yerel bir taklididir.
+
+Geçersiz kılma (invalidation): Her kayıt "etiketlerle" (tag) saklanır,
+örn. listing:5, product:12, user:3. SQLAlchemy after_flush olayında değişen
+Listing/Product/User.username satırlarının etiketleri toplanır ve sadece
+after_commit olayında silinir; rollback olursa hiçbir şey silinmez.
+Diğer süreçlerin L1 önbellekleri bu olayı görmez; paylaşılan katman ise
+anında temizlenir.
+
+Sürüm damgası: ETag'li endpoint'ler (app/versioning.py) kaydı okudukları
+koleksiyon sürümüyle yazar ve okurken isteğin sürümünü verir. Daha eski
+sürümle yazılmış kayıt ıskalama sayılır ve yeniden yüklenir. Böylece başka
+bir süreçte yapılan commit'ten veya gecikmeli bir replikadan kalan eski
+gövde, yeni sürümün ETag'iyle sunulmaz.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models import Listing, Product, User
+
+
+class CacheStats:
+    """Hit / miss / eviction sayaçları (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale': self.stale
+            }
+
+
+class CacheBackend:
+    """Önbellek arka ucu arayüzü. Anahtarlar str, değerler herhangi bir Python nesnesi."""
+
+    def get(self, key):
+        """Değeri döner; yoksa veya süresi dolduysa None."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None, tags=()):
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags):
+        """Verilen etiketlerden herhangi birini taşıyan tüm kayıtları siler."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUCache(CacheBackend):
+    """Süreç içi LRU önbellek; en fazla max_entries kayıt, her kayıt en fazla ttl saniye."""
+
+    def __init__(self, max_entries=1024, ttl=60, stats=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tag_index = {}           # tag -> {key, ...}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.stats.incr('expirations')
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None, tags=()):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.stats.incr('evictions')
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tag_index.get(tag, set())
+            for key in keys:
+                self._remove(key)
+        if keys:
+            self.stats.incr('invalidations', len(keys))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+
+class SharedCacheBackend(CacheBackend):
+    """
+    Süreçler arası paylaşılan önbellek arayüzü (ör. Redis, Memcached).
+    Değerler ağ üzerinden taşınacağı için bayt dizisi (bytes) olarak saklanır;
+    serileştirme bu sınıfta yapılır, alt sınıflar sadece _get/_set/_delete'i yazar.
+    """
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, payload, ttl, tags):
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags):
+        raise NotImplementedError
+
+    def get(self, key):
+        payload = self._get(key)
+        return pickle.loads(payload) if payload is not None else None
+
+    def set(self, key, value, ttl=None, tags=()):
+        self._set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl, frozenset(tags))
+
+
+class LocalSharedCache(SharedCacheBackend):
+    """
+    SharedCacheBackend'in yerel taklidi (testler ve tek makineli kurulumlar için).
+    Değerleri bayt olarak tutar; böylece gerçek bir uzak önbellekteki gibi
+    her okumada yeni bir kopya döner.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._store = {}       # key -> (expires_at, payload, tags)
+        self._tag_index = {}
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def _set(self, key, payload, ttl, tags):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store[key] = (expires_at, payload, tags)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tag_index.pop(tag, ()):
+                    self._store.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+            self._tag_index.clear()
+
+
+class EntityCache:
+    """
+    L1 (süreç içi LRU) + isteğe bağlı L2 (paylaşılan) okuma-arkası önbellek.
+    Flask eklentileri gibi init_app ile yapılandırılır.
+
+    Kayıtlar (sürüm, değer) olarak saklanır; L2'de etiketler de kayıtla
+    birlikte tutulur (L2'den L1'e alınan kopya aynı etiketlerle silinebilsin).
+    version verilen okumalarda, daha eski bir sürümle (veya sürümsüz) yazılmış
+    kayıt ıskalamadır ('stale').
+
+    Config:
+      ENTITY_CACHE_ENABLED       (varsayılan True)
+      ENTITY_CACHE_MAX_ENTRIES   (varsayılan 10000)
+      ENTITY_CACHE_TTL           saniye (varsayılan 60)
+      ENTITY_CACHE_SHARED_BACKEND  SharedCacheBackend örneği veya None
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+        self.enabled = False
+        self.local = None
+        self.shared = None
+
+    def init_app(self, app):
+        self.enabled = app.config.get('ENTITY_CACHE_ENABLED', True)
+        self.local = LRUCache(
+            max_entries=app.config.get('ENTITY_CACHE_MAX_ENTRIES', 10000),
+            ttl=app.config.get('ENTITY_CACHE_TTL', 60),
+            stats=self.stats
+        )
+        self.shared = app.config.get('ENTITY_CACHE_SHARED_BACKEND')
+        app.extensions['entity_cache'] = self
+
+    @staticmethod
+    def _is_stale(entry_version, version):
+        return version is not None and (entry_version is None or entry_version < version)
+
+    def _lookup(self, key, version=None):
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            shared_entry = self.shared.get(key)
+            if shared_entry is not None:
+                # L2 kaydı etiketleriyle gelir; L1'e de etiketli yazılır ki
+                # commit sonrası invalidate_tags bu kopyayı da silsin
+                entry_version, value, tags = shared_entry
+                entry = (entry_version, value)
+                self.local.set(key, entry, tags=tags)
+        if entry is not None and self._is_stale(entry[0], version):
+            self.stats.incr('stale')
+            entry = None
+        self.stats.incr('hits' if entry is not None else 'misses')
+        return entry[1] if entry is not None else None
+
+    def _store(self, key, value, tags, version=None):
+        tags = set(tags) | {key}
+        self.local.set(key, (version, value), tags=tags)
+        if self.shared is not None:
+            self.shared.set(key, (version, value, frozenset(tags)), tags=tags)
+
+    def get_or_load(self, key, loader, version=None):
+        """
+        Önbellekte varsa değeri döner; yoksa loader() çağrılır.
+        loader (değer, etiketler) döner; değer None ise önbelleğe yazılmaz.
+        version: isteğin okuduğu koleksiyon sürümü; loader bu sürümü okuduktan
+        sonra çağrılmalıdır (kayıt en az bu sürüm kadar yenidir).
+        """
+        if not self.enabled:
+            return loader()[0]
+
+        value = self._lookup(key, version)
+        if value is not None:
+            return value
+
+        value, tags = loader()
+        if value is not None:
+            self._store(key, value, tags, version)
+        return value
+
+    async def get_or_load_async(self, key, loader, version=None):
+        """get_or_load'un async karşılığı (ASGI yolu): loader bir coroutine fonksiyonudur."""
+        if not self.enabled:
+            return (await loader())[0]
+
+        value = self._lookup(key, version)
+        if value is not None:
+            return value
+
+        value, tags = await loader()
+        if value is not None:
+            self._store(key, value, tags, version)
+        return value
+
+    def get_many_or_load(self, keys, loader, version=None):
+        """
+        Çoklu okuma: önbellekte olmayan anahtarlar için loader(eksik_anahtarlar)
+        bir kez çağrılır ve {anahtar: (değer, etiketler)} döner.
+        Dönüş: {anahtar: değer} (bulunamayanlar dahil edilmez).
+        """
+        if not self.enabled:
+            return {key: value for key, (value, _) in loader(list(keys)).items() if value is not None}
+
+        found, missing = {}, []
+        for key in keys:
+            value = self._lookup(key, version)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        if missing:
+            for key, (value, tags) in loader(missing).items():
+                if value is not None:
+                    self._store(key, value, tags, version)
+                    found[key] = value
+        return found
+
+    def invalidate_tags(self, tags):
+        if not tags or self.local is None:
+            return
+        self.local.invalidate_tags(tags)
+        if self.shared is not None:
+            self.shared.invalidate_tags(tags)
+
+    def clear(self):
+        if self.local is not None:
+            self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats_dict(self):
+        data = self.stats.as_dict()
+        data['entries'] = len(self.local) if self.local is not None else 0
+        data['max_entries'] = self.local.max_entries if self.local is not None else 0
+        data['enabled'] = self.enabled
+        data['shared_backend'] = type(self.shared).__name__ if self.shared is not None else None
+        return data
+
+
+entity_cache = EntityCache()
+
+
+def invalidate_after_commit(session, tags):
+    """
+    ORM dışı (toplu UPDATE vb.) değişiklikler için: etiketleri, bu session'ın
+    commit'inden sonra silinmek üzere sıraya koyar.
+    """
+    session.info.setdefault('cache_invalidate_tags', set()).update(tags)
+
+
+def _tags_for(obj):
+    if isinstance(obj, Listing):
+        return {f'listing:{obj.id}'}
+    if isinstance(obj, Product):
+        return {f'product:{obj.id}'}
+    if isinstance(obj, User):
+        # Kullanıcı adı sadece ilan detaylarında görünür; diğer alanlar önemsiz
+        history = inspect(obj).attrs.username.history
+        if history.has_changes():
+            return {f'user:{obj.id}'}
+    return set()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_invalidation_tags(session, flush_context):
+    tags = set()
+    for obj in list(session.dirty) + list(session.deleted):
+        tags |= _tags_for(obj)
+    if tags:
+        invalidate_after_commit(session, tags)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    tags = session.info.pop('cache_invalidate_tags', None)
+    if tags:
+        entity_cache.invalidate_tags(tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('cache_invalidate_tags', None)
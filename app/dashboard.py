@@ -0,0 +1,169 @@
+# /app/dashboard.py
+
+"""
+Satıcı paneli (GET /api/transactions/received) sorgusu.
+
+Sayfa satırları (işlem + ürün başlığı + alıcı adı) ve filtrelenmiş kümenin
+tamamı üzerinden hesaplanan toplamlar tek bir SQL ifadesiyle okunur:
+
+    SELECT totals.*, page.*
+      FROM (SELECT count(*), sum(...) ... ) AS totals       -- her zaman 1 satır
+      LEFT OUTER JOIN (SELECT ... LIMIT :n) AS page ON 1 = 1
+
+Toplamlar satırı her sayfa satırına eklenir; sayfa boşsa bile (ör. son
+cursor'dan sonra) toplamlar tek bir satırda gelir.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func, case, true
+
+from app.models import Listing, Product, Transaction, User, ListingType, TransactionStatus
+from app.pagination import keyset_condition, encode_cursor
+
+# Satıcı paneli sadece satış ve kiralama işlemlerini gösterir
+RECEIVED_TYPES = {
+    'sale': ListingType.SALE,
+    'rent': ListingType.RENT
+}
+RECEIVED_STATUSES = {status.value: status for status in TransactionStatus}
+
+
+class InvalidDashboardParam(ValueError):
+    """type, status, from veya to parametresi geçersiz olduğunda fırlatılır."""
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise InvalidDashboardParam(f'{name} tarihi "YYYY-MM-DD" formatında olmalıdır.')
+
+
+def parse_received_filters(args):
+    """
+    Query string'den filtreleri okur:
+      ?type=sale|rent&status=pending|completed|cancelled&from=YYYY-MM-DD&to=YYYY-MM-DD
+    Tarih aralığı işlemin oluşturulma tarihine uygulanır ve iki uç da dahildir.
+    """
+    filters = {}
+
+    if args.get('type'):
+        if args['type'] not in RECEIVED_TYPES:
+            raise InvalidDashboardParam("type 'sale' veya 'rent' olmalıdır.")
+        filters['type'] = RECEIVED_TYPES[args['type']]
+
+    if args.get('status'):
+        if args['status'] not in RECEIVED_STATUSES:
+            raise InvalidDashboardParam("status 'pending', 'completed' veya 'cancelled' olmalıdır.")
+        filters['status'] = RECEIVED_STATUSES[args['status']]
+
+    if args.get('from'):
+        filters['from'] = _parse_date(args['from'], 'from')
+    if args.get('to'):
+        # 'to' günü de dahil: bir sonraki günün başından öncesi
+        filters['to'] = _parse_date(args['to'], 'to') + timedelta(days=1)
+
+    if 'from' in filters and 'to' in filters and filters['to'] <= filters['from']:
+        raise InvalidDashboardParam('to tarihi, from tarihinden önce olamaz.')
+    return filters
+
+
+def _criteria(seller_id, filters):
+    criteria = [Listing.lister_id == seller_id]
+    if 'type' in filters:
+        criteria.append(Transaction.transaction_type == filters['type'])
+    if 'status' in filters:
+        criteria.append(Transaction.status == filters['status'])
+    if 'from' in filters:
+        criteria.append(Transaction.created_at >= filters['from'])
+    if 'to' in filters:
+        criteria.append(Transaction.created_at < filters['to'])
+    return criteria
+
+
+def _status_count(status):
+    return func.coalesce(func.sum(case((Transaction.status == status, 1), else_=0)), 0)
+
+
+def received_statement(seller_id, filters, limit, after=None):
+    """Sayfa satırlarını ve toplamları birlikte döndüren tek select ifadesi."""
+    criteria = _criteria(seller_id, filters)
+
+    # --- 1. Toplamlar (sayfalamadan bağımsız, filtrelenmiş kümenin tamamı) ---
+    totals = select(
+        func.count(Transaction.id).label('total_count'),
+        # Gelir: sadece tamamlanmış işlemler
+        func.coalesce(func.sum(case(
+            (Transaction.status == TransactionStatus.COMPLETED, Transaction.total_price),
+            else_=0
+        )), 0).label('total_revenue'),
+        *[_status_count(status).label(f'count_{status.value}') for status in TransactionStatus]
+    ).select_from(Transaction) \
+     .join(Listing, Listing.id == Transaction.listing_id) \
+     .where(*criteria) \
+     .subquery('totals')
+
+    # --- 2. Sayfa satırları (keyset sayfalama, limit + 1) ---
+    page = select(
+        Transaction.id.label('transaction_id'),
+        Transaction.transaction_type,
+        Transaction.status,
+        Transaction.created_at,
+        Transaction.total_price,
+        Transaction.start_date,
+        Transaction.end_date,
+        Product.title.label('product_title'),
+        User.username.label('client_username')
+    ).join(Listing, Listing.id == Transaction.listing_id) \
+     .join(Product, Product.id == Listing.product_id) \
+     .join(User, User.id == Transaction.buyer_or_renter_id) \
+     .where(*criteria)
+
+    if after:
+        page = page.where(keyset_condition(Transaction.created_at, Transaction.id, after))
+
+    page = page.order_by(Transaction.created_at.desc(), Transaction.id.desc()) \
+               .limit(limit + 1) \
+               .subquery('page')
+
+    # --- 3. Toplamlar LEFT JOIN sayfa: tek gidiş-dönüş ---
+    return select(totals, page) \
+        .select_from(totals.outerjoin(page, true())) \
+        .order_by(page.c.created_at.desc(), page.c.transaction_id.desc())
+
+
+def split_received_rows(rows, limit):
+    """
+    received_statement sonucunu (işlemler, toplamlar, next_cursor) üçlüsüne ayırır.
+    """
+    first = rows[0]
+    totals = {
+        'count': first.total_count,
+        'revenue': first.total_revenue,
+        'by_status': {status.value: getattr(first, f'count_{status.value}')
+                      for status in TransactionStatus}
+    }
+
+    # Sayfa boşsa outer join tek bir NULL satırı üretir
+    page_rows = [row for row in rows if row.transaction_id is not None]
+
+    next_cursor = None
+    if len(page_rows) > limit:
+        page_rows = page_rows[:limit]
+        last = page_rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.transaction_id)
+
+    transactions = [{
+        'transaction_id': row.transaction_id,
+        'type': row.transaction_type,
+        'status': row.status,
+        'date': row.created_at,
+        'product_title': row.product_title,
+        'total_price': row.total_price,
+        'client_username': row.client_username,
+        'start_date': row.start_date.isoformat() if row.start_date else None,
+        'end_date': row.end_date.isoformat() if row.end_date else None,
+    } for row in page_rows]
+
+    return transactions, totals, next_cursor
@@ -0,0 +1,165 @@
+# /app/db_pool.py
+
+"""
+Veritabanı bağlantı havuzu ayarları ve havuz metrikleri.
+
+Config (create_app içinde SQLALCHEMY_ENGINE_OPTIONS'a çevrilir):
+  DB_POOL_SIZE               kalıcı bağlantı sayısı (varsayılan 10)
+  DB_MAX_OVERFLOW            havuz dolunca açılabilecek ek bağlantı (varsayılan 20)
+  DB_POOL_TIMEOUT            boş bağlantı beklenecek en uzun süre, tam saniye (varsayılan 30)
+  DB_POOL_RECYCLE            bu kadar saniyeden eski bağlantılar yenilenir (varsayılan 1800)
+  DB_POOL_PRE_PING           kullanmadan önce bağlantıyı yokla (varsayılan True)
+  DB_STATEMENT_TIMEOUT_MS    PostgreSQL statement_timeout (0: kapalı)
+
+Config sınıfında açıkça verilen SQLALCHEMY_ENGINE_OPTIONS değerleri bu
+ayarların üzerine yazar (ör. benchmark'lardaki SQLite connect_args).
+
+Havuz sınıfı InstrumentedQueuePool'dur: her checkout'un bekleme süresini,
+zaman aşımlarını ve en yüksek eşzamanlı bağlantı sayısını sayar.
+GET /api/internal/db-pool bu sayaçları ve havuzun anlık durumunu döner.
+
+Desteklenen veritabanları PostgreSQL ve SQLite'tır (arama, özet tablo upsert'leri,
+EXPLAIN kontrolü lehçeye özgü SQL kullanır). create_app, primary ve replika
+URL'lerini check_dialects ile bir kez kontrol eder; başka bir veritabanı
+ilk istekte değil, başlangıçta UnsupportedDatabase ile reddedilir.
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+SUPPORTED_DIALECTS = ('postgresql', 'sqlite')
+
+
+class UnsupportedDatabase(RuntimeError):
+    """Veritabanı URL'i PostgreSQL veya SQLite değil."""
+
+
+class PoolMetrics:
+    """Thread-safe, süreç ömrü boyunca biriken havuz sayaçları."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, wait, checked_out):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, wait):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def as_dict(self):
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_ms_avg': round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                'wait_ms_max': round(self.wait_max * 1000, 3),
+                'peak_checked_out': self.peak_checked_out
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool + checkout süresi ölçümü. Süre; boş bağlantı beklemeyi,
+    gerekiyorsa yeni bağlantı açmayı ve pre-ping'i kapsar.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # dispose() sonrası yeni havuz aynı sayaçlarla devam eder
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def check_dialects(config):
+    """Primary ve replika URL'leri desteklenen bir veritabanına işaret etmiyorsa UnsupportedDatabase."""
+    uris = [config.get('SQLALCHEMY_DATABASE_URI') or '', *(config.get('DB_REPLICA_URLS') or ())]
+    for uri in uris:
+        try:
+            dialect = make_url(uri).get_backend_name()
+        except exc.ArgumentError:
+            raise UnsupportedDatabase(f"Geçersiz veritabanı URL'i: {uri!r}")
+        if dialect not in SUPPORTED_DIALECTS:
+            raise UnsupportedDatabase(f'{dialect} desteklenmiyor (desteklenenler: '
+                                      f'{", ".join(SUPPORTED_DIALECTS)}).')
+
+
+def _is_memory_sqlite(uri):
+    return uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri
+
+
+def engine_options(config):
+    """Config değerlerinden SQLALCHEMY_ENGINE_OPTIONS sözlüğünü üretir."""
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    options = {}
+
+    # Bellek içi SQLite tek bağlantılı özel havuz kullanır; dokunulmaz
+    if not _is_memory_sqlite(uri):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.get('DB_POOL_SIZE', 10),
+            max_overflow=config.get('DB_MAX_OVERFLOW', 20),
+            pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+            pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+            pool_pre_ping=config.get('DB_POOL_PRE_PING', True)
+        )
+
+    statement_timeout = config.get('DB_STATEMENT_TIMEOUT_MS') or 0
+    if statement_timeout and uri.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout)}'}
+
+    # Açıkça verilen ayarlar önceliklidir (connect_args birleştirilir)
+    explicit = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if 'connect_args' in explicit:
+        explicit['connect_args'] = {**options.get('connect_args', {}), **explicit['connect_args']}
+    options.update(explicit)
+    return options
+
+
+def pool_status(engine):
+    """Bir engine'in havuz durumunu ve (varsa) birikmiş metriklerini döner."""
+    pool = engine.pool
+    status = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout()
+        )
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        status.update(metrics.as_dict())
+    return status
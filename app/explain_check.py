@@ -0,0 +1,133 @@
+# /app/explain_check.py
+
+"""
+Sıcak endpoint sorgularının indeks kullandığını EXPLAIN ile doğrular.
+
+Her endpoint'in sorgu şekli burada birebir tekrarlanır ve veritabanının
+planına bakılır. Büyük tablolardan (HOT_TABLES) birinde tam tablo taraması
+(full scan) görülürse kontrol başarısız olur. 'flask explain-check'
+komutu (run.py) bu modülü çalıştırır; CI'da yeni bir migration sonrası
+koşturulması amaçlanmıştır.
+
+- PostgreSQL: enable_seqscan kapatılarak EXPLAIN (FORMAT JSON) alınır.
+  Kullanılabilir bir indeks varsa planlayıcı onu seçer; buna rağmen
+  'Seq Scan' kalıyorsa sorgu için uygun indeks yok demektir.
+- SQLite: EXPLAIN QUERY PLAN çıktısında 'USING ... INDEX' olmadan
+  'SCAN <tablo>' satırı aranır.
+"""
+
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app import db, dashboard, export, feed, matchmaking, offers, reads
+from app.models import (Listing, Product, Transaction,
+                        ListingType, TransactionStatus, OfferStatus)
+
+# Tam taramaya izin verilmeyen tablolar
+HOT_TABLES = {'listings', 'transactions', 'swap_offers', 'products'}
+
+_SQLITE_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+
+
+def endpoint_queries():
+    """(endpoint adı, sorgu) çiftleri. Parametre değerleri önemsizdir."""
+    some_day = date(2030, 1, 1)
+    return [
+        ('GET /api/listings', reads.feed_statement(20)),
+        ('GET /api/listings?listing_type', reads.feed_statement(20, filters={
+            'sort': 'newest', 'type': ListingType.RENT})),
+        ('GET /api/listings?category', reads.feed_statement(20, filters={
+            'sort': 'newest', 'category': 'elektronik'})),
+        ('GET /api/listings?sort=price_asc&min_price', reads.feed_statement(20, filters={
+            'sort': 'price_asc', 'min_price': Decimal('100')})),
+        ('GET /api/listings?listing_type&sort=price_desc', reads.feed_statement(20, filters={
+            'sort': 'price_desc', 'type': ListingType.SALE})),
+        ('GET /api/listings?facets', feed.facets_statement({'sort': 'newest'})),
+        ('GET /api/listings?facets&max_price', feed.facets_statement({
+            'sort': 'newest', 'max_price': Decimal('500')})),
+        # Tam dışa aktarım bilerek tüm kataloğu okur; sıcak olan artımlı çekim
+        ('GET /api/listings/export?updated_since', export.listings_export_statement(datetime(2024, 1, 1))),
+        ('GET /api/listings/my_listings', Listing.query.filter_by(lister_id=1)
+            .order_by(Listing.created_at.desc())),
+        ('POST /api/transactions/rent', Transaction.query.filter(
+            Transaction.listing_id == 1,
+            Transaction.transaction_type == ListingType.RENT,
+            Transaction.status != TransactionStatus.CANCELLED,
+            Transaction.start_date < some_day,
+            Transaction.end_date > some_day
+        ).limit(1)),
+        ('GET /api/transactions/my_purchases', reads.purchases_statement(1)),
+        ('GET /api/transactions/my_rentals', reads.rentals_statement(1)),
+        ('GET /api/transactions/received', dashboard.received_statement(
+            1, {'status': TransactionStatus.COMPLETED}, 20)),
+        ('GET /api/swap/offers/sent', offers.sent_offers_statement(1, {}, 20)),
+        ('GET /api/swap/offers/sent?status', offers.sent_offers_statement(
+            1, {'status': OfferStatus.PENDING}, 20)),
+        ('GET /api/swap/offers/received/<id>', offers.received_offers_statement(1, {}, 20)),
+        ('GET /api/swap/offers/received/<id>?status', offers.received_offers_statement(
+            1, {'status': OfferStatus.PENDING}, 20)),
+        ('GET /api/swap/offers/inbox', offers.inbox_statement(1)),
+        # Tam kurulum (active_swaps_statement) süreç başına bir kezdir; sıcak olan artımlı güncelleme
+        ('GET /api/swap/matches (refresh)', matchmaking.changed_swaps_statement(datetime(2024, 1, 1))),
+        ('GET /api/swap/matches', matchmaking.summaries_statement([1, 2, 3])),
+        ('GET /api/products', Product.query.filter_by(owner_id=1)),
+    ]
+
+
+def _compile(query, dialect):
+    """Sorguyu (ORM Query veya Core select) parametreleri gömülü düz SQL'e çevirir."""
+    statement = getattr(query, 'statement', query)
+    return str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+
+def _postgres_full_scans(connection, sql):
+    connection.execute(text('SET LOCAL enable_seqscan = off'))
+    plan = connection.execute(text('EXPLAIN (FORMAT JSON) ' + sql)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+    stack = [plan[0]['Plan']]
+    while stack:
+        node = stack.pop()
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in HOT_TABLES:
+            scans.append(node['Relation Name'])
+        stack.extend(node.get('Plans', []))
+    return scans
+
+
+def _sqlite_full_scans(connection, sql):
+    scans = []
+    for row in connection.execute(text('EXPLAIN QUERY PLAN ' + sql)):
+        detail = row[-1]
+        match = _SQLITE_SCAN_RE.match(detail)
+        if match and match.group(1) in HOT_TABLES and 'USING' not in detail:
+            scans.append(match.group(1))
+    return scans
+
+
+def run_explain_check():
+    """
+    Tüm endpoint sorgularını EXPLAIN eder.
+    Dönüş: [(endpoint adı, [tam taranan tablolar]), ...] — sadece başarısız olanlar.
+    """
+    engine = db.engine
+    dialect = engine.dialect
+    # Desteklenen veritabanları (PostgreSQL, SQLite) create_app'te kontrol edilir
+    full_scans = _postgres_full_scans if dialect.name == 'postgresql' else _sqlite_full_scans
+
+    failures = []
+    for name, query in endpoint_queries():
+        sql = _compile(query, dialect)
+        # Her sorgu ayrı bir transaction'da; SET LOCAL dışarı sızmaz
+        with engine.connect() as connection:
+            with connection.begin() as trans:
+                scans = full_scans(connection, sql)
+                trans.rollback()
+        if scans:
+            failures.append((name, scans))
+    return failures
@@ -0,0 +1,142 @@
+# /app/export.py
+
+"""
+Büyük veri dışa aktarımı için akış (streaming) yardımcıları.
+
+Satırlar sunucu tarafı cursor ile (stream_results + yield_per) partiler
+halinde okunur ve her parti hemen NDJSON veya CSV olarak istemciye yazılır.
+Bellek kullanımı toplam satır sayısından bağımsız olarak sabit kalır.
+
+Artımlı çekimde (updated_since) ilan ve ürün için iki ayrı kol UNION ile
+birleştirilir; her kol kendi updated_at indeksini kullanır (tek bir OR
+koşulu JOIN üzerinden iki indeksi de kullanamaz, tam tarama yapar).
+"""
+
+import csv
+import enum
+import io
+from datetime import date, datetime, timezone
+
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import select, union
+
+from app import db
+from app.models import Listing, Product, User
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8'
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class InvalidExportParam(ValueError):
+    """format veya updated_since parametresi geçersiz olduğunda fırlatılır."""
+
+
+def parse_export_args(args):
+    """Query string'den (format, updated_since) çiftini doğrular."""
+    fmt = (args.get('format') or 'ndjson').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise InvalidExportParam("format 'ndjson' veya 'csv' olmalıdır.")
+
+    updated_since = None
+    if args.get('updated_since'):
+        try:
+            updated_since = datetime.fromisoformat(args['updated_since'])
+        except ValueError:
+            raise InvalidExportParam('updated_since ISO 8601 formatında olmalıdır (ör. 2025-01-31T00:00:00).')
+        # Veritabanında UTC (naive) tutulduğu için saat dilimi bilgisi atılır
+        if updated_since.tzinfo is not None:
+            updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+    return fmt, updated_since
+
+
+def _listings_export_columns():
+    return (
+        Listing.id.label('listing_id'),
+        Listing.listing_type,
+        Listing.is_active,
+        Listing.price,
+        Listing.rental_price_per_day,
+        Listing.swap_preference,
+        Listing.created_at,
+        Listing.updated_at,
+        Product.id.label('product_id'),
+        Product.title,
+        Product.description,
+        Product.category,
+        Product.image_url,
+        User.username.label('lister_username')
+    )
+
+
+def listings_export_statement(updated_since=None):
+    """
+    İlan kataloğu (aktif ve pasif), ilan id'sine göre sıralı.
+    updated_since verilirse ilanı veya ürünü o tarihten sonra değişmiş satırlar.
+    """
+    def branch(*criteria):
+        return select(*_listings_export_columns()) \
+            .join(Product, Product.id == Listing.product_id) \
+            .join(User, User.id == Listing.lister_id) \
+            .where(*criteria)
+
+    if updated_since is None:
+        return branch().order_by(Listing.id)
+
+    changed = union(branch(Listing.updated_at >= updated_since),
+                    branch(Product.updated_at >= updated_since)).subquery('changed')
+    return select(changed).order_by(changed.c.listing_id)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_batches(result, columns):
+    dumps = current_app.json.dumps_bytes
+    for partition in result.partitions():
+        yield b''.join(dumps(dict(zip(columns, row))) + b'\n' for row in partition)
+
+
+def _csv_batches(result, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for partition in result.partitions():
+        writer.writerows([_csv_value(value) for value in row] for row in partition)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Hiç satır yoksa sadece başlık satırı
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_export(stmt, fmt, filename, batch_size=None):
+    """
+    Bir Core select ifadesini NDJSON/CSV olarak akıtan Response döner.
+    Kolon adları select'teki etiketlerden (label) alınır.
+    """
+    batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    columns = [c.key for c in stmt.selected_columns]
+
+    def generate():
+        result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        try:
+            batches = _ndjson_batches if fmt == 'ndjson' else _csv_batches
+            yield from batches(result, columns)
+        finally:
+            result.close()
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    return response
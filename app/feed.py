@@ -0,0 +1,171 @@
+# /app/feed.py
+
+"""
+Herkese açık ilan akışının (GET /api/listings) filtreleri, sıralaması ve facet'leri.
+
+    ?listing_type=sale|rent|swap
+    ?category=<ürün kategorisi>              (tam eşleşme)
+    ?min_price=&max_price=                   liste fiyatı: satışta fiyat, kiralamada günlük kira
+    ?sort=newest|price_asc|price_desc        varsayılan: newest
+    ?facets=1                                yanıta kenar çubuğu sayıları eklenir
+
+Sayfa sorgusu app/reads.py'deki feed_statement'tır; keyset cursor sıralama
+anahtarını (created_at veya liste fiyatı) ve id'yi taşır. Fiyata göre
+sıralamada fiyatı olmayan takas ilanları kümede yer almaz.
+
+Facet'ler tek bir GROUP BY (kategori, ilan türü) sorgusudur ve sayfayla aynı
+istekte, aynı bağlantıda çalışır. Sayılar 'disjunctive'dir: kategori sayıları
+seçili kategoriyi, tür sayıları seçili türü yok sayar (kenar çubuğunda diğer
+seçeneklerin de kaç ilan getireceği görünür); diğer tüm filtreler uygulanır.
+Gruplar (kategori x 3 tür) küçüktür, katlama Python'da yapılır.
+"""
+
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import select, func
+
+from app.models import Listing, Product, ListingType
+from app.pagination import encode_cursor
+
+FEED_TYPES = {listing_type.value: listing_type for listing_type in ListingType}
+
+# Liste fiyatı: bir ilanda price ve rental_price_per_day'den en fazla biri doludur
+# (ix_listings_active_list_price ve ix_listings_active_type_list_price bu ifade üzerindedir)
+list_price = func.coalesce(Listing.price, Listing.rental_price_per_day)
+
+# sort -> (sıralama anahtarı, azalan mı)
+FEED_SORTS = {
+    'newest': (Listing.created_at, True),
+    'price_asc': (list_price, False),
+    'price_desc': (list_price, True)
+}
+DEFAULT_SORT = 'newest'
+
+_TRUE_VALUES = {'1', 'true', 'yes'}
+
+
+class InvalidFeedParam(ValueError):
+    """listing_type, category, fiyat aralığı veya sort parametresi geçersiz olduğunda fırlatılır."""
+
+
+def _parse_price(value, name):
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise InvalidFeedParam(f'{name} bir sayı olmalıdır.')
+    if not price.is_finite() or price < 0:
+        raise InvalidFeedParam(f'{name} negatif olmayan bir sayı olmalıdır.')
+    return price
+
+
+def parse_feed_filters(args):
+    """Query string'den filtreleri ve sıralamayı okur; 'sort' her zaman doludur."""
+    filters = {'sort': args.get('sort') or DEFAULT_SORT}
+    if filters['sort'] not in FEED_SORTS:
+        raise InvalidFeedParam("sort 'newest', 'price_asc' veya 'price_desc' olmalıdır.")
+
+    if args.get('listing_type'):
+        if args['listing_type'] not in FEED_TYPES:
+            raise InvalidFeedParam("listing_type 'sale', 'rent' veya 'swap' olmalıdır.")
+        filters['type'] = FEED_TYPES[args['listing_type']]
+
+    category = (args.get('category') or '').strip()
+    if category:
+        filters['category'] = category
+
+    if args.get('min_price'):
+        filters['min_price'] = _parse_price(args['min_price'], 'min_price')
+    if args.get('max_price'):
+        filters['max_price'] = _parse_price(args['max_price'], 'max_price')
+    if 'min_price' in filters and 'max_price' in filters and filters['max_price'] < filters['min_price']:
+        raise InvalidFeedParam('max_price, min_price değerinden küçük olamaz.')
+    return filters
+
+
+def wants_facets(args):
+    return (args.get('facets') or '').lower() in _TRUE_VALUES
+
+
+def _price_criteria(filters):
+    criteria = [Listing.is_active == True]
+    if 'min_price' in filters:
+        criteria.append(list_price >= filters['min_price'])
+    if 'max_price' in filters:
+        criteria.append(list_price <= filters['max_price'])
+    if filters.get('sort', DEFAULT_SORT) != 'newest':
+        # Fiyat sıralamasında keyset anahtarı NULL olamaz
+        criteria.append(list_price.isnot(None))
+    return criteria
+
+
+def feed_criteria(filters):
+    """Sayfa sorgusunun WHERE koşulları (aktiflik dahil)."""
+    criteria = _price_criteria(filters)
+    if 'type' in filters:
+        criteria.append(Listing.listing_type == filters['type'])
+    if 'category' in filters:
+        # products(category, id) indeksi; ürün satırı zaten joinedload ile ayrıca gelir
+        criteria.append(Listing.product_id.in_(
+            select(Product.id).where(Product.category == filters['category'])
+        ))
+    return criteria
+
+
+def feed_sort(filters):
+    """(sıralama anahtarı, azalan mı)"""
+    return FEED_SORTS[filters.get('sort', DEFAULT_SORT)]
+
+
+def split_feed_page(rows, filters, limit):
+    """limit + 1 ilandan (sayfa, next_cursor) ayırır; cursor sıralama anahtarını taşır."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if filters.get('sort', DEFAULT_SORT) == 'newest':
+            key = last.created_at
+        else:
+            key = last.price if last.price is not None else last.rental_price_per_day
+        next_cursor = encode_cursor(key, last.id)
+    return rows, next_cursor
+
+
+# --- Facet'ler ---
+
+def facets_statement(filters):
+    """Kategori ve tür filtreleri hariç kümede (kategori, tür) başına ilan sayısı."""
+    return select(
+        Product.category,
+        Listing.listing_type,
+        func.count(Listing.id).label('listing_count')
+    ).select_from(Listing) \
+     .join(Product, Product.id == Listing.product_id) \
+     .where(*_price_criteria(filters)) \
+     .group_by(Product.category, Listing.listing_type)
+
+
+def fold_facets(rows, filters):
+    """
+    facets_statement satırlarını kenar çubuğu sayılarına katlar:
+    {'total', 'category': [{'value', 'count'}, ...], 'listing_type': [...]}
+    Kategoriler çoktan aza sıralanır; kategorisi olmayan ürünler sadece toplamda sayılır.
+    """
+    by_category, by_type, total = Counter(), Counter(), 0
+    for category, listing_type, count in rows:
+        type_matches = 'type' not in filters or listing_type == filters['type']
+        category_matches = 'category' not in filters or category == filters['category']
+        if type_matches and category is not None:
+            by_category[category] += count
+        if category_matches:
+            by_type[listing_type] += count
+        if type_matches and category_matches:
+            total += count
+
+    return {
+        'total': total,
+        'category': [{'value': category, 'count': count}
+                     for category, count in sorted(by_category.items(), key=lambda item: (-item[1], item[0]))],
+        'listing_type': [{'value': listing_type.value, 'count': by_type[listing_type]}
+                         for listing_type in ListingType]
+    }
@@ -0,0 +1,136 @@
+# /app/hashing.py
+
+"""
+Şifre hash'leme (bcrypt) işlerinin istek thread'lerinden ayrılması.
+
+bcrypt bilerek yavaş ve CPU yoğun bir işlemdir. Giriş (login) fırtınalarında
+her istek thread'i aynı anda bcrypt çalıştırırsa ucuz okuma endpoint'leri de
+CPU bulamaz. PasswordHasher bu işleri sınırlı bir thread havuzunda çalıştırır:
+aynı anda en fazla PASSWORD_HASH_WORKERS bcrypt işlemi yürür, en fazla
+PASSWORD_HASH_MAX_QUEUE işlem sırada bekler; daha fazlası PASSWORD_HASH_QUEUE_TIMEOUT
+saniye içinde yer bulamazsa HasherBusy fırlatılır (endpoint 503 döner).
+
+Config:
+  PASSWORD_HASH_BACKEND        'pool' (varsayılan) veya 'inline' (çağıran thread'de)
+  PASSWORD_HASH_WORKERS        havuz boyutu (varsayılan: CPU sayısı)
+  PASSWORD_HASH_MAX_QUEUE      sırada bekleyebilecek iş sayısı (varsayılan: 4 x havuz)
+  PASSWORD_HASH_QUEUE_TIMEOUT  saniye (varsayılan 5)
+  BCRYPT_LOG_ROUNDS            bcrypt maliyet faktörü (Flask-Bcrypt ile ortak, varsayılan 12)
+"""
+
+import hashlib
+import hmac
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import bcrypt
+
+
+class HasherBusy(Exception):
+    """Hash havuzu dolu ve zaman aşımı içinde yer açılmadı."""
+
+
+def hash_cost(password_hash):
+    """'$2b$12$...' biçimindeki bir bcrypt hash'inin maliyet faktörünü döner."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """bcrypt hash/verify işlemlerini sınırlı bir havuzda çalıştıran arka uç."""
+
+    def __init__(self):
+        self.rounds = 12
+        self.backend = 'pool'
+        self.workers = os.cpu_count() or 2
+        self.max_queue = self.workers * 4
+        self.queue_timeout = 5.0
+        self._executor = None
+        self._slots = None
+        self._dummy_digest = os.urandom(32)
+        self._verify_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.backend = app.config.get('PASSWORD_HASH_BACKEND', 'pool')
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or (os.cpu_count() or 2)
+        self.max_queue = app.config.get('PASSWORD_HASH_MAX_QUEUE', self.workers * 4)
+        self.queue_timeout = app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0)
+        self.shutdown()
+        self._dummy_digest = os.urandom(32)
+        self._verify_seconds = self._measure_verify()
+        app.extensions['password_hasher'] = self
+
+    def _run(self, func, *args):
+        if self.backend == 'inline':
+            return func(*args)
+
+        # Havuz, fork sonrası güvenli olsun diye ilk kullanımda oluşturulur
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='password-hasher')
+
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HasherBusy()
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Şifreyi yapılandırılmış maliyet faktörüyle hash'ler."""
+        return self._run(
+            lambda: bcrypt.generate_password_hash(password, self.rounds).decode('utf-8')
+        )
+
+    def verify(self, password_hash, password):
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def _measure_verify(self, samples=3):
+        """Yapılandırılmış maliyetteki bir bcrypt doğrulamasının süresi (saniye, medyan)."""
+        password = os.urandom(16).hex()
+        password_hash = bcrypt.generate_password_hash(password, self.rounds)
+        durations = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            bcrypt.check_password_hash(password_hash, password)
+            durations.append(time.perf_counter() - started)
+        return statistics.median(durations)
+
+    def verify_dummy(self, password):
+        """
+        Var olmayan kullanıcılar için sahte kontrol; her zaman False döner.
+        bcrypt çalıştırmaz ve havuzda yer tutmaz: bilinmeyen kullanıcı adlarıyla
+        gelen istekler gerçek girişlerin sırasını dolduramaz. Yanıt süresi yine
+        de gerçek bir doğrulamayla aynıdır: şifrenin özeti rastgele bir özetle
+        sabit sürede karşılaştırılır, kalan süre init_app'te ölçülen bcrypt
+        doğrulama süresine kadar uyunur (CPU kullanmadan).
+        """
+        started = time.perf_counter()
+        digest = hashlib.sha256(str(password).encode('utf-8', 'surrogatepass')).digest()
+        hmac.compare_digest(digest, self._dummy_digest)
+        remaining = self._verify_seconds - (time.perf_counter() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return False
+
+    def needs_rehash(self, password_hash):
+        """Hash yapılandırılmış maliyet faktöründen farklıysa True."""
+        return hash_cost(password_hash) != self.rounds
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
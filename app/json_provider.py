@@ -0,0 +1,72 @@
+# /app/json_provider.py
+
+"""
+Hızlı JSON sağlayıcı (Flask JSONProvider).
+
+orjson kuruluysa onu kullanır; değilse standart kütüphaneye döner.
+Her iki yolda da şu tipler endpoint'lerde elle çevrilmeden kodlanır:
+  - Decimal (Numeric fiyatlar)  -> sayı (float)
+  - datetime / date             -> ISO 8601 metin ('2025-01-31T10:00:00')
+  - Enum (ListingType, TransactionStatus, OfferStatus) -> .value
+"""
+
+import decimal
+import enum
+import json
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson isteğe bağlı
+    orjson = None
+
+
+def _default(obj):
+    """Standart kodlayıcının tanımadığı tipler için dönüşüm."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'{type(obj).__name__} JSON olarak kodlanamıyor.')
+
+
+def _orjson_default(obj):
+    # orjson datetime/date/enum'u kendisi kodlar; sadece Decimal ve diğerleri buraya düşer
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return _default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify / request.get_json için orjson destekli sağlayıcı."""
+
+    use_orjson = orjson is not None
+
+    def dumps_bytes(self, obj):
+        """Nesneyi doğrudan UTF-8 bayt dizisine kodlar (yanıt gövdesi için)."""
+        if self.use_orjson:
+            return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): str'e çevirip tekrar kodlamadan, baytları doğrudan yazar."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,391 @@
+# /app/matchmaking.py
+
+"""
+Takas eşleştirme: karşılıklı eşleşmeler ve çok taraflı takas döngüleri.
+
+Her aktif takas ilanı bir düğümdür: sahibi ilanın ürününü verir, karşılığında
+swap_preference'ta yazanı ister. "A, B'nin ürününü istiyor" (A -> B) kenarı,
+B'nin ürün tokenlarından biri A'nın tercih tokenlarında geçiyorsa vardır.
+
+  Karşılıklı eşleşme   A -> B ve B -> A
+  Takas döngüsü        A -> B -> C -> A (herkes bir sonrakinin ürününü alır),
+                       en fazla MATCH_MAX_CYCLE_LENGTH ilan, her kullanıcı bir kez
+
+Tokenlar (normalize_tokens): küçük harf, Türkçe karakterler ve aksanlar
+sadeleştirilir (ç->c, ı->i, ü->u), dolgu kelimeleri atılır ve her kelime ilk
+TOKEN_PREFIX harfine kısaltılır (kaba kök bulma: kamerası, kameralar -> kamer).
+Ürün tokenları başlık ve kategoriden, istek tokenları swap_preference'tan gelir.
+
+Kenarlar saklanmaz (yüz binlerce ilanda milyarlarca olabilir); iki ters indeks tutulur:
+  supply[token]   ürünü bu tokenı taşıyan ilanlar
+  demand[token]   bu tokenı isteyen ilanlar
+A'nın komşuları supply[A'nın istekleri]'dir. Döngü araması A'dan başlayan sınırlı
+bir derinlik öncelikli aramadır: düğüm başına en fazla MATCH_FANOUT komşu
+genişletilir, toplam MATCH_MAX_EXPANSIONS adımda durulur. Döngüyü kapatacak
+son ilan, A'nın ürününü isteyenler kümesiyle (demand) kesişimden seçilir.
+
+İndeks süreç içidir ve ilk istekte tek sorguyla kurulur. Sonraki isteklerde
+'listings' koleksiyon sürümü (app/versioning.py; ilan veya ürün değişince,
+hangi süreçte olursa olsun artar) değişmişse, son senkronizasyondan beri
+updated_at'i değişen takas ilanları ve ürünleri okunup sadece onlar
+güncellenir. Silinen satırlar, sonuçlar veritabanından doğrulanırken indeksten
+çıkarılır (bkz. discard).
+"""
+
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import select, union
+
+from app import db
+from app.models import Listing, Product, User, ListingType
+from app.versioning import get_collection_version
+
+TOKEN_PREFIX = 5
+MIN_TOKEN_LENGTH = 2
+# Tercih metinlerinde ve ürün adlarında anlam taşımayan kelimeler (sadeleştirilmiş biçimde)
+STOPWORDS = frozenset({
+    've', 'veya', 'ya', 'yada', 'da', 'de', 'ile', 'ama', 'icin', 'bir', 'bu', 'su', 'her',
+    'herhangi', 'gibi', 'olur', 'olabilir', 'tercihen', 'istiyorum', 'ariyorum', 'takas',
+    'urun', 'esya', 'the', 'and', 'or', 'for', 'any'
+})
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+DEFAULT_MAX_CYCLE_LENGTH = 3
+MAX_CYCLE_LENGTH_LIMIT = 5
+DEFAULT_FANOUT = 25
+DEFAULT_MAX_EXPANSIONS = 5000
+DEFAULT_REFRESH_OVERLAP = 60  # saniye; updated_at'i geç commit edilen satırlar kaçmasın
+
+_EMPTY = frozenset()
+
+
+# Türkçe harfler doğrudan; 'İ'.lower() sonrası kalan birleşik nokta (U+0307) atılır
+_TURKISH_FOLD = str.maketrans({'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
+                               'â': 'a', 'î': 'i', 'û': 'u', '\u0307': None})
+
+
+def _fold(text):
+    text = text.lower().translate(_TURKISH_FOLD)
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=65536)
+def _text_tokens(text):
+    # Kategoriler ve tercihler çok tekrarlanır; tam kurulumda normalleştirme bir kez yapılır
+    tokens = set()
+    for word in _WORD_RE.findall(_fold(text)):
+        if len(word) < MIN_TOKEN_LENGTH or word.isdigit() or word in STOPWORDS:
+            continue
+        tokens.add(word[:TOKEN_PREFIX])
+    return frozenset(tokens)
+
+
+def normalize_tokens(*texts):
+    """Metinlerden eşleştirme tokenları (frozenset)."""
+    return frozenset().union(*(_text_tokens(text) for text in texts if text))
+
+
+def _columns():
+    return (Listing.id, Listing.lister_id, Listing.swap_preference, Product.title, Product.category)
+
+
+def active_swaps_statement():
+    """İndeksin tamamı: aktif takas ilanları ve ürünleri."""
+    return select(*_columns()).join(Product, Product.id == Listing.product_id) \
+        .where(Listing.listing_type == ListingType.SWAP, Listing.is_active == True)
+
+
+def changed_swaps_statement(since):
+    """
+    since'ten beri ilanı veya ürünü değişen takas ilanları (pasifleşenler dahil).
+    İki kol ayrı updated_at indekslerini kullanır.
+    """
+    columns = (*_columns(), Listing.is_active)
+    by_listing = select(*columns).join(Product, Product.id == Listing.product_id) \
+        .where(Listing.listing_type == ListingType.SWAP, Listing.updated_at >= since)
+    by_product = select(*columns).join(Product, Product.id == Listing.product_id) \
+        .where(Listing.listing_type == ListingType.SWAP, Product.updated_at >= since)
+    return union(by_listing, by_product)
+
+
+class SwapMatcher:
+    """Süreç içi takas eşleştirme indeksi (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.max_cycle_length = DEFAULT_MAX_CYCLE_LENGTH
+        self.fanout = DEFAULT_FANOUT
+        self.max_expansions = DEFAULT_MAX_EXPANSIONS
+        self.refresh_overlap = timedelta(seconds=DEFAULT_REFRESH_OVERLAP)
+        self._clear()
+        self.last_build_ms = None
+        self.last_refresh = None
+
+    def init_app(self, app):
+        self.max_cycle_length = min(app.config.get('MATCH_MAX_CYCLE_LENGTH', DEFAULT_MAX_CYCLE_LENGTH),
+                                    MAX_CYCLE_LENGTH_LIMIT)
+        self.fanout = app.config.get('MATCH_FANOUT', DEFAULT_FANOUT)
+        self.max_expansions = app.config.get('MATCH_MAX_EXPANSIONS', DEFAULT_MAX_EXPANSIONS)
+        self.refresh_overlap = timedelta(seconds=app.config.get('MATCH_REFRESH_OVERLAP_SECONDS',
+                                                                DEFAULT_REFRESH_OVERLAP))
+        app.extensions['swap_matcher'] = self
+
+    def _clear(self):
+        self._offers = {}                   # ilan -> ürün tokenları
+        self._wants = {}                    # ilan -> istek tokenları
+        self._owner = {}                    # ilan -> kullanıcı
+        self._by_user = defaultdict(set)    # kullanıcı -> ilanlar
+        self._supply = defaultdict(set)     # token -> ürünü bu tokenı taşıyan ilanlar
+        self._demand = defaultdict(set)     # token -> bu tokenı isteyen ilanlar
+        self._version = None
+        self._synced_at = None
+
+    # --- İndeks bakımı (kilit altında çağrılır) ---
+
+    def _remove(self, listing_id):
+        if listing_id not in self._owner:
+            return
+        for token in self._offers.pop(listing_id):
+            self._discard_from(self._supply, token, listing_id)
+        for token in self._wants.pop(listing_id):
+            self._discard_from(self._demand, token, listing_id)
+        owner = self._owner.pop(listing_id)
+        self._discard_from(self._by_user, owner, listing_id)
+
+    @staticmethod
+    def _discard_from(index, key, listing_id):
+        members = index.get(key)
+        if members is not None:
+            members.discard(listing_id)
+            if not members:
+                del index[key]
+
+    def _add(self, row):
+        offers = normalize_tokens(row.title, row.category)
+        wants = normalize_tokens(row.swap_preference)
+        # İstemeyen veya tanımlanamayan ilan hiçbir döngüde yer alamaz
+        if not offers or not wants:
+            return
+        self._offers[row.id] = offers
+        self._wants[row.id] = wants
+        self._owner[row.id] = row.lister_id
+        self._by_user[row.lister_id].add(row.id)
+        for token in offers:
+            self._supply[token].add(row.id)
+        for token in wants:
+            self._demand[token].add(row.id)
+
+    def refresh(self):
+        """
+        İndeksi veritabanıyla eşitler: ilk çağrıda tam kurulum, sonra sadece
+        koleksiyon sürümü değiştiyse değişen ilanlar. Uygulama bağlamında çağrılmalıdır.
+        """
+        version = get_collection_version()
+        with self._lock:
+            if version == self._version:
+                return
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            if self._synced_at is None:
+                self._clear()
+                for row in db.session.execute(active_swaps_statement().execution_options(yield_per=10000)):
+                    self._add(row)
+                self.last_build_ms = round((time.perf_counter() - started) * 1000, 2)
+                changed = len(self._owner)
+            else:
+                rows = db.session.execute(changed_swaps_statement(self._synced_at - self.refresh_overlap)).all()
+                for row in rows:
+                    self._remove(row.id)
+                    if row.is_active:
+                        self._add(row)
+                changed = len(rows)
+            self._version = version
+            self._synced_at = started_at
+            self.last_refresh = {'at': started_at.isoformat(timespec='seconds'), 'rows': changed,
+                                 'ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    def discard(self, listing_ids):
+        """Veritabanında artık aktif takas ilanı olmayanları indeksten çıkarır."""
+        with self._lock:
+            for listing_id in listing_ids:
+                self._remove(listing_id)
+
+    def rebuild(self):
+        """Sonraki refresh'te indeksi sıfırdan kurdurur."""
+        with self._lock:
+            self._clear()
+
+    # --- Arama ---
+
+    def _wanting(self, tokens):
+        """Verilen tokenlardan birini isteyen ilanlar (salt okunur; tek tokenda indeksin kendisi)."""
+        if len(tokens) == 1:
+            return self._demand.get(next(iter(tokens)), _EMPTY)
+        return set().union(*(self._demand.get(token, _EMPTY) for token in tokens))
+
+    def _mutual(self, listing_id, wanting_mine, limit):
+        owner = self._owner[listing_id]
+        found = set()
+        for token in self._wants[listing_id]:
+            found |= self._supply.get(token, _EMPTY) & wanting_mine
+        # En yeni ilanlar önce
+        return heapq.nlargest(limit, (other for other in found if self._owner[other] != owner))
+
+    def _cycles(self, start, wanting_mine, max_length, limit):
+        """start'tan başlayıp start'a dönen, 3..max_length ilanlık döngüler (sınırlı DFS)."""
+        cycles = []
+        path = [start]
+        users = {self._owner[start]}
+        budget = [self.max_expansions]
+
+        def successors(listing_id, within=None):
+            seen = set()
+            for token in self._wants[listing_id]:
+                pool = self._supply.get(token, _EMPTY)
+                if within is not None:
+                    pool = pool & within
+                for candidate in pool:
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        yield candidate
+
+        def visit():
+            last_hop = len(path) == max_length - 1
+            expanded = 0
+            # Son adımda sadece start'ın ürününü isteyenler döngüyü kapatabilir
+            for candidate in successors(path[-1], wanting_mine if last_hop else None):
+                budget[0] -= 1
+                if budget[0] < 0 or len(cycles) >= limit:
+                    return
+                owner = self._owner[candidate]
+                if owner in users:
+                    continue
+                if len(path) >= 2 and candidate in wanting_mine:
+                    cycles.append(path + [candidate])
+                if last_hop or expanded >= self.fanout:
+                    continue
+                expanded += 1
+                path.append(candidate)
+                users.add(owner)
+                visit()
+                path.pop()
+                users.discard(owner)
+
+        if max_length >= 3:
+            visit()
+        return cycles
+
+    def matches_for_user(self, user_id, listing_id=None, max_length=None, limit=10):
+        """
+        Kullanıcının takas ilanları için eşleşmeler:
+        [{'listing_id', 'mutual': [ilan id], 'cycles': [[start, B, C, ...]]}, ...]
+        listing_id verilirse sadece o ilan (kullanıcının değilse boş liste).
+        """
+        max_length = min(max_length or self.max_cycle_length, self.max_cycle_length)
+        with self._lock:
+            mine = sorted(self._by_user.get(user_id, _EMPTY), reverse=True)
+            if listing_id is not None:
+                mine = [listing_id] if listing_id in mine else []
+            results = []
+            for own in mine:
+                wanting_mine = self._wanting(self._offers[own])
+                results.append({
+                    'listing_id': own,
+                    'mutual': self._mutual(own, wanting_mine, limit),
+                    'cycles': self._cycles(own, wanting_mine, max_length, limit)
+                })
+            return results
+
+    def status(self):
+        with self._lock:
+            return {
+                'listings': len(self._owner),
+                'users': len(self._by_user),
+                'supply_tokens': len(self._supply),
+                'demand_tokens': len(self._demand),
+                'version': self._version,
+                'last_build_ms': self.last_build_ms,
+                'last_refresh': self.last_refresh,
+                'max_cycle_length': self.max_cycle_length,
+                'fanout': self.fanout,
+                'max_expansions': self.max_expansions
+            }
+
+
+# --- Sonuçların veritabanından doğrulanması ve serileştirilmesi ---
+
+def summaries_statement(listing_ids):
+    """Sonuçtaki ilanların güncel özeti tek sorguda (ilan, ürün, sahibi)."""
+    return select(
+        Listing.id,
+        Listing.is_active,
+        Listing.listing_type,
+        Listing.swap_preference,
+        Product.title,
+        Product.category,
+        User.username
+    ).join(Product, Product.id == Listing.product_id) \
+     .join(User, User.id == Listing.lister_id) \
+     .where(Listing.id.in_(listing_ids))
+
+
+def result_listing_ids(results):
+    ids = set()
+    for result in results:
+        ids.add(result['listing_id'])
+        ids.update(result['mutual'])
+        for cycle in result['cycles']:
+            ids.update(cycle)
+    return ids
+
+
+def serialize_matches(results, rows):
+    """
+    Eşleşmeleri güncel ilan özetleriyle birleştirir. Artık aktif takas ilanı
+    olmayanları içeren sonuçlar atılır; (yanıt, bayat ilan id'leri) döner.
+    """
+    summaries = {row.id: {
+        'listing_id': row.id,
+        'title': row.title,
+        'category': row.category,
+        'swap_preference': row.swap_preference,
+        'owner_username': row.username
+    } for row in rows if row.is_active and row.listing_type == ListingType.SWAP}
+    stale = result_listing_ids(results) - summaries.keys()
+
+    output = []
+    for result in results:
+        if result['listing_id'] in stale:
+            continue
+        cycles = []
+        for cycle in result['cycles']:
+            if stale.intersection(cycle):
+                continue
+            listings = [summaries[listing_id] for listing_id in cycle]
+            # Her ilan sahibi, döngüde kendinden sonraki ilanın ürününü alır
+            trades = [{
+                'receiver': listing['owner_username'],
+                'giver': given['owner_username'],
+                'listing_id': given['listing_id'],
+                'title': given['title']
+            } for listing, given in zip(listings, listings[1:] + listings[:1])]
+            cycles.append({'length': len(cycle), 'listings': listings, 'trades': trades})
+        output.append({
+            'listing': summaries[result['listing_id']],
+            'mutual': [summaries[listing_id] for listing_id in result['mutual'] if listing_id not in stale],
+            'cycles': cycles
+        })
+    return output, stale
+
+
+swap_matcher = SwapMatcher()
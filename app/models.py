@@ -1,6 +1,10 @@
-from . import db, bcrypt  # __init__.py dosyamızdan db ve bcrypt'i alıyoruz
+from . import db  # __init__.py dosyamızdan db'yi alıyoruz
+from .hashing import password_hasher  # bcrypt işlemleri sınırlı bir havuzda çalışır
 from datetime import datetime
 import enum
+from sqlalchemy import literal_column, FetchedValue
+from sqlalchemy.types import TypeDecorator, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 # Enum: Belirli alanlar için sabit seçenekler tanımlamak (daha temiz kod)
 class ListingType(enum.Enum):
@@ -19,6 +23,17 @@ class OfferStatus(enum.Enum):
     REJECTED = 'rejected'
 
 
+class TSVectorType(TypeDecorator):
+    """PostgreSQL'de tsvector, diğer veritabanlarında (SQLite) düz metin olarak saklanır."""
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -35,12 +50,16 @@ class User(db.Model):
     listings = db.relationship('Listing', backref='lister', lazy=True)
 
     def set_password(self, password):
-        """Şifreyi hash'leyerek kaydeder."""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """Şifreyi hash'leyerek kaydeder. (Havuz doluysa HasherBusy fırlatır.)"""
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
         """Verilen şifrenin hash ile uyuşup uyuşmadığını kontrol eder."""
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Hash, yapılandırılmış bcrypt maliyet faktöründen farklı mı?"""
+        return password_hasher.needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f'<User {self.username}>'
@@ -55,10 +74,31 @@ class Product(db.Model):
     category = db.Column(db.String(100))
     image_url = db.Column(db.String(500), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Değişiklik takibi: her UPDATE'te (ORM veya toplu) otomatik güncellenir
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1',
+                        onupdate=literal_column('version + 1'))
     
     # Yabancı Anahtar (Foreign Key): Bu ürünün sahibini 'users' tablosuna bağlar
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    # Tam metin arama indeksi (app/search.py). Sadece PostgreSQL'de bulunur
+    # (migration yalnızca orada ekler); deferred: normal sorgularda yüklenmez.
+    # FetchedValue: ORM INSERT'lerinde kolon hiç yazılmaz, böylece SQLite'ta
+    # kolonun olmaması sorun olmaz.
+    search_vector = db.deferred(db.Column(TSVectorType, nullable=True, server_default=FetchedValue()))
+
+    __table_args__ = (
+        db.Index('ix_products_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index('ix_products_owner_id', 'owner_id'),
+        db.Index('ix_products_updated_at', 'updated_at'),
+        # Akışta ?category= filtresi ve kategori facet'leri (app/feed.py)
+        db.Index('ix_products_category_id', 'category', 'id'),
+    )
+    # search_vector sunucu tarafı değer sayılır; INSERT'te RETURNING ile geri
+    # okunmaya çalışılmasın (diğer kolonların Python tarafı varsayılanları var)
+    __mapper_args__ = {'eager_defaults': False}
+
     # İlişki: Bu ürüne ait ilan (genellikle bir ürünün tek bir aktif ilanı olur)
     # uselist=False, bunun "bire-çok" değil, "bire-bir" ilişki olduğunu belirtir
     listing = db.relationship('Listing', backref='product', lazy=True, uselist=False)
@@ -77,6 +117,10 @@ class Listing(db.Model):
     swap_preference = db.Column(db.Text, nullable=True) # Takasta ne istendiği
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Değişiklik takibi: her UPDATE'te (ORM veya toplu) otomatik güncellenir
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1',
+                        onupdate=literal_column('version + 1'))
 
     # Yabancı Anahtarlar
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False, unique=True) # Bir ürünün tek ilanı olabilir
@@ -85,6 +129,32 @@ class Listing(db.Model):
     # İlişkiler
     # Bu ilana yapılan takas teklifleri
     swap_offers_received = db.relationship('SwapOffer', backref='target_listing', lazy=True, foreign_keys='SwapOffer.target_listing_id')
+
+    # Sıcak sorgular için indeksler (bkz. migration 'sicak_sorgu_indeksleri')
+    __table_args__ = (
+        # Herkese açık akış: sadece aktif ilanlar, yeniden eskiye (keyset sayfalama)
+        db.Index('ix_listings_active_created_at', created_at.desc(), id.desc(),
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active = 1')),
+        # my_listings ve satıcı paneli: lister_id'ye göre, tarihe göre sıralı
+        db.Index('ix_listings_lister_id_created_at', lister_id, created_at),
+        # Artımlı dışa aktarım (updated_since)
+        db.Index('ix_listings_updated_at', updated_at),
+        # Filtreli akış (app/feed.py): ?listing_type=... yeniden eskiye
+        db.Index('ix_listings_active_type_created_at', listing_type, created_at.desc(), id.desc(),
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active = 1')),
+        # Fiyata göre sıralama / fiyat aralığı: liste fiyatı = satış fiyatı veya günlük kira.
+        # Sondaki listing_type ve product_id fiyat aralıklı facet sorgusunu indeksten karşılar
+        db.Index('ix_listings_active_list_price',
+                 db.func.coalesce(price, rental_price_per_day), id, listing_type, product_id,
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active = 1')),
+        db.Index('ix_listings_active_type_list_price',
+                 listing_type, db.func.coalesce(price, rental_price_per_day), id,
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active = 1')),
+    )
     
     def __repr__(self):
         return f'<Listing {self.id} ({self.listing_type.value}) for Product {self.product_id}>'
@@ -103,6 +173,8 @@ class Transaction(db.Model):
     end_date = db.Column(db.Date, nullable=True)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Durum değişikliklerinin artımlı dışa aktarımı için (her UPDATE'te güncellenir)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Yabancı Anahtarlar
     listing_id = db.Column(db.Integer, db.ForeignKey('listings.id'), nullable=False)
@@ -113,6 +185,14 @@ class Transaction(db.Model):
     listing = db.relationship('Listing', backref='transactions', lazy=True)
     buyer = db.relationship('User', backref='transactions', lazy=True)
 
+    __table_args__ = (
+        # Kiralama tarih çakışması kontrolü (rent_listing)
+        db.Index('ix_transactions_rent_overlap', listing_id, transaction_type, start_date, end_date),
+        # my_purchases / my_rentals
+        db.Index('ix_transactions_buyer_type_created_at', buyer_or_renter_id, transaction_type, created_at),
+        db.Index('ix_transactions_updated_at', updated_at),
+    )
+
     def __repr__(self):
         return f'<Transaction {self.id} - {self.status.value}>'
 
@@ -137,5 +217,78 @@ class SwapOffer(db.Model):
     offerer = db.relationship('User', backref='swap_offers_made', lazy=True)
     offered_product = db.relationship('Product', backref='swap_offers', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_swap_offers_offerer_id_created_at', offerer_id, created_at),
+        db.Index('ix_swap_offers_target_listing_id_status', target_listing_id, status),
+        # Bir ilana gelen teklifler, yeniden eskiye (keyset sayfalama)
+        db.Index('ix_swap_offers_target_listing_id_created_at', target_listing_id, created_at),
+    )
+
+    def __repr__(self):
+        return f'<SwapOffer {self.id} by User {self.offerer_id} for Listing {self.target_listing_id}>'
+
+
+class CollectionVersion(db.Model):
+    """
+    Koleksiyon seviyesinde sürüm sayacı (ör. 'listings').
+    İlan veya ürün değiştiğinde artırılır; liste endpoint'lerinin ETag'i
+    bu sayıdan üretilir (bkz. app/versioning.py).
+    """
+    __tablename__ = 'collection_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CollectionVersion {self.name}={self.version}>'
+
+
+class SellerDailyStats(db.Model):
+    """
+    Satıcı başına günlük özet (bkz. app/analytics.py).
+    İşlem ve teklifler oluşturuldukları güne yazılır; durum değiştiğinde
+    aynı gündeki sayaçlar artımlı olarak güncellenir.
+    """
+    __tablename__ = 'seller_daily_stats'
+
+    seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+
+    # Satışlar (tamamlanmış)
+    sale_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    sale_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+
+    # Kiralamalar
+    rental_request_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rental_completed_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rental_cancelled_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rental_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0, server_default='0')
+
+    # Takas teklifleri
+    swap_offer_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    swap_accepted_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    swap_rejected_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<SellerDailyStats {self.seller_id} {self.day}>'
+
+
+class ListingDailyOccupancy(db.Model):
+    """
+    Kiralama ilanı başına dolu günler: onaylanmış bir kiralamanın kapsadığı
+    her gün için bir satır (booked_count normalde 1'dir).
+    """
+    __tablename__ = 'listing_daily_occupancy'
+
+    listing_id = db.Column(db.Integer, db.ForeignKey('listings.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    booked_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        # /api/analytics/seller: satıcının ilanları, tarih aralığı
+        db.Index('ix_listing_daily_occupancy_seller_id_day', seller_id, day),
+    )
+
     def __repr__(self):
-        return f'<SwapOffer {self.id} by User {self.offerer_id} for Listing {self.target_listing_id}>'
\ No newline at end of file
+        return f'<ListingDailyOccupancy {self.listing_id} {self.day}>'
@@ -0,0 +1,149 @@
+# /app/offers.py
+
+"""
+Takas teklifi listeleri (app/api/swap.py) için sorgular.
+
+Her liste tek bir select ifadesidir: teklif, teklif veren, teklif edilen
+ürün ve hedef ilanın ürünü JOIN ile aynı satırda gelir; satır başına ek
+sorgu (lazy load) yoktur. Sayfalama (created_at, id) üzerinde keyset'tir
+(app/pagination.py), ?status= ile duruma göre filtrelenebilir.
+
+Gelen kutusu (inbox) kullanıcının tüm ilanlarındaki bekleyen teklif
+sayılarını tek bir GROUP BY ile döner.
+"""
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
+
+from app.models import Listing, Product, SwapOffer, User, OfferStatus
+from app.pagination import keyset_condition, split_page
+
+OFFER_STATUSES = {status.value: status for status in OfferStatus}
+
+
+class InvalidOfferParam(ValueError):
+    """status parametresi geçersiz olduğunda fırlatılır."""
+
+
+def parse_offer_filters(args):
+    """?status=pending|accepted|rejected (verilmezse tüm durumlar)."""
+    filters = {}
+    if args.get('status'):
+        if args['status'] not in OFFER_STATUSES:
+            raise InvalidOfferParam("status 'pending', 'accepted' veya 'rejected' olmalıdır.")
+        filters['status'] = OFFER_STATUSES[args['status']]
+    return filters
+
+
+def _page(stmt, filters, limit, after):
+    if 'status' in filters:
+        stmt = stmt.where(SwapOffer.status == filters['status'])
+    if after:
+        stmt = stmt.where(keyset_condition(SwapOffer.created_at, SwapOffer.id, after))
+    return stmt.order_by(SwapOffer.created_at.desc(), SwapOffer.id.desc()).limit(limit + 1)
+
+
+def split_offer_rows(rows, limit):
+    """limit + 1 satırdan (sayfa, next_cursor) ayırır."""
+    return split_page(rows, SwapOffer.created_at, SwapOffer.id, limit)
+
+
+# --- Bir ilana gelen teklifler ---
+
+def received_offers_statement(listing_id, filters, limit, after=None):
+    return _page(select(
+        SwapOffer.id,
+        SwapOffer.status,
+        SwapOffer.message,
+        SwapOffer.created_at,
+        User.username.label('offerer_username'),
+        Product.id.label('product_id'),
+        Product.title.label('product_title'),
+        Product.description.label('product_description'),
+        Product.category.label('product_category')
+    ).join(User, User.id == SwapOffer.offerer_id)
+     .join(Product, Product.id == SwapOffer.offered_product_id)
+     .where(SwapOffer.target_listing_id == listing_id), filters, limit, after)
+
+
+def serialize_received_offer(row):
+    return {
+        'offer_id': row.id,
+        'status': row.status,
+        'message': row.message,
+        'created_at': row.created_at,
+        'offerer_username': row.offerer_username,
+        'offered_product': {
+            'product_id': row.product_id,
+            'title': row.product_title,
+            'description': row.product_description,
+            'category': row.product_category
+        }
+    }
+
+
+# --- Kullanıcının gönderdiği teklifler ---
+
+def sent_offers_statement(user_id, filters, limit, after=None):
+    offered_product = aliased(Product, name='offered_product')
+    target_product = aliased(Product, name='target_product')
+    owner = aliased(User, name='owner')
+    return _page(select(
+        SwapOffer.id,
+        SwapOffer.status,
+        SwapOffer.created_at,
+        offered_product.title.label('offered_title'),
+        Listing.id.label('listing_id'),
+        target_product.title.label('target_title'),
+        owner.username.label('owner_username')
+    ).join(offered_product, offered_product.id == SwapOffer.offered_product_id)
+     .join(Listing, Listing.id == SwapOffer.target_listing_id)
+     .join(target_product, target_product.id == Listing.product_id)
+     .join(owner, owner.id == Listing.lister_id)
+     .where(SwapOffer.offerer_id == user_id), filters, limit, after)
+
+
+def serialize_sent_offer(row):
+    return {
+        'offer_id': row.id,
+        'status': row.status, # pending, accepted, rejected
+        'date_offered': row.created_at,
+        'my_offered_product': { # Benim teklif ettiğim ürün
+            'title': row.offered_title
+        },
+        'target_listing': { # Teklif yaptığım ilan
+            'listing_id': row.listing_id,
+            'title': row.target_title,
+            'owner_username': row.owner_username # İlan sahibinin adı
+        }
+    }
+
+
+# --- Gelen kutusu: ilan başına bekleyen teklif sayıları ---
+
+def inbox_statement(user_id):
+    """Kullanıcının bekleyen teklifi olan ilanları, en son teklif alan önce."""
+    latest = func.max(SwapOffer.created_at).label('latest_offer_at')
+    return select(
+        Listing.id.label('listing_id'),
+        Product.title,
+        Listing.is_active,
+        func.count(SwapOffer.id).label('pending_count'),
+        latest
+    ).select_from(Listing) \
+     .join(SwapOffer, SwapOffer.target_listing_id == Listing.id) \
+     .join(Product, Product.id == Listing.product_id) \
+     .where(Listing.lister_id == user_id, SwapOffer.status == OfferStatus.PENDING) \
+     .group_by(Listing.id, Product.title, Listing.is_active) \
+     .order_by(latest.desc(), Listing.id.desc())
+
+
+def serialize_inbox(rows):
+    listings = [{
+        'listing_id': row.listing_id,
+        'title': row.title,
+        'is_active': row.is_active,
+        'pending_count': row.pending_count,
+        'latest_offer_at': row.latest_offer_at
+    } for row in rows]
+    return {'listings': listings, 'total_pending': sum(row['pending_count'] for row in listings)}
@@ -0,0 +1,103 @@
+# /app/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import tuple_, literal
+
+# Sayfa boyutu sınırları (istemci 'limit' göndermezse varsayılan kullanılır)
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidPageParam(ValueError):
+    """'limit' veya 'after' parametresi çözülemediğinde fırlatılır."""
+
+
+def parse_limit(raw_limit, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Query string'den gelen 'limit' değerini doğrular ve sınırlar."""
+    if raw_limit is None or raw_limit == '':
+        return default
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise InvalidPageParam('limit bir tam sayı olmalıdır.')
+    if limit < 1:
+        raise InvalidPageParam('limit en az 1 olmalıdır.')
+    return min(limit, maximum)
+
+
+def encode_cursor(created_at, row_id):
+    """
+    (created_at, id) çiftini istemciye verilecek opak bir cursor'a çevirir.
+    Sıralama anahtarı tarih değilse (ör. fiyat, Decimal) metin olarak saklanır.
+    """
+    value = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    payload = json.dumps([value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, value_type=datetime):
+    """encode_cursor ile üretilmiş cursor'ı tekrar (created_at, id) çiftine çözer."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if value_type is datetime:
+            return datetime.fromisoformat(value), int(row_id)
+        value = value_type(value)
+        if isinstance(value, Decimal) and not value.is_finite():
+            raise ValueError(value)
+        return value, int(row_id)
+    # Decimal('abc') -> InvalidOperation (ArithmeticError)
+    except (ValueError, TypeError, UnicodeError, ArithmeticError):
+        raise InvalidPageParam('Geçersiz cursor (after) değeri.')
+
+
+def keyset_condition(created_col, id_col, after, descending=True):
+    """
+    Cursor'dan sonraki (daha eski) satırlar için WHERE koşulu.
+    Core select ifadelerinde keyset_page yerine doğrudan kullanılabilir.
+    descending=False artan sıralı sayfalar içindir (sonraki = daha büyük).
+    """
+    after_value, after_id = decode_cursor(after, created_col.type.python_type)
+    # Satır karşılaştırması: (created_at, id) < (:created_at, :id)
+    row, cursor_row = tuple_(created_col, id_col), \
+        tuple_(literal(after_value, created_col.type), literal(after_id, id_col.type))
+    return row < cursor_row if descending else row > cursor_row
+
+
+def keyset_page(query, created_col, id_col, limit, after=None):
+    """
+    (created_at, id) üzerinde yeniden-eskiye keyset sayfalama uygular.
+
+    OFFSET yerine son görülen satırın anahtarından devam edildiği için
+    tablonun büyüklüğünden bağımsız olarak her sayfa aynı maliyettedir.
+    Bir sonraki sayfanın olup olmadığını anlamak için limit + 1 satır çekilir.
+    Dönüş: (satırlar, next_cursor veya None)
+    """
+    if after:
+        query = query.filter(keyset_condition(created_col, id_col, after))
+
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+    return split_page(rows, created_col, id_col, limit)
+
+
+def keyset_statement(stmt, created_col, id_col, limit, after=None, descending=True):
+    """keyset_page'in select() karşılığı: sıralama, limit + 1 ve cursor koşulunu ekler."""
+    if after:
+        stmt = stmt.where(keyset_condition(created_col, id_col, after, descending))
+    if descending:
+        return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+    return stmt.order_by(created_col.asc(), id_col.asc()).limit(limit + 1)
+
+
+def split_page(rows, created_col, id_col, limit):
+    """limit + 1 satırdan sayfayı ve (varsa) sonraki sayfanın cursor'ını ayırır."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
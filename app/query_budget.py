@@ -0,0 +1,177 @@
+# /app/query_budget.py
+
+"""
+İstek başına SQL sorgu bütçesi ve N+1 dedektörü.
+
+Her istekte çalışan SQL ifadeleri SQLAlchemy'nin before/after_cursor_execute
+olaylarıyla sayılır ve süreleri toplanır. İstek sonunda:
+
+  - Aynı SQL şekli (parametreler hariç aynı metin) QUERY_BUDGET_REPEAT_THRESHOLD
+    kez veya daha fazla çalıştıysa bu bir N+1 işaretidir (döngü içinde lazy load).
+  - Endpoint @query_budget(n) ile bir bütçe bildirdiyse ve sorgu sayısı n'i
+    aştıysa bütçe aşılmıştır. Bildirmeyen endpoint'ler için QUERY_BUDGET_DEFAULT
+    kullanılır (None: sınırsız).
+
+QUERY_BUDGET_MODE:
+  'off'   ölçüm yapılmaz
+  'warn'  ihlaller app.logger.warning ile loglanır (varsayılan)
+  'raise' ihlalde QueryBudgetExceeded fırlatılır (testler için)
+
+Ölçüm açıkken yanıta 'Server-Timing: db;dur=<ms>;desc="<n> queries"' başlığı
+eklenir; endpoint bazında birikmiş sayaçlar GET /api/internal/queries ile okunur.
+Not: Akış (streaming) yanıtlarında gövde üretilirken çalışan sorgular sayılmaz.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MODES = ('off', 'warn', 'raise')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """'raise' modunda bütçe aşıldığında veya N+1 şekli bulunduğunda fırlatılır."""
+
+
+def query_budget(max_queries):
+    """Endpoint'in istek başına en fazla kaç SQL ifadesi çalıştırabileceğini bildirir."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class _RequestQueries:
+    __slots__ = ('count', 'total_time', 'shapes', 'started')
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self.started = None
+
+
+class EndpointStats:
+    """Endpoint bazında birikmiş sorgu sayaçları (süreç ömrü boyunca)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, count, total_time, violations):
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'db_time_ms': 0.0, 'max_queries': 0, 'violations': 0
+            })
+            stats['requests'] += 1
+            stats['queries'] += count
+            stats['db_time_ms'] += total_time * 1000
+            stats['max_queries'] = max(stats['max_queries'], count)
+            stats['violations'] += violations
+
+    def as_dict(self):
+        with self._lock:
+            return {endpoint: {
+                **stats,
+                'db_time_ms': round(stats['db_time_ms'], 3),
+                'avg_queries': round(stats['queries'] / stats['requests'], 2)
+            } for endpoint, stats in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class QueryMonitor:
+    """
+    Flask eklentisi. Config:
+      QUERY_BUDGET_MODE               'off' | 'warn' | 'raise'
+      QUERY_BUDGET_DEFAULT            bütçe bildirmeyen endpoint'ler için sınır (None: yok)
+      QUERY_BUDGET_REPEAT_THRESHOLD   aynı şeklin kaç tekrarı N+1 sayılır (varsayılan 5)
+    """
+
+    def __init__(self):
+        self.stats = EndpointStats()
+
+    def init_app(self, app):
+        mode = app.config.get('QUERY_BUDGET_MODE', 'warn')
+        if mode not in MODES:
+            raise ValueError(f"QUERY_BUDGET_MODE {MODES} değerlerinden biri olmalıdır: {mode!r}")
+        app.extensions['query_monitor'] = self
+        if mode == 'off':
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    # --- İstek yaşam döngüsü ---
+
+    def _start(self):
+        g._request_queries = _RequestQueries()
+
+    def _finish(self, response):
+        queries = g.pop('_request_queries', None)
+        if queries is None:
+            return response
+
+        endpoint = request.endpoint or request.path
+        problems = self._problems(endpoint, queries)
+        self.stats.record(endpoint, queries.count, queries.total_time, len(problems))
+
+        response.headers['Server-Timing'] = \
+            f'db;dur={queries.total_time * 1000:.2f};desc="{queries.count} queries"'
+
+        if problems:
+            message = f'{request.method} {request.path} ({endpoint}): ' + '; '.join(problems)
+            if current_app.config.get('QUERY_BUDGET_MODE', 'warn') == 'raise':
+                raise QueryBudgetExceeded(message)
+            current_app.logger.warning('Sorgu bütçesi: %s', message)
+        return response
+
+    def _problems(self, endpoint, queries):
+        problems = []
+
+        view = current_app.view_functions.get(endpoint)
+        budget = getattr(view, 'query_budget', current_app.config.get('QUERY_BUDGET_DEFAULT'))
+        if budget is not None and queries.count > budget:
+            problems.append(f'{queries.count} sorgu çalıştı, bütçe {budget}')
+
+        threshold = current_app.config.get('QUERY_BUDGET_REPEAT_THRESHOLD', 5)
+        for shape, repeats in queries.shapes.most_common():
+            if repeats < threshold:
+                break
+            problems.append(f'olası N+1: aynı sorgu {repeats} kez çalıştı: {shape[:200]}')
+        return problems
+
+
+def _current_queries():
+    if not has_request_context():
+        return None
+    return g.get('_request_queries')
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current_queries()
+    if queries is not None:
+        queries.started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current_queries()
+    if queries is None or queries.started is None:
+        return
+    queries.total_time += time.perf_counter() - queries.started
+    queries.started = None
+    queries.count += 1
+    queries.shapes[_WHITESPACE_RE.sub(' ', statement).strip()] += 1
+
+
+query_monitor = QueryMonitor()
@@ -0,0 +1,137 @@
+# /app/reads.py
+
+"""
+Okuma endpoint'lerinin ortak sorguları ve serileştiricileri.
+
+Flask blueprint'leri (app/api) ve ASGI yolu (app/asgi.py) aynı select()
+ifadelerini ve aynı JSON biçimini kullanır. İlişkiler sorguyla birlikte
+(JOIN) yüklenir; lazy load'a dayanılmaz (async oturumlarda lazy load
+yapılamaz, sync tarafta da satır başına sorgu demektir).
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import configure_mappers, joinedload
+
+from app import feed
+from app.models import Listing, Transaction, ListingType, TransactionStatus
+from app.pagination import keyset_statement
+
+
+def listing_load_options():
+    """İlanla birlikte ürün ve ilan sahibini aynı sorguda yükleyen seçenekler."""
+    # Listing.product ve Listing.lister backref'tir; mapper'lar yapılandırılmadan
+    # (henüz hiç sorgu çalışmamışken, örn. CLI veya ASGI başlangıcı) sınıfta görünmezler
+    configure_mappers()
+    return joinedload(Listing.product), joinedload(Listing.lister)
+
+
+def serialize_listing(listing):
+    """Bir ilanı (ürün ve ilan sahibi bilgisiyle) JSON'a uygun dict'e çevirir."""
+    product = listing.product
+    lister = listing.lister
+
+    listing_data = {
+        'listing_id': listing.id,
+        'listing_type': listing.listing_type,
+        'is_active': listing.is_active,
+        'created_at': listing.created_at,
+        'updated_at': listing.updated_at,
+        'version': listing.version,
+        'product_details': {
+            'product_id': product.id,
+            'title': product.title,
+            'description': product.description,
+            'category': product.category,
+            'image_url': product.image_url
+        },
+        'lister_details': {
+            'username': lister.username
+        }
+    }
+
+    if listing.listing_type == ListingType.SALE:
+        listing_data['price'] = listing.price
+    elif listing.listing_type == ListingType.RENT:
+        listing_data['rental_price_per_day'] = listing.rental_price_per_day
+    elif listing.listing_type == ListingType.SWAP:
+        listing_data['swap_preference'] = listing.swap_preference
+
+    return listing_data
+
+
+def listing_cache_tags(listing):
+    """entity_cache kaydının geçersiz kılma etiketleri (bkz. app/cache.py)."""
+    return f'product:{listing.product_id}', f'user:{listing.lister_id}'
+
+
+# --- İlanlar ---
+
+def listing_details_statement(listing_ids):
+    return select(Listing).options(*listing_load_options()).where(Listing.id.in_(listing_ids))
+
+
+def feed_statement(limit, after=None, filters=None):
+    """
+    Aktif ilan akışının bir sayfası (limit + 1 satır; bkz. feed.split_feed_page).
+    filters: feed.parse_feed_filters sonucu (tür, kategori, fiyat aralığı, sıralama).
+    """
+    filters = filters or {}
+    sort_col, descending = feed.feed_sort(filters)
+    stmt = select(Listing).options(*listing_load_options()).where(*feed.feed_criteria(filters))
+    return keyset_statement(stmt, sort_col, Listing.id, limit, after=after, descending=descending)
+
+
+# --- Alıcı / kiracı geçmişi ---
+
+def purchases_statement(user_id):
+    """Kullanıcının tamamlanmış satın alımları, yeniden eskiye."""
+    return select(Transaction).options(
+        joinedload(Transaction.listing).options(*listing_load_options())
+    ).where(
+        Transaction.buyer_or_renter_id == user_id,
+        Transaction.transaction_type == ListingType.SALE,
+        Transaction.status == TransactionStatus.COMPLETED
+    ).order_by(Transaction.created_at.desc())
+
+
+def serialize_purchase(purchase):
+    listing = purchase.listing
+    product = listing.product
+    return {
+        'transaction_id': purchase.id,
+        'date_purchased': purchase.created_at,
+        'price_paid': purchase.total_price,
+        'product_details': {
+            'title': product.title,
+            'description': product.description,
+            'category': product.category
+        },
+        'seller_username': listing.lister.username # Satıcının kullanıcı adı
+    }
+
+
+def rentals_statement(user_id):
+    """Kullanıcının kiralamaları, başlangıç tarihine göre yeniden eskiye."""
+    return select(Transaction).options(
+        joinedload(Transaction.listing).options(*listing_load_options())
+    ).where(
+        Transaction.buyer_or_renter_id == user_id,
+        Transaction.transaction_type == ListingType.RENT
+    ).order_by(Transaction.start_date.desc())
+
+
+def serialize_rental(rental):
+    listing = rental.listing
+    product = listing.product
+    return {
+        'transaction_id': rental.id,
+        'status': rental.status,
+        'start_date': rental.start_date.isoformat(),
+        'end_date': rental.end_date.isoformat(),
+        'total_price_paid': rental.total_price,
+        'product_details': {
+            'title': product.title,
+            'description': product.description
+        },
+        'owner_username': listing.lister.username # Ürün sahibinin kullanıcı adı
+    }
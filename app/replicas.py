@@ -0,0 +1,201 @@
+# /app/replicas.py
+
+"""
+Okuma replikalarına yönlendirme (read/write splitting).
+
+Config:
+  DB_REPLICA_URLS          replika veritabanı URL'leri (liste; boşsa yönlendirme kapalı)
+  REPLICA_STICKY_SECONDS   yazma sonrası kullanıcının primary'ye yapışık kalacağı süre (varsayılan 5)
+  REPLICA_STICKY_BACKEND   yapışıklık kayıtları için CacheBackend. Replika varken zorunludur:
+                           yazmayı yapan worker ile sonraki okumayı alan worker farklı
+                           süreçler olabilir, kayıt hepsinde görünmelidir (SharedCacheBackend,
+                           ör. Redis). Verilmezse create_app ReplicaConfigError fırlatır;
+                           sadece DEBUG / TESTING modunda uyarı loglanıp süreç içi
+                           LRUCache kullanılır. Tek süreçli bir kurulum LRUCache'i
+                           açıkça verebilir.
+
+Replikalar create_app içinde 'replica_0', 'replica_1', ... adlı bind'ler olarak
+SQLALCHEMY_BINDS'e eklenir. Hiçbir model bu bind'lere bağlı değildir; db.create_all
+ve migration'lar sadece primary'ye uygulanır.
+
+Yönlendirme kuralları:
+  - Sadece @read_only ile işaretlenmiş endpoint'ler replikaya gider; istek başına
+    bir replika rastgele seçilir ve isteğin tüm okumaları ondan yapılır.
+  - Flush (ORM yazmaları) ve INSERT/UPDATE/DELETE ifadeleri her zaman primary'ye gider.
+  - Yazma yapan (flush eden veya DML çalıştıran) bir isteğin kullanıcısı
+    REPLICA_STICKY_SECONDS boyunca primary'den okur: kendi değişikliklerini
+    hemen görür (read-your-writes).
+    Kimliği olmayan (anonim) okumalar yapışık değildir.
+
+Not: Replikadan okunan ilan detayları entity_cache'e replikada okunan koleksiyon
+sürümüyle yazılır; primary'den (daha yeni sürümle) okuyan bir istek bu kaydı
+kullanmaz, yeniden yükler (bkz. app/cache.py).
+
+Yerelde iki SQLite dosyasıyla denenebilir (debug modunda süreç içi yapışıklıkla):
+    FLASK_DEBUG=1 DATABASE_URL=sqlite:////tmp/primary.db DB_REPLICA_URLS=sqlite:////tmp/replica.db
+"""
+
+import random
+import threading
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from flask_sqlalchemy.session import Session
+from jwt.exceptions import PyJWTError
+from sqlalchemy import event
+
+REPLICA_BIND_PREFIX = 'replica_'
+DEFAULT_STICKY_SECONDS = 5
+
+
+class ReplicaConfigError(RuntimeError):
+    """Replikalar yapılandırılmış ama paylaşılan bir yapışıklık arka ucu verilmemiş."""
+
+
+def read_only(view):
+    """Endpoint'i replikadan okunabilir olarak işaretler (yazma yapmamalıdır)."""
+    view.read_only = True
+    return view
+
+
+def replica_binds(config):
+    """DB_REPLICA_URLS -> {'replica_0': url, ...} (SQLALCHEMY_BINDS'e eklenir)."""
+    return {f'{REPLICA_BIND_PREFIX}{index}': url
+            for index, url in enumerate(config.get('DB_REPLICA_URLS') or ())}
+
+
+class RoutingSession(Session):
+    """
+    İstek replikaya yönlendirildiyse okumaları replika engine'ine verir.
+    Flush sırasında ve DML ifadelerinde Flask-SQLAlchemy'nin normal bind seçimi kullanılır.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False):
+            replica = _request_replica()
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _request_replica():
+    if not has_request_context():
+        return None
+    return g.get('_db_replica')
+
+
+class RoutingStats:
+    """Yönlendirme kararlarının sayaçları (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {'replica': 0, 'primary_sticky': 0, 'sticky_marks': 0}
+
+    def incr(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class ReplicaRouter:
+    """Flask eklentisi: her istekte okumanın nereden yapılacağına karar verir."""
+
+    def __init__(self):
+        self.stats = RoutingStats()
+        self.replicas = []
+        self.sticky = None
+        self.sticky_seconds = DEFAULT_STICKY_SECONDS
+
+    def init_app(self, app):
+        self.replicas = list(replica_binds(app.config))
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', DEFAULT_STICKY_SECONDS)
+        self.sticky = app.config.get('REPLICA_STICKY_BACKEND')
+        if self.sticky is None:
+            self.sticky = self._local_sticky_backend(app)
+        app.extensions['replica_router'] = self
+        if not self.replicas:
+            return
+        app.before_request(self._choose)
+        app.after_request(self._remember_writes)
+
+    def _local_sticky_backend(self, app):
+        # Süreç içi kayıt diğer gunicorn worker'larında görünmez: kullanıcı yazdıktan
+        # sonra başka bir worker'a düşen okuması replikaya gider (read-your-writes bozulur)
+        if self.replicas:
+            if not (app.debug or app.testing):
+                raise ReplicaConfigError(
+                    'DB_REPLICA_URLS ayarlıyken REPLICA_STICKY_BACKEND (süreçler arası paylaşılan '
+                    'bir CacheBackend) verilmelidir.')
+            app.logger.warning('Replikalar: REPLICA_STICKY_BACKEND yok, yapışıklık süreç içi '
+                               'LRUCache ile tutuluyor (sadece tek süreçte doğru çalışır).')
+        # app.cache modelleri import eder; bu modül ise db oluşturulmadan önce yüklenir
+        from app.cache import LRUCache
+        return LRUCache(max_entries=100000, ttl=self.sticky_seconds)
+
+    # --- İstek yaşam döngüsü ---
+
+    def _choose(self):
+        view = current_app.view_functions.get(request.endpoint)
+        if not getattr(view, 'read_only', False):
+            return
+        replica = self.pick_replica(_identity())
+        if replica is not None:
+            g._db_replica = replica
+
+    def pick_replica(self, user_id):
+        """
+        Okuma yapılacak replika bind'inin adı; replika yoksa veya kullanıcı
+        yazma sonrası primary'ye yapışıksa None. (ASGI yolu da bunu kullanır.)
+        """
+        if not self.replicas:
+            return None
+        if user_id is not None and self.sticky.get(_sticky_key(user_id)):
+            self.stats.incr('primary_sticky')
+            return None
+        self.stats.incr('replica')
+        return random.choice(self.replicas)
+
+    def _remember_writes(self, response):
+        if g.pop('_db_wrote', False):
+            user_id = _identity()
+            if user_id is not None:
+                self.sticky.set(_sticky_key(user_id), True, ttl=self.sticky_seconds)
+                self.stats.incr('sticky_marks')
+        return response
+
+    def status(self):
+        return {'replicas': self.replicas, 'sticky_seconds': self.sticky_seconds, **self.stats.as_dict()}
+
+
+def _sticky_key(user_id):
+    return f'db-primary:{user_id}'
+
+
+def _identity():
+    """İsteğin JWT kimliği; token yoksa veya geçersizse None (endpoint kendisi doğrular)."""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except (JWTExtendedException, PyJWTError):
+        return None
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush(session, flush_context):
+    if has_request_context():
+        g._db_wrote = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_dml(orm_execute_state):
+    # Flush'sız yazmalar: toplu INSERT, koşullu UPDATE, upsert'ler
+    if has_request_context() and (orm_execute_state.is_insert or orm_execute_state.is_update
+                                  or orm_execute_state.is_delete):
+        g._db_wrote = True
+
+
+replica_router = ReplicaRouter()
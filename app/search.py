@@ -0,0 +1,186 @@
+# /app/search.py
+
+"""
+Ürün tam metin (full-text) arama yardımcıları.
+
+- PostgreSQL: products.search_vector (tsvector) kolonu + GIN indeksi.
+- SQLite: products_fts adında bir FTS5 sanal tablosu (yerel geliştirme/test için).
+
+Her iki durumda da indeks, products.py içindeki create/update/delete
+rotalarından index_product / remove_product çağrılarak güncel tutulur.
+"""
+
+import json
+import re
+
+from flask import current_app
+from sqlalchemy import event, func, text, literal_column, table, column, update
+from sqlalchemy.orm import contains_eager, joinedload
+
+from app import db
+from app.models import Product, Listing
+
+# PostgreSQL metin arama yapılandırması (regconfig). Türkçe köklerle uğraşmamak
+# için varsayılan 'simple'; Config.SEARCH_TEXT_CONFIG ile değiştirilebilir.
+DEFAULT_TEXT_CONFIG = 'simple'
+
+FTS_TABLE = 'products_fts'
+FTS_CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, description, category, tokenize='unicode61 remove_diacritics 2')"
+)
+
+# Sıralamada başlık > kategori > açıklama ağırlığı
+_FTS_BM25 = f'bm25({FTS_TABLE}, 10.0, 1.0, 4.0)'
+_fts = table(FTS_TABLE, column('rowid'))
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _text_config():
+    return current_app.config.get('SEARCH_TEXT_CONFIG', DEFAULT_TEXT_CONFIG)
+
+
+def tsvector_expression(title, description, category, config=DEFAULT_TEXT_CONFIG):
+    """Başlık (A), kategori (B) ve açıklama (C) ağırlıklı tsvector ifadesi üretir."""
+    def weighted(value, weight):
+        return func.setweight(
+            func.to_tsvector(config, func.coalesce(value, '')), literal_column(f"'{weight}'")
+        )
+
+    return weighted(title, 'A').op('||')(weighted(category, 'B')).op('||')(weighted(description, 'C'))
+
+
+def fts_match_query(q):
+    """
+    Kullanıcı girdisini güvenli bir FTS5 MATCH ifadesine çevirir.
+    Her kelime tırnak içine alınır (FTS5 operatörleri devre dışı kalır),
+    son kelime önek (prefix) araması olarak eşlenir.
+    """
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def index_product(product):
+    """
+    Ürünün arama indeksini günceller. Ürün flush edilmiş olmalıdır (id gerekli).
+    Çağıran taraf commit'ten sorumludur.
+    """
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        # Atanan SQL ifadesi flush sırasında UPDATE içinde hesaplanır
+        product.search_vector = tsvector_expression(
+            product.title, product.description, product.category, _text_config()
+        )
+    elif dialect == 'sqlite':
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': product.id})
+        db.session.execute(
+            text(f'INSERT INTO {FTS_TABLE} (rowid, title, description, category) '
+                 'VALUES (:id, :title, :description, :category)'),
+            {
+                'id': product.id,
+                'title': product.title,
+                'description': product.description or '',
+                'category': product.category or ''
+            }
+        )
+
+
+def index_products(product_ids):
+    """
+    Toplu eklenen (ORM flush'ı olmadan) ürünlerin arama indeksini tek sorguda
+    doldurur. Değerler doğrudan products tablosundan okunur.
+    """
+    if not product_ids:
+        return
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        db.session.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids))
+            .values(search_vector=tsvector_expression(
+                Product.title, Product.description, Product.category, _text_config()))
+            .execution_options(synchronize_session=False)
+        )
+    elif dialect == 'sqlite':
+        db.session.execute(
+            text(f'INSERT INTO {FTS_TABLE} (rowid, title, description, category) '
+                 "SELECT id, title, coalesce(description, ''), coalesce(category, '') "
+                 'FROM products WHERE id IN (SELECT value FROM json_each(:ids))'),
+            {'ids': json.dumps(list(product_ids))}
+        )
+
+
+def index_all_products():
+    """
+    Tüm ürünlerin arama indeksini tek sorguda yeniden oluşturur
+    (toplu veri yüklemesi sonrası, bkz. app/seeding.py).
+    """
+    dialect = _dialect()
+    if dialect == 'postgresql':
+        db.session.execute(
+            update(Product)
+            .values(search_vector=tsvector_expression(
+                Product.title, Product.description, Product.category, _text_config()))
+            .execution_options(synchronize_session=False)
+        )
+    elif dialect == 'sqlite':
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE}'))
+        db.session.execute(text(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, category) '
+            "SELECT id, title, coalesce(description, ''), coalesce(category, '') FROM products"))
+
+
+def remove_product(product_id):
+    """Silinen ürünü arama indeksinden çıkarır (PostgreSQL'de satırla birlikte gider)."""
+    if _dialect() == 'sqlite':
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': product_id})
+
+
+def search_active_listings(q, limit, offset=0):
+    """
+    Aktif ilanlar arasında, ürün başlığı/açıklaması/kategorisi üzerinden
+    sıralı (ranked) arama yapar. Ürün ve ilan sahibi aynı sorguda yüklenir.
+    Dönüş: [(listing, rank), ...] en alakalıdan başlayarak; en fazla limit + 1 satır
+    (çağıran taraf bir sonraki sayfa olup olmadığını buradan anlar).
+    """
+    dialect = _dialect()
+    query = db.session.query(Listing).join(Listing.product).options(
+        contains_eager(Listing.product),
+        joinedload(Listing.lister)
+    ).filter(Listing.is_active == True)
+
+    if dialect == 'postgresql':
+        tsquery = func.websearch_to_tsquery(_text_config(), q)
+        rank = func.ts_rank_cd(Product.search_vector, tsquery)
+        query = query.filter(Product.search_vector.op('@@')(tsquery))
+        order = rank.desc()
+    else:  # sqlite (desteklenen veritabanları create_app'te kontrol edilir)
+        match = fts_match_query(q)
+        if match is None:
+            return []
+        # bm25 daha küçük = daha alakalı; dışarıya "büyük = iyi" olarak verilir
+        rank = -literal_column(_FTS_BM25)
+        query = query.join(_fts, _fts.c.rowid == Product.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        )
+        order = literal_column(_FTS_BM25).asc()
+
+    rows = query.add_columns(rank).order_by(order, Listing.id.desc()) \
+        .limit(limit + 1).offset(offset).all()
+    return [(listing, float(score or 0)) for listing, score in rows]
+
+
+@event.listens_for(Product.__table__, 'after_create')
+def _create_sqlite_fts_table(target, connection, **kw):
+    """db.create_all() ile SQLite'ta çalışırken FTS5 tablosunu da oluşturur."""
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text(FTS_CREATE_SQL))
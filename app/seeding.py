@@ -0,0 +1,276 @@
+# /app/seeding.py
+
+"""
+Yüksek hızlı sentetik veri yükleme (flask seed, benchmark'lar, staging).
+
+Aynı hacim ve tohum (seed) her çalıştırmada aynı satırları üretir; böylece
+farklı commit'lerde alınan ölçümler karşılaştırılabilir. Satırlar ORM'e
+uğramadan (User.set_password, db.session.add yok) batch_size'lık parçalar
+halinde yazılır:
+
+  PostgreSQL  COPY ... FROM STDIN (CSV), psycopg2 veya psycopg 3
+  SQLite      Core executemany
+
+Üretilen veri:
+  users         tek bir önceden hesaplanmış şifre hash'i ile (DEFAULT_PASSWORD)
+  products      kategorilere dağılmış, her birinin tek ilanı var
+  listings      sırayla SALE / RENT / SWAP; yaklaşık %5'i pasif
+  transactions  yarısı satış, yarısı kiralama; aynı ilanın kiralamaları çakışmaz
+  swap_offers   takas ilanlarına, teklif verenin kendi ürünüyle
+
+id'ler elle verildiği için tablolar boş olmalıdır (bkz. reset). Yükleme
+sonrası arama indeksi ve 'listings' koleksiyon sürümü güncellenir; istenirse
+analitik özet tabloları rebuild_all ile yeniden hesaplanır.
+"""
+
+import csv
+import enum
+import io
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select, text
+
+from app import db
+from app import analytics, search, versioning
+from app.hashing import password_hasher
+from app.models import (User, Product, Listing, Transaction, SwapOffer, CollectionVersion,
+                        SellerDailyStats, ListingDailyOccupancy,
+                        ListingType, TransactionStatus, OfferStatus)
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_PASSWORD = 'seed-sifre-123'
+CATEGORIES = ('elektronik', 'spor', 'kitap', 'giyim', 'ev', 'oyuncak', 'müzik', 'bahçe')
+LISTING_TYPES = (ListingType.SALE, ListingType.RENT, ListingType.SWAP)
+# created_at değerleri son HISTORY_DAYS güne dağılır; kiralamalar geleceğe uzanabilir
+HISTORY_DAYS = 365
+
+SEEDED_MODELS = (User, Product, Listing, Transaction, SwapOffer)
+# reset sırası: önce bağımlı tablolar
+_RESET_MODELS = (ListingDailyOccupancy, SellerDailyStats, SwapOffer, Transaction, Listing, Product, User)
+
+
+class DatabaseNotEmpty(RuntimeError):
+    """Tohumlanacak tablolarda zaten satır olduğunda fırlatılır."""
+
+
+# --- Üretim ---
+
+def generate(users, products, transactions, swap_offers, password_hash, seed=42, now=None):
+    """
+    (model, satır üreteci) çiftlerini tablo sırasıyla üretir. Üreteçler aynı
+    rastgele sayı akışını paylaşır; sırayla ve sonuna kadar tüketilmelidir.
+    """
+    rng = random.Random(seed)
+    now = (now or datetime.utcnow()).replace(microsecond=0)
+    history_start = now - timedelta(days=HISTORY_DAYS)
+
+    def past_moment():
+        return history_start + timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+
+    # --- 1. Kullanıcılar ---
+    def user_rows():
+        for i in range(1, users + 1):
+            created_at = past_moment()
+            yield {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com',
+                   'password_hash': password_hash, 'created_at': created_at}
+
+    # --- 2. Ürünler ve ilanları (ürün i -> ilan i, aynı sahip) ---
+    owners = [0] * (products + 1)
+    listings_by_type = {listing_type: [] for listing_type in LISTING_TYPES}
+
+    def product_rows():
+        for i in range(1, products + 1):
+            owners[i] = rng.randrange(1, users + 1)
+            created_at = past_moment()
+            yield {'id': i, 'title': f'Ürün {i}', 'description': 'Sentetik ürün açıklaması',
+                   'category': CATEGORIES[i % len(CATEGORIES)], 'image_url': None,
+                   'owner_id': owners[i], 'created_at': created_at, 'updated_at': created_at}
+
+    def listing_rows():
+        for i in range(1, products + 1):
+            listing_type = LISTING_TYPES[i % len(LISTING_TYPES)]
+            listings_by_type[listing_type].append(i)
+            created_at = past_moment()
+            yield {
+                'id': i, 'product_id': i, 'lister_id': owners[i], 'listing_type': listing_type,
+                'price': Decimal(rng.randrange(100, 50000)) if listing_type == ListingType.SALE else None,
+                'rental_price_per_day': Decimal(rng.randrange(10, 500))
+                if listing_type == ListingType.RENT else None,
+                'swap_preference': rng.choice(CATEGORIES) if listing_type == ListingType.SWAP else None,
+                'is_active': rng.random() >= 0.05,
+                'created_at': created_at, 'updated_at': created_at
+            }
+
+    # --- 3. İşlemler: satışlar ve çakışmayan kiralamalar ---
+    def transaction_rows():
+        sale_ids = listings_by_type[ListingType.SALE]
+        rent_ids = listings_by_type[ListingType.RENT]
+        if not (sale_ids or rent_ids) or users < 2:
+            return
+        # Her kiralık ilanın bir sonraki boş günü; kiralamalar geçmişten ileriye dizilir
+        next_free = {}
+        for i in range(1, transactions + 1):
+            if rent_ids and (i % 2 or not sale_ids):
+                listing_id = rng.choice(rent_ids)
+                start = next_free.get(listing_id, history_start.date()) + timedelta(days=rng.randrange(4))
+                end = start + timedelta(days=rng.randrange(1, 8))
+                next_free[listing_id] = end
+                status = rng.choices(
+                    (TransactionStatus.COMPLETED, TransactionStatus.PENDING, TransactionStatus.CANCELLED),
+                    weights=(70, 20, 10))[0]
+                transaction_type = ListingType.RENT
+                total_price = Decimal((end - start).days * rng.randrange(10, 500))
+            else:
+                listing_id = rng.choice(sale_ids)
+                start = end = None
+                status = TransactionStatus.COMPLETED
+                transaction_type, total_price = ListingType.SALE, Decimal(rng.randrange(100, 50000))
+
+            buyer_id = rng.randrange(1, users + 1)
+            if buyer_id == owners[listing_id]:
+                buyer_id = buyer_id % users + 1
+            created_at = past_moment()
+            yield {
+                'id': i, 'listing_id': listing_id, 'buyer_or_renter_id': buyer_id,
+                'transaction_type': transaction_type, 'status': status, 'total_price': total_price,
+                'start_date': start, 'end_date': end, 'created_at': created_at, 'updated_at': created_at
+            }
+
+    # --- 4. Takas teklifleri (teklif edilen ürün teklif verene ait) ---
+    def offer_rows():
+        swap_ids = listings_by_type[ListingType.SWAP]
+        if not swap_ids or products < 2:
+            return
+        for i in range(1, swap_offers + 1):
+            target_id = rng.choice(swap_ids)
+            offered_product_id = rng.randrange(1, products + 1)
+            if offered_product_id == target_id:
+                offered_product_id = offered_product_id % products + 1
+            yield {
+                'id': i, 'target_listing_id': target_id,
+                'offerer_id': owners[offered_product_id], 'offered_product_id': offered_product_id,
+                'status': rng.choices((OfferStatus.PENDING, OfferStatus.ACCEPTED, OfferStatus.REJECTED),
+                                      weights=(60, 15, 25))[0],
+                'message': 'Takas olur mu?', 'created_at': past_moment()
+            }
+
+    yield User, user_rows()
+    yield Product, product_rows()
+    yield Listing, listing_rows()
+    yield Transaction, transaction_rows()
+    yield SwapOffer, offer_rows()
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- Yazma ---
+
+def _csv_value(value):
+    # Enum'lar veritabanında ADI ile saklanır; None -> boş alan (CSV'de NULL)
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _copy(model, batch):
+    """PostgreSQL: bir batch'i COPY ... FROM STDIN (CSV) ile yazar."""
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([_csv_value(row[name]) for name in columns])
+
+    sql = f'COPY {model.__tablename__} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    # Oturumun bağlantısı: COPY de aynı veritabanı işleminin parçası olur
+    raw_connection = db.session.connection().connection.dbapi_connection
+    cursor = raw_connection.cursor()
+    try:
+        if hasattr(cursor, 'copy_expert'):
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)  # psycopg2
+        else:
+            with cursor.copy(sql) as copy:   # psycopg 3
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def _executemany(model, batch):
+    db.session.execute(model.__table__.insert(), batch)
+
+
+def _writer():
+    # Desteklenen veritabanları (PostgreSQL, SQLite) create_app'te kontrol edilir
+    return _copy if db.session.get_bind().dialect.name == 'postgresql' else _executemany
+
+
+def _reset_sequences():
+    """id'ler elle verildiği için PostgreSQL sequence'larını en büyük id'nin üstüne taşır."""
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    for model in SEEDED_MODELS:
+        table = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"))
+
+
+def reset():
+    """Tohumlanan tabloları ve türetilmiş özetleri boşaltır. Çağıran taraf commit'ten sorumludur."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        tables = ', '.join(model.__tablename__ for model in _RESET_MODELS)
+        db.session.execute(text(f'TRUNCATE {tables} RESTART IDENTITY CASCADE'))
+    else:
+        for model in _RESET_MODELS:
+            db.session.execute(model.__table__.delete())
+        db.session.execute(text(f'DELETE FROM {search.FTS_TABLE}'))
+    db.session.execute(CollectionVersion.__table__.delete())
+
+
+def seed(users, products, transactions, swap_offers, seed=42, batch_size=DEFAULT_BATCH_SIZE,
+         password=DEFAULT_PASSWORD, rebuild_analytics=True, progress=None):
+    """
+    Boş tabloları sentetik veriyle doldurur ve commit eder. Uygulama bağlamı içinde çağrılmalıdır.
+    progress(tablo adı, satır sayısı, saniye) verilirse her tablo bitince çağrılır.
+    Dönüş: tablo başına yazılan satır sayıları.
+    """
+    for model in SEEDED_MODELS:
+        if db.session.execute(select(model.id).limit(1)).first() is not None:
+            raise DatabaseNotEmpty(f'{model.__tablename__} tablosu boş değil.')
+
+    write = _writer()
+    # bcrypt bir kez: tüm kullanıcılar aynı şifreyle giriş yapabilir
+    password_hash = password_hasher.hash(password)
+
+    counts = {}
+    for model, rows in generate(users, products, transactions, swap_offers, password_hash, seed=seed):
+        started = time.perf_counter()
+        count = 0
+        for batch in _batches(rows, batch_size):
+            write(model, batch)
+            count += len(batch)
+        counts[model.__tablename__] = count
+        if progress:
+            progress(model.__tablename__, count, time.perf_counter() - started)
+
+    # --- Türetilmiş veriler ---
+    _reset_sequences()
+    search.index_all_products()
+    versioning.bump_before_commit()
+    db.session.commit()
+
+    if rebuild_analytics:
+        analytics.rebuild_all()
+    return counts
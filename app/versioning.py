@@ -0,0 +1,152 @@
+# /app/versioning.py
+
+"""
+Koleksiyon sürüm sayacı ve koşullu GET (ETag / If-None-Match) desteği.
+
+- İlan veya ürün içeren bir flush olan her veritabanı işleminde
+  collection_versions['listings'] bir artırılır. Artış commit'ten hemen önceki
+  son ifadedir (before_commit olayı): sayaç satırının kilidi işlemin başından
+  değil, sadece commit anında tutulur; aynı koleksiyona yazan eşzamanlı
+  işlemler bu satırda sıraya girmez. ORM dışı toplu yazmalar (app/atomic.py,
+  app/bulk.py) bump_before_commit ile artışı sıraya koyar.
+- GET endpoint'leri ETag'i sadece bu sayıdan ve istek URL'inden üretir.
+  İstemcinin If-None-Match başlığı eşleşirse 304 döner; ilan tablolarına
+  hiç dokunulmaz (tek bir birincil anahtar okuması yapılır).
+- Gövdeyi entity_cache'ten sunan endpoint'ler request_collection_version()
+  ile ETag'in sürümünü önbelleğe verir; daha eski sürümle yazılmış kayıtlar
+  yeniden yüklenir (bkz. app/cache.py).
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import request, make_response, current_app, g, has_request_context
+from sqlalchemy import event, select, insert, update
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Listing, Product, CollectionVersion
+
+LISTINGS = 'listings'
+
+# Bu modellerden biri değişince 'listings' koleksiyonunun sürümü artar
+_TRACKED_MODELS = (Listing, Product)
+
+_versions = CollectionVersion.__table__
+
+
+def collection_version_statement(name=LISTINGS):
+    """Koleksiyon sürümünü okuyan ifade (sync ve async oturumlarda ortak)."""
+    return select(_versions.c.version).where(_versions.c.name == name)
+
+
+def get_collection_version(name=LISTINGS):
+    """Koleksiyonun güncel sürümünü döner (satır yoksa 0)."""
+    version = db.session.execute(collection_version_statement(name)).scalar()
+    return version or 0
+
+
+def bump_collection_version(name=LISTINGS, connection=None):
+    """
+    Koleksiyon sürümünü bir artırır. Çağıranın veritabanı işleminin parçasıdır;
+    commit edilmezse artış da geri alınır.
+    """
+    execute = connection.execute if connection is not None else db.session.connection().execute
+    result = execute(
+        update(_versions).where(_versions.c.name == name).values(version=_versions.c.version + 1)
+    )
+    if result.rowcount == 0:
+        execute(insert(_versions).values(name=name, version=1))
+
+
+def bump_before_commit(session=None, name=LISTINGS):
+    """
+    Koleksiyon sürümünü session'ın commit'inden hemen önce artırılmak üzere
+    işaretler (işlem başına bir kez). Rollback'te işaret silinir.
+    """
+    session = session if session is not None else db.session
+    session.info.setdefault('bump_collection_versions', set()).add(name)
+
+
+def make_etag(version, scope=''):
+    """Sürüm ve kapsamdan (URL + query string) güçlü (strong) bir ETag üretir."""
+    digest = hashlib.sha1(scope.encode('utf-8')).hexdigest()[:16]
+    return f'{version}-{digest}'
+
+
+def request_collection_version(name=LISTINGS):
+    """
+    conditional_get'in bu istekte okuduğu sürüm (ETag bu sürümdendir);
+    dekoratör dışında çağrılırsa sürüm veritabanından okunur.
+    """
+    versions = g.get('collection_versions', {}) if has_request_context() else {}
+    if name in versions:
+        return versions[name]
+    return get_collection_version(name)
+
+
+def conditional_get(collection=LISTINGS):
+    """
+    GET endpoint'ine koleksiyon sürümüne dayalı ETag ekleyen dekoratör.
+    If-None-Match eşleşirse endpoint hiç çalıştırılmadan 304 döner.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = get_collection_version(collection)
+            g.setdefault('collection_versions', {})[collection] = version
+            etag = make_etag(version, request.full_path)
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # İstemci her seferinde yeniden doğrulasın (304 ile ucuz)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def _touches_tracked_models(session):
+    for obj in session.new:
+        if isinstance(obj, _TRACKED_MODELS):
+            return True
+    for obj in session.deleted:
+        if isinstance(obj, _TRACKED_MODELS):
+            return True
+    for obj in session.dirty:
+        if isinstance(obj, _TRACKED_MODELS) and session.is_modified(obj, include_collections=False):
+            return True
+    return False
+
+
+@event.listens_for(Session, 'before_flush')
+def _mark_listings_changed(session, flush_context, instances):
+    if _touches_tracked_models(session):
+        bump_before_commit(session, LISTINGS)
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions_before_commit(session):
+    # commit() bekleyen nesneleri bu olaydan sonra flush eder; artışın son ifade
+    # olması için flush burada yapılır (izlenen modeller varsa işaretlenir)
+    session.flush()
+    names = session.info.pop('bump_collection_versions', None)
+    for name in sorted(names or ()):
+        bump_collection_version(name, connection=session.connection())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_bumps_on_rollback(session):
+    session.info.pop('bump_collection_versions', None)
+
+
+@event.listens_for(CollectionVersion.__table__, 'after_create')
+def _seed_collection_versions(target, connection, **kw):
+    """db.create_all() sonrası sayaç satırını oluşturur."""
+    connection.execute(insert(target).values(name=LISTINGS, version=0))
@@ -0,0 +1,237 @@
+# /app/warmup.py
+
+"""
+Süreç başlangıcı: ön ısıtma (warmup) ve başlangıç raporu.
+
+Production girişi (wsgi.py + gunicorn.conf.py) şu sırayla çalışır:
+
+  1. Ana süreç, fork'tan önce (preload): create_app, ardından warmup(app)
+       mappers   SQLAlchemy mapper'ları yapılandırılır (backref'ler ilk sorguda kurulmasın)
+       json      JSON sağlayıcısı Decimal / datetime / enum içeren bir gövdeyle ısıtılır
+       requests  WARMUP_PATHS uygulama içinden GET edilir: URL haritası derlenir,
+                 SQL derleme önbelleği dolar, ilk istekteki tembel import'lar yüklenir
+       cache     akışın ilk WARMUP_CACHE_LISTINGS ilanının detayı entity_cache'e yüklenir
+       matches   takas eşleştirme indeksi kurulur (app/matchmaking.py); worker'lar devralır
+     ve release_connections(app): fork edilen süreçler ana sürecin soketlerini paylaşmasın.
+  2. Her worker, fork'tan sonra: warm_worker(app) devralınan havuzları bırakır ve
+     WARMUP_POOL_CONNECTIONS bağlantıyı önceden açar.
+
+Worker'lar yukarıdaki her şeyi fork ile (copy-on-write) devralır; ilk gerçek
+istek sadece kendi işini yapar. startup_report süreç başına soğuk başlangıç,
+ısıtma adımları ve ilk isteğin gecikmesini tutar; ilk istekte loglanır ve
+GET /api/internal/startup ile okunur.
+
+Config:
+  WARMUP_ENABLED            ısıtma yapılsın mı (varsayılan True)
+  WARMUP_PATHS              ısıtma için GET edilecek yollar (varsayılan ['/api/listings/'])
+  WARMUP_CACHE_LISTINGS     entity_cache'e önceden yüklenecek ilan sayısı (0: kapalı)
+  WARMUP_POOL_CONNECTIONS   worker başına önceden açılacak bağlantı (havuz boyutuyla sınırlı)
+"""
+
+import decimal
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.pool import QueuePool
+
+from app import db, reads
+from app.cache import entity_cache
+from app.matchmaking import swap_matcher
+from app.models import ListingType
+from app.query_budget import query_monitor
+from app.versioning import get_collection_version
+
+DEFAULT_PATHS = ('/api/listings/',)
+DEFAULT_POOL_CONNECTIONS = 2
+DEFAULT_CACHE_LISTINGS = 100
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class _Steps:
+    """Adım adım süre ölçümü: {'adım_ms': ..., 'total_ms': ...}"""
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    def run(self, name, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.timings[f'{name}_ms'] = _ms(time.perf_counter() - started)
+        return result
+
+    def done(self):
+        self.timings['total_ms'] = _ms(time.perf_counter() - self._started)
+        return self.timings
+
+
+# --- Ana süreç (fork öncesi) ---
+
+def _prime_json(app):
+    app.json.dumps_bytes({'price': decimal.Decimal('1.50'), 'created_at': datetime.utcnow(),
+                          'listing_type': ListingType.SALE, 'items': [1, 'a', None]})
+    app.json.loads(b'{"ids": [1, 2, 3]}')
+
+
+def _prime_requests(app, paths):
+    client = app.test_client()
+    # Isıtma istekleri ilk istek ölçümüne ve endpoint istatistiklerine karışmasın
+    startup_report.paused = True
+    try:
+        for path in paths:
+            response = client.get(path)
+            if response.status_code >= 500:
+                app.logger.warning('Warmup: GET %s -> %s', path, response.status_code)
+    finally:
+        startup_report.paused = False
+    query_monitor.stats.clear()
+
+
+def _prime_entity_cache(count):
+    if count <= 0 or not entity_cache.enabled:
+        return 0
+    version = get_collection_version()
+    ids = [listing.id for listing in db.session.execute(reads.feed_statement(count)).scalars().all()[:count]]
+    # Detay endpoint'inin kendi ifadesiyle: onun SQL derlemesi de önbelleğe girer
+    listings = db.session.execute(reads.listing_details_statement(ids)).scalars().all()
+    loaded = {f'listing:{listing.id}': (reads.serialize_listing(listing), reads.listing_cache_tags(listing))
+              for listing in listings}
+    entity_cache.get_many_or_load(list(loaded), lambda keys: {key: loaded[key] for key in keys}, version=version)
+    return len(loaded)
+
+
+def warmup(app):
+    """
+    Süreçten bağımsız ısıtma (preload'da fork'tan önce bir kez). Adım sürelerini döner.
+    Veritabanına erişilemezse istek ve önbellek adımları atlanır; uygulama yine başlar.
+    """
+    steps = _Steps()
+    steps.run('mappers', configure_mappers)
+    steps.run('json', _prime_json, app)
+
+    with app.app_context():
+        try:
+            steps.run('requests', _prime_requests, app,
+                      app.config.get('WARMUP_PATHS', DEFAULT_PATHS))
+            steps.timings['cached_listings'] = steps.run(
+                'cache', _prime_entity_cache,
+                app.config.get('WARMUP_CACHE_LISTINGS', DEFAULT_CACHE_LISTINGS))
+            steps.run('matches', swap_matcher.refresh)
+        except Exception:
+            app.logger.exception('Warmup: veritabanı adımları başarısız, atlandı.')
+        finally:
+            db.session.remove()
+
+    timings = steps.done()
+    startup_report.warmup = timings
+    return timings
+
+
+def release_connections(app):
+    """Ana sürecin havuzlarındaki bağlantıları kapatır (fork'tan önce)."""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+# --- Worker (fork sonrası) ---
+
+def _open_pool(engine, count):
+    if isinstance(engine.pool, QueuePool):
+        # Havuz boyutunu aşanlar geri verilirken kapatılır; açmaya değmez
+        count = min(count, engine.pool.size())
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connection.exec_driver_sql('SELECT 1')
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def warm_worker(app):
+    """Fork edilen worker'da: devralınan havuzları bırakır ve bağlantıları önceden açar."""
+    steps = _Steps()
+    count = app.config.get('WARMUP_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS)
+    with app.app_context():
+        for engine in db.engines.values():
+            # close=False: ana süreçten kalan soketlere dokunma, sadece unut
+            engine.dispose(close=False)
+        if count > 0:
+            try:
+                steps.timings['pool_connections'] = steps.run('pool', _open_pool, db.engine, count)
+            except Exception:
+                app.logger.exception('Warmup: bağlantı havuzu ısıtılamadı.')
+    timings = steps.done()
+    startup_report.worker_warmup = timings
+    return timings
+
+
+# --- Başlangıç raporu ---
+
+class StartupReport:
+    """
+    Süreç başına: uygulamanın hazır olma süresi (soğuk başlangıç), ısıtma adımları
+    ve ilk isteğin gecikmesi. Fork edilen süreçte ilk istek yeniden ölçülür.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pid = os.getpid()
+        self.app_ready_ms = None
+        self.warmup = None
+        self.worker_warmup = None
+        self.first_request = None
+        self.paused = False
+
+    def init_app(self, app):
+        app.wsgi_app = self._timed(app, app.wsgi_app)
+        app.extensions['startup_report'] = self
+
+    def app_ready(self, seconds):
+        self.app_ready_ms = _ms(seconds)
+
+    def _timed(self, app, wsgi_app):
+        def middleware(environ, start_response):
+            if self.paused or (self.first_request is not None and self.pid == os.getpid()):
+                return wsgi_app(environ, start_response)
+            started = time.perf_counter()
+            try:
+                return wsgi_app(environ, start_response)
+            finally:
+                self._record_first(app, environ, time.perf_counter() - started)
+        return middleware
+
+    def _record_first(self, app, environ, seconds):
+        with self._lock:
+            if self.pid != os.getpid():
+                # Fork edilmiş yeni süreç: ana sürecin ilk isteği (warmup) sayılmaz
+                self.pid = os.getpid()
+                self.first_request = None
+            if self.first_request is not None:
+                return
+            self.first_request = {'path': environ.get('PATH_INFO'), 'latency_ms': _ms(seconds)}
+        app.logger.info('İlk istek (pid %s): %s %.2f ms; uygulama hazır: %s ms, warmup: %s, worker warmup: %s',
+                        self.pid, self.first_request['path'], self.first_request['latency_ms'],
+                        self.app_ready_ms, self.warmup, self.worker_warmup)
+
+    def as_dict(self):
+        return {
+            'pid': os.getpid(),
+            'app_ready_ms': self.app_ready_ms,
+            'warmup': self.warmup,
+            'worker_warmup': self.worker_warmup,
+            'first_request': self.first_request if self.pid == os.getpid() else None
+        }
+
+
+startup_report = StartupReport()
@@ -0,0 +1,286 @@
+# /benchmarks/async_vs_sync.py
+
+"""
+Worker başına eşzamanlı istek kapasitesi: sync (WSGI) ve async (ASGI) karşılaştırması.
+
+Veritabanı app/seeding.py ile doldurulur, ardından aynı veritabanına karşı
+iki sunucu ayrı süreçlerde başlatılır:
+
+  sync    Flask, tek sync worker (werkzeug, thread'siz: aynı anda tek istek)
+  async   app/asgi.py, tek uvicorn worker (tek olay döngüsü)
+
+Her eşzamanlılık seviyesinde (--concurrency 1,8,32,64) ve her endpoint için,
+o kadar istemci thread'i kalıcı bağlantılarla --requests istek gönderir:
+
+  listings_feed   GET /api/listings/               akış sayfaları
+  listing_detail  GET /api/listings/<id>           farklı ilanlar (entity_cache kapalı)
+  my_purchases    GET /api/transactions/my_purchases
+  received        GET /api/transactions/received
+
+Raporlanan: saniyedeki istek (req/s), p50 / p95 gecikme ve hatalı yanıt sayısı.
+Sonuçlar benchmarks/results/async-vs-sync-<commit>.json dosyasına yazılır.
+
+Async sunucu için sqlalchemy[asyncio], asgiref, uvicorn ve async sürücü
+(aiosqlite veya psycopg) gerekir. SQLite'ta sorgular yerel dosyadan
+mikrosaniyeler içinde döndüğü için fark küçük kalır; anlamlı sonuç ağ
+üzerinden PostgreSQL'e karşı alınır:
+
+    python -m benchmarks.async_vs_sync
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.async_vs_sync \\
+        --users 20000 --products 200000 --transactions 500000 --concurrency 1,16,64,128
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app import db, seeding
+from app.models import Listing, Transaction, ListingType, TransactionStatus
+from benchmarks.common import BenchmarkConfig, make_app, auth_header, percentile
+from benchmarks.endpoints import RESULTS_DIR, git_revision
+
+HOST = '127.0.0.1'
+SERVERS = ('sync', 'async')
+
+
+# --- Sunucular (alt süreçte: python -m benchmarks.async_vs_sync --serve <tür> --port <p>) ---
+
+class ServerConfig(BenchmarkConfig):
+    # Her iki sunucu da veritabanına gitsin; önbellek isabetleri ölçümü bozmasın
+    ENTITY_CACHE_ENABLED = False
+    QUERY_BUDGET_MODE = 'off'
+
+
+def serve(kind, port):
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    if kind == 'sync':
+        from werkzeug.serving import run_simple
+        from app import create_app
+        run_simple(HOST, port, create_app(ServerConfig), threaded=False)
+    else:
+        import uvicorn
+        from app.asgi import create_asgi_app
+        uvicorn.run(create_asgi_app(ServerConfig), host=HOST, port=port, workers=1,
+                    log_level='warning', access_log=False)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, database_uri, timeout=30):
+    port = _free_port()
+    # Alt süreç aynı veritabanını kullansın (BenchmarkConfig bu değişkeni okur)
+    env = {**os.environ, 'BENCH_DATABASE_URL': database_uri}
+    process = subprocess.Popen([sys.executable, '-m', 'benchmarks.async_vs_sync', '--serve', kind,
+                                '--port', str(port)], env=env)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{kind} sunucusu başlamadı (çıkış kodu {process.returncode}).')
+        try:
+            socket.create_connection((HOST, port), timeout=0.2).close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'{kind} sunucusu {timeout} saniyede cevap vermedi.')
+
+
+# --- Senaryolar: (app) -> (index -> (yol, başlıklar)) ---
+
+def listings_feed(app):
+    return lambda index: (f'/api/listings/?limit={10 + index % 11}', {})
+
+
+def listing_detail(app):
+    with app.app_context():
+        ids = db.session.execute(select(Listing.id).order_by(Listing.id).limit(1000)).scalars().all()
+    return lambda index: (f'/api/listings/{ids[index % len(ids)]}', {})
+
+
+def _busiest(app, column, where=()):
+    with app.app_context():
+        return db.session.execute(
+            select(column).where(*where).group_by(column).order_by(func.count().desc(), column).limit(1)
+        ).scalar()
+
+
+def my_purchases(app):
+    headers = auth_header(app, _busiest(app, Transaction.buyer_or_renter_id, [
+        Transaction.transaction_type == ListingType.SALE,
+        Transaction.status == TransactionStatus.COMPLETED]))
+    return lambda index: ('/api/transactions/my_purchases', headers)
+
+
+def received(app):
+    headers = auth_header(app, _busiest(app, Listing.lister_id, [Listing.id == Transaction.listing_id]))
+    return lambda index: ('/api/transactions/received', headers)
+
+
+SCENARIOS = {
+    'listings_feed': listings_feed,
+    'listing_detail': listing_detail,
+    'my_purchases': my_purchases,
+    'received': received
+}
+
+
+# --- Yük ---
+
+def drive(port, request_for, concurrency, total):
+    """total isteği concurrency thread'e paylaştırır; (geçen süre, gecikmeler, hatalar) döner."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def worker():
+        connection = http.client.HTTPConnection(HOST, port, timeout=60)
+        own, failed = [], 0
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            path, headers = request_for(index)
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+            own.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies, errors[0]
+
+
+def measure(port, request_for, concurrency, args):
+    drive(port, request_for, min(concurrency, 4), args.warmup)
+    elapsed, latencies, errors = drive(port, request_for, concurrency, args.requests)
+    return {
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'errors': errors
+    }
+
+
+def print_results(results):
+    print(f'\n{"endpoint":15} {"eşz.":>5} ' + ' '.join(f'{kind + " req/s":>12} {"p95":>9}' for kind in SERVERS)
+          + f' {"async/sync":>10}')
+    for name, levels in results['endpoints'].items():
+        for concurrency, row in levels.items():
+            cells = []
+            for kind in SERVERS:
+                cell = row.get(kind)
+                cells.append(f'{cell["requests_per_second"]:12.1f} {cell["p95_ms"]:7.2f}ms' if cell
+                             else f'{"-":>12} {"-":>9}')
+            ratio = '-'
+            if row.get('sync') and row.get('async'):
+                ratio = f'{row["async"]["requests_per_second"] / row["sync"]["requests_per_second"]:.2f}x'
+            errors = sum(row[kind]['errors'] for kind in SERVERS if row.get(kind))
+            print(f'{name:15} {concurrency:>5} ' + ' '.join(cells) + f' {ratio:>10}'
+                  + (f'  ({errors} hata)' if errors else ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--transactions', type=int, default=50000)
+    parser.add_argument('--offers', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', default='1,8,32,64', help='virgülle ayrılmış eşzamanlı istemci sayıları')
+    parser.add_argument('--requests', type=int, default=500, help='seviye ve endpoint başına istek')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--endpoints', default=','.join(SCENARIOS))
+    parser.add_argument('--servers', default=','.join(SERVERS))
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/async-vs-sync-<commit>.json)')
+    parser.add_argument('--serve', choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return 0
+
+    names = [name for name in args.endpoints.split(',') if name]
+    kinds = [kind for kind in args.servers.split(',') if kind]
+    unknown = (set(names) - set(SCENARIOS)) | (set(kinds) - set(SERVERS))
+    if unknown:
+        parser.error(f'bilinmeyen endpoint/sunucu: {", ".join(sorted(unknown))}')
+    levels = [int(value) for value in args.concurrency.split(',') if value]
+
+    app = make_app()
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        volumes = seeding.seed(args.users, args.products, args.transactions, args.offers,
+                               seed=args.seed, rebuild_analytics=False)
+    print(f'Veri ({dialect}): ' + ', '.join(f'{name}={count}' for name, count in volumes.items()))
+    requests_for = {name: SCENARIOS[name](app) for name in names}
+
+    endpoints = {name: {level: {} for level in levels} for name in names}
+    for kind in kinds:
+        process, port = start_server(kind, app.config['SQLALCHEMY_DATABASE_URI'])
+        try:
+            for name in names:
+                for level in levels:
+                    endpoints[name][level][kind] = measure(port, requests_for[name], level, args)
+                    print(f'  {kind:5} {name:15} eşz.={level:<4} '
+                          f'{endpoints[name][level][kind]["requests_per_second"]:8.1f} req/s')
+        finally:
+            process.terminate()
+            process.wait()
+
+    commit, dirty = git_revision()
+    results = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': sys.version.split()[0],
+            'dialect': dialect,
+            'volumes': volumes,
+            'requests': args.requests,
+            'workers_per_server': 1
+        },
+        'endpoints': endpoints
+    }
+    print_results(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f'async-vs-sync-{commit}{"-dirty" if dirty else ""}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f'\nSonuçlar: {output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
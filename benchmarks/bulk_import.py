@@ -0,0 +1,104 @@
+# /benchmarks/bulk_import.py
+
+"""
+Envanter içe aktarımı: N ürün + ilanı iki yolla oluşturur ve süreleri karşılaştırır.
+
+  tek tek : her öğe için POST /api/products/ + POST /api/listings/ (2 istek, 2 commit)
+  toplu   : POST /api/products/bulk, BULK_MAX_ITEMS'lık parçalar halinde
+
+Kullanım:
+    python -m benchmarks.bulk_import --items 1000
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models import User, Product, Listing
+from benchmarks.common import make_app, auth_header
+
+
+def build_items(count):
+    types = ['sale', 'rent', 'swap']
+    items = []
+    for i in range(count):
+        listing_type = types[i % 3]
+        listing = {'listing_type': listing_type}
+        if listing_type == 'sale':
+            listing['price'] = 100 + i
+        elif listing_type == 'rent':
+            listing['rental_price_per_day'] = 10 + i % 50
+        else:
+            listing['swap_preference'] = 'Oyun konsolu'
+        items.append({
+            'title': f'İçe aktarılan ürün {i}',
+            'description': 'Toplu içe aktarım testi',
+            'category': ['elektronik', 'spor', 'kitap'][i % 3],
+            'listing': listing
+        })
+    return items
+
+
+def make_seller(app, username):
+    with app.app_context():
+        seller = User(username=username, email=f'{username}@example.com', password_hash='x')
+        db.session.add(seller)
+        db.session.commit()
+        return seller.id
+
+
+def count_rows(app, owner_id):
+    with app.app_context():
+        products = db.session.execute(
+            select(func.count(Product.id)).where(Product.owner_id == owner_id)).scalar()
+        listings = db.session.execute(
+            select(func.count(Listing.id)).where(Listing.lister_id == owner_id)).scalar()
+    return products, listings
+
+
+def one_at_a_time(app, headers, items):
+    client = app.test_client()
+    for item in items:
+        product = {key: value for key, value in item.items() if key != 'listing'}
+        response = client.post('/api/products/', headers=headers, json=product)
+        product_id = response.get_json()['product']['id']
+        client.post('/api/listings/', headers=headers, json={'product_id': product_id, **item['listing']})
+
+
+def in_bulk(app, headers, items):
+    client = app.test_client()
+    chunk = app.config['BULK_MAX_ITEMS']
+    for start in range(0, len(items), chunk):
+        response = client.post('/api/products/bulk', headers=headers, json={'items': items[start:start + chunk]})
+        if response.status_code != 201:
+            raise RuntimeError(response.get_json())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--items', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    app = make_app()
+    items = build_items(args.items)
+    failed = False
+
+    for name, path in (('tek tek', one_at_a_time), ('toplu', in_bulk)):
+        seller_id = make_seller(app, f'seller_{path.__name__}')
+        headers = auth_header(app, seller_id)
+        started = time.perf_counter()
+        path(app, headers, items)
+        elapsed = time.perf_counter() - started
+        products, listings = count_rows(app, seller_id)
+        failed |= products != args.items or listings != args.items
+        print(f'{name:8} {args.items} öğe: {elapsed:7.2f}s ({args.items / elapsed:8.1f} öğe/s) '
+              f'ürün={products} ilan={listings}')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
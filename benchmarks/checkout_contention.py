@@ -0,0 +1,106 @@
+# /benchmarks/checkout_contention.py
+
+"""
+"Flash sale" senaryosu: az sayıda satış ilanına çok sayıda alıcı aynı anda
+POST /api/transactions/buy gönderir. Throughput, çakışma (410) oranı ve
+istek gecikmeleri raporlanır; sonunda her ilanın en fazla bir kez
+satıldığı doğrulanır.
+
+Kullanım:
+    python -m benchmarks.checkout_contention --threads 32 --listings 20 --iterations 40
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from threading import Lock
+
+from sqlalchemy import text
+
+from app import db
+from app.models import User, Product, Listing, ListingType
+from benchmarks.common import make_app, auth_header, run_threads, percentile
+
+OVERSOLD_SQL = text(
+    "SELECT COUNT(*) FROM (SELECT listing_id FROM transactions "
+    "WHERE transaction_type = 'SALE' AND status = 'COMPLETED' "
+    "GROUP BY listing_id HAVING COUNT(*) > 1) oversold"
+)
+
+
+def seed(app, listing_count, buyer_count):
+    with app.app_context():
+        seller = User(username='seller', email='seller@example.com', password_hash='x')
+        buyers = [User(username=f'buyer{i}', email=f'buyer{i}@example.com', password_hash='x')
+                  for i in range(buyer_count)]
+        db.session.add_all([seller] + buyers)
+        db.session.flush()
+
+        listing_ids = []
+        for i in range(listing_count):
+            product = Product(title=f'Kampanya ürünü {i}', category='kampanya', owner_id=seller.id)
+            db.session.add(product)
+            db.session.flush()
+            listing = Listing(product_id=product.id, lister_id=seller.id,
+                              listing_type=ListingType.SALE, price=99)
+            db.session.add(listing)
+            db.session.flush()
+            listing_ids.append(listing.id)
+        db.session.commit()
+        return [b.id for b in buyers], listing_ids
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--iterations', type=int, default=40, help='thread başına istek sayısı')
+    parser.add_argument('--listings', type=int, default=20)
+    parser.add_argument('--buyers', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    app = make_app()
+    buyer_ids, listing_ids = seed(app, args.listings, args.buyers)
+    buyer_headers = [auth_header(app, buyer_id) for buyer_id in buyer_ids]
+
+    counts = Counter()
+    latencies = []
+    lock = Lock()
+
+    def worker(index):
+        rng = random.Random(args.seed + index)
+        client = app.test_client()
+        local_counts = Counter()
+        local_latencies = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            response = client.post('/api/transactions/buy', headers=rng.choice(buyer_headers),
+                                   json={'listing_id': rng.choice(listing_ids)})
+            local_latencies.append(time.perf_counter() - started)
+            local_counts[response.status_code] += 1
+        with lock:
+            counts.update(local_counts)
+            latencies.extend(local_latencies)
+
+    elapsed = run_threads(args.threads, worker)
+
+    with app.app_context():
+        oversold = db.session.execute(OVERSOLD_SQL).scalar()
+
+    total = sum(counts.values())
+    print(f'thread={args.threads} istek={total} süre={elapsed:.2f}s '
+          f'throughput={total / elapsed:.1f} istek/s')
+    print(f'başarılı (201)={counts[201]} çakışma (410)={counts[410]} '
+          f'çakışma oranı={counts[410] / total:.1%} diğer={total - counts[201] - counts[410]}')
+    print(f'gecikme p50={percentile(latencies, 50) * 1000:.1f}ms '
+          f'p95={percentile(latencies, 95) * 1000:.1f}ms '
+          f'p99={percentile(latencies, 99) * 1000:.1f}ms')
+    print(f'birden fazla satılan ilan: {oversold}')
+
+    return 1 if oversold or counts[201] > args.listings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
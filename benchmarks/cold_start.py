@@ -0,0 +1,129 @@
+# /benchmarks/cold_start.py
+
+"""
+Soğuk başlangıç ve ilk istek gecikmesi: ısıtmasız ve ısıtmalı (app/warmup.py) süreçler.
+
+Veritabanı app/seeding.py ile doldurulur. Ardından her tur için yeni bir
+Python süreci production girişini (wsgi.py) import eder, yani gunicorn
+ana sürecinin yaptığını yapar. WARMUP_ENABLED=1 turlarında fork sonrası
+adım (warm_worker) da aynı süreçte çalıştırılır. Süreç başına ölçülenler:
+
+  app_ready    import + create_app süresi (soğuk başlangıç)
+  warmup       ısıtma adımlarının toplamı (ana süreç + worker)
+  first        her yolun ilk isteğinin gecikmesi
+  warm         aynı yolun sonraki --requests isteğinin medyanı
+
+Kullanım:
+    python -m benchmarks.cold_start --runs 5
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.cold_start --products 100000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = {'cold': '0', 'warm': '1'}
+
+
+# --- Alt süreç: python -m benchmarks.cold_start --child --paths ... ---
+
+def child(paths, requests):
+    # Zamanlama wsgi.py içinde, uygulama import'larından önce başlar
+    import wsgi
+    from app.warmup import startup_report, warm_worker
+
+    app = wsgi.app
+    if app.config.get('WARMUP_ENABLED'):
+        warm_worker(app)
+
+    client = app.test_client()
+    result = {'app_ready_ms': startup_report.app_ready_ms,
+              'warmup_ms': sum((timings or {}).get('total_ms', 0)
+                               for timings in (startup_report.warmup, startup_report.worker_warmup)),
+              'paths': {}}
+    for path in paths:
+        latencies = []
+        for _ in range(requests + 1):
+            started = time.perf_counter()
+            response = client.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise SystemExit(f'GET {path} -> {response.status_code}')
+        result['paths'][path] = {'first_ms': round(latencies[0], 2),
+                                 'warm_ms': round(statistics.median(latencies[1:]), 3)}
+    print(json.dumps(result))
+
+
+def run_child(mode, database_uri, paths, requests):
+    env = {**os.environ, 'DATABASE_URL': database_uri, 'WARMUP_ENABLED': MODES[mode],
+           'QUERY_BUDGET_MODE': 'off'}
+    completed = subprocess.run([sys.executable, '-m', 'benchmarks.cold_start', '--child',
+                                '--paths', ','.join(paths), '--requests', str(requests)],
+                               env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs, paths):
+    median = lambda values: round(statistics.median(values), 2)
+    return {
+        'app_ready_ms': median([run['app_ready_ms'] for run in runs]),
+        'warmup_ms': median([run['warmup_ms'] for run in runs]),
+        'paths': {path: {key: median([run['paths'][path][key] for run in runs])
+                         for key in ('first_ms', 'warm_ms')} for path in paths}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--transactions', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5, help='mod başına süreç sayısı')
+    parser.add_argument('--requests', type=int, default=20, help='ilk istekten sonraki sıcak istek sayısı')
+    parser.add_argument('--paths', help='virgülle ayrılmış yollar (varsayılan: akış ve bir ilan detayı)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.paths.split(','), args.requests)
+        return 0
+
+    from sqlalchemy import select
+    from sqlalchemy.engine import make_url
+
+    from app import db, seeding
+    from app.models import Listing
+    from benchmarks.common import make_app
+
+    app = make_app()
+    with app.app_context():
+        seeding.seed(args.users, args.products, args.transactions, 0, rebuild_analytics=False)
+        listing_id = db.session.execute(
+            select(Listing.id).where(Listing.is_active.is_(True)).order_by(Listing.id.desc()).limit(1)
+        ).scalar()
+    paths = args.paths.split(',') if args.paths else ['/api/listings/', f'/api/listings/{listing_id}']
+    database_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    dialect = make_url(database_uri).get_backend_name()
+
+    results = {}
+    for mode in MODES:
+        runs = [run_child(mode, database_uri, paths, args.requests) for _ in range(args.runs)]
+        results[mode] = summarize(runs, paths)
+
+    print(f'{args.runs} süreç medyanı ({dialect}):')
+    print(f'{"mod":6} {"app hazır":>10} {"warmup":>9}  ' + '  '.join(f'{path:>28}' for path in paths))
+    print(f'{"":6} {"":>10} {"":>9}  ' + '  '.join(f'{"ilk / sıcak":>28}' for _ in paths))
+    for mode, row in results.items():
+        cells = [f'{row["paths"][path]["first_ms"]:10.2f}ms / {row["paths"][path]["warm_ms"]:8.3f}ms'
+                 for path in paths]
+        print(f'{mode:6} {row["app_ready_ms"]:8.1f}ms {row["warmup_ms"]:7.1f}ms  '
+              + '  '.join(f'{cell:>28}' for cell in cells))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# /benchmarks/common.py
+
+"""
+Benchmark betikleri için ortak yardımcılar.
+
+Varsayılan olarak her çalıştırmada geçici bir SQLite dosyası kullanılır.
+Gerçek bir veritabanına karşı ölçmek için BENCH_DATABASE_URL verin
+(DİKKAT: tablolar silinip yeniden oluşturulur).
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.config import Config
+
+
+def _bench_database_uri():
+    url = os.environ.get('BENCH_DATABASE_URL')
+    if url:
+        return url
+    fd, path = tempfile.mkstemp(prefix='urun_pazari_bench_', suffix='.db')
+    os.close(fd)
+    return f'sqlite:///{path}'
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = _bench_database_uri()
+    # SQLite'ta eşzamanlı yazarlar kilidi beklesin, hemen 'database is locked' vermesin
+    SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}} \
+        if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else {}
+    JWT_SECRET_KEY = 'benchmark-secret-key-benchmark-secret-key'
+    BCRYPT_LOG_ROUNDS = 4
+
+
+def make_app(config_class=BenchmarkConfig):
+    """Uygulamayı kurar ve şemayı sıfırdan oluşturur."""
+    app = create_app(config_class)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def auth_header(app, user_id):
+    """Verilen kullanıcı için Authorization başlığı üretir."""
+    with app.app_context():
+        token = create_access_token(identity=str(user_id))
+    return {'Authorization': f'Bearer {token}'}
+
+
+def run_threads(thread_count, target):
+    """target(thread_index) fonksiyonunu thread_count thread'de çalıştırır; geçen süreyi döner."""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(thread_count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def percentile(values, pct):
+    """Sıralı olmayan bir listeden yüzdelik (nearest-rank) değer."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
@@ -0,0 +1,286 @@
+# /benchmarks/endpoints.py
+
+"""
+Endpoint benchmark paketi: sentetik büyük veri kümesinde gecikme, sorgu sayısı ve bellek.
+
+Veritabanı app/seeding.py ile (flask seed ile aynı veri) deterministik olarak
+doldurulur, ardından her endpoint sırayla (tek thread, uygulama içi test istemcisi) çağrılır:
+
+  listings_feed       GET  /api/listings/              akış sayfaları (next_cursor ile ilerler)
+  listings_faceted    GET  /api/listings/?...&facets=1 tür, kategori, fiyat aralığı, fiyata göre, facet'ler
+  received            GET  /api/transactions/received  en çok işlem alan satıcı
+  swap_offers_sent    GET  /api/swap/offers/sent       en çok teklif gönderen kullanıcı
+  rent                POST /api/transactions/rent      farklı ilanlara, çakışmayan gelecek tarihler
+
+Endpoint başına raporlanan değerler:
+  p50 / p95 / p99 gecikme (ms), istek başına sorgu sayısı ve DB süresi
+  (app/query_budget.py sayaçları), sorgu bütçesi / N+1 ihlalleri ve
+  tracemalloc ile ayrı bir turda ölçülen istek başına en yüksek bellek (KiB).
+
+Sonuçlar JSON olarak yazılır (commit, veritabanı ve hacimlerle birlikte);
+--compare ile önceki bir sonuç dosyasına göre farklar basılır, --fail-over
+verilirse p95'i bu yüzdeden fazla kötüleşen endpoint'ler çıkış kodunu 1 yapar.
+
+Kullanım:
+    python -m benchmarks.endpoints --users 2000 --products 20000 --transactions 50000
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.endpoints \\
+        --users 100000 --products 1000000 --transactions 5000000 --offers 500000
+    python -m benchmarks.endpoints --compare benchmarks/results/endpoints-abc1234.json --fail-over 20
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import db, seeding
+from app.models import Listing, Transaction, SwapOffer, ListingType
+from app.query_budget import query_monitor
+from benchmarks.common import make_app, auth_header, percentile
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+# --- Senaryolar: her biri (app) -> istek üreten fonksiyon döner ---
+
+def listings_feed(app):
+    client = app.test_client()
+    state = {'after': None}
+
+    def call(_):
+        path = '/api/listings/' + (f'?after={state["after"]}' if state['after'] else '')
+        response = client.get(path)
+        # Akışın sonuna gelince başa dön
+        state['after'] = response.get_json().get('next_cursor')
+        return response
+    return call
+
+
+def listings_faceted(app):
+    client = app.test_client()
+
+    # Kenar çubuğundan gelen tipik istek: tür + kategori + fiyat aralığı, fiyata göre, facet'lerle
+    def call(index):
+        category = seeding.CATEGORIES[index % len(seeding.CATEGORIES)]
+        return client.get(f'/api/listings/?listing_type=sale&category={category}'
+                          f'&min_price=50&max_price=5000&sort=price_asc&facets=1')
+    return call
+
+
+def _busiest(app, column, where=()):
+    with app.app_context():
+        return db.session.execute(
+            select(column).where(*where).group_by(column).order_by(func.count().desc(), column).limit(1)
+        ).scalar()
+
+
+def received(app):
+    client = app.test_client()
+    seller_id = _busiest(app, Listing.lister_id, [Listing.id == Transaction.listing_id])
+    headers = auth_header(app, seller_id)
+    return lambda _: client.get('/api/transactions/received', headers=headers)
+
+
+def swap_offers_sent(app):
+    client = app.test_client()
+    headers = auth_header(app, _busiest(app, SwapOffer.offerer_id))
+    return lambda _: client.get('/api/swap/offers/sent', headers=headers)
+
+
+def rent(app):
+    client = app.test_client()
+    with app.app_context():
+        rentals = db.session.execute(
+            select(Listing.id, Listing.lister_id)
+            .where(Listing.listing_type == ListingType.RENT, Listing.is_active.is_(True))
+            .order_by(Listing.id).limit(1000)
+        ).all()
+    # Tohumlanan kiralamalar en fazla birkaç yıl ileriye uzanır; onların çok ötesi
+    base = datetime.utcnow().date() + timedelta(days=3650)
+    headers = {}
+
+    def call(index):
+        listing_id, lister_id = rentals[index % len(rentals)]
+        renter_id = 1 if lister_id != 1 else 2
+        if renter_id not in headers:
+            headers[renter_id] = auth_header(app, renter_id)
+        start = base + timedelta(days=3 * (index // len(rentals)))
+        return client.post('/api/transactions/rent', headers=headers[renter_id], json={
+            'listing_id': listing_id,
+            'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=2)).isoformat()
+        })
+    return call
+
+
+SCENARIOS = {
+    'listings_feed': listings_feed,
+    'listings_faceted': listings_faceted,
+    'received': received,
+    'swap_offers_sent': swap_offers_sent,
+    'rent': rent
+}
+
+
+# --- Ölçüm ---
+
+def measure(app, make_call, args):
+    call = make_call(app)
+    for index in range(args.warmup):
+        call(index)
+
+    query_monitor.stats.clear()
+    latencies, statuses = [], {}
+    for index in range(args.warmup, args.warmup + args.requests):
+        started = time.perf_counter()
+        response = call(index)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    queries = next(iter(query_monitor.stats.as_dict().values()), {})
+
+    # Bellek ayrı turda: tracemalloc gecikmeyi bozmasın
+    peaks = []
+    tracemalloc.start()
+    for index in range(args.warmup + args.requests, args.warmup + args.requests + args.memory_requests):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call(index)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        'requests': args.requests,
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'queries_per_request': queries.get('avg_queries'),
+        'max_queries': queries.get('max_queries'),
+        'db_ms_per_request': round(queries['db_time_ms'] / queries['requests'], 3) if queries else None,
+        'budget_violations': queries.get('violations'),
+        'peak_memory_kib': round(max(peaks) / 1024, 1) if peaks else None
+    }
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, bool(dirty)
+
+
+def print_results(results):
+    print(f'{"endpoint":18} {"p50":>9} {"p95":>9} {"p99":>9} {"sorgu":>7} {"db ms":>8} {"ihlal":>6} {"bellek":>10}')
+    for name, row in results['endpoints'].items():
+        print(f'{name:18} {row["p50_ms"]:8.2f}ms {row["p95_ms"]:8.2f}ms {row["p99_ms"]:8.2f}ms '
+              f'{row["queries_per_request"] or 0:7.1f} {row["db_ms_per_request"] or 0:8.2f} '
+              f'{row["budget_violations"] or 0:6} {row["peak_memory_kib"] or 0:8.1f}KiB  {row["status_codes"]}')
+
+
+def compare(results, baseline_path, fail_over):
+    """Önceki sonuç dosyasına göre farkları basar; kötüleşen endpoint adlarını döner."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f'\n{baseline_path} ({baseline["meta"]["commit"]}) ile karşılaştırma:')
+    if baseline['meta']['volumes'] != results['meta']['volumes'] or \
+            baseline['meta']['dialect'] != results['meta']['dialect']:
+        print('  UYARI: veri hacimleri veya veritabanı farklı; sonuçlar doğrudan karşılaştırılamaz.')
+
+    regressed = []
+    for name, row in results['endpoints'].items():
+        old = baseline['endpoints'].get(name)
+        if old is None:
+            print(f'  {name:18} (önceki sonuçta yok)')
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request', 'peak_memory_kib'):
+            if old.get(key) and row.get(key) is not None:
+                changes.append(f'{key}={(row[key] - old[key]) / old[key] * 100:+.1f}%')
+        print(f'  {name:18} ' + ' '.join(changes))
+        if fail_over is not None and old.get('p95_ms') and \
+                (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 > fail_over:
+            regressed.append(name)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=20000, help='ürün sayısı (her ürünün bir ilanı olur)')
+    parser.add_argument('--transactions', type=int, default=50000)
+    parser.add_argument('--offers', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200, help='endpoint başına ölçülen istek')
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--memory-requests', type=int, default=20, help='bellek turundaki istek sayısı')
+    parser.add_argument('--endpoints', default=','.join(SCENARIOS))
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/endpoints-<commit>.json)')
+    parser.add_argument('--compare', help='karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--fail-over', type=float, help='p95 bu yüzdeden fazla kötüleşirse çıkış kodu 1')
+    args = parser.parse_args(argv)
+
+    names = [name for name in args.endpoints.split(',') if name]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'bilinmeyen endpoint(ler): {", ".join(sorted(unknown))}')
+
+    app = make_app()
+    # İhlaller sayılıyor; her istek için log basılmasın
+    app.logger.setLevel(logging.ERROR)
+    app.config['QUERY_BUDGET_MODE'] = 'warn'
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        started = time.perf_counter()
+        volumes = seeding.seed(args.users, args.products, args.transactions, args.offers,
+                                seed=args.seed, rebuild_analytics=False)
+        seed_seconds = time.perf_counter() - started
+    print(f'Veri ({dialect}): ' + ', '.join(f'{name}={count}' for name, count in volumes.items())
+          + f' — {seed_seconds:.1f}s')
+
+    commit, dirty = git_revision()
+    results = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': sys.version.split()[0],
+            'dialect': dialect,
+            'volumes': volumes,
+            'seed': args.seed,
+            'seed_seconds': round(seed_seconds, 2),
+            'requests': args.requests,
+            'warmup': args.warmup
+        },
+        'endpoints': {name: measure(app, SCENARIOS[name], args) for name in names}
+    }
+    print_results(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f'endpoints-{commit}{"-dirty" if dirty else ""}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f'\nSonuçlar: {output}')
+
+    if args.compare:
+        regressed = compare(results, args.compare, args.fail_over)
+        if regressed:
+            print(f'p95 %{args.fail_over:g} üzerinde kötüleşti: {", ".join(regressed)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# /benchmarks/json_serialization.py
+
+"""
+10k ilan sözlüğünün JSON'a serileştirilmesini karşılaştırır:
+
+  eski yol : endpoint'te float(...) / .value ile elle dönüşüm + Flask'ın
+             standart DefaultJSONProvider'ı (datetime -> HTTP tarih metni)
+  yeni yol : ham Decimal/datetime/Enum değerleri + FastJSONProvider
+             (orjson varsa orjson, yoksa standart kütüphane)
+
+Kullanım:
+    python -m benchmarks.json_serialization --count 10000 --repeat 10
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import FastJSONProvider
+from app.models import ListingType
+
+
+def build_raw_listings(count):
+    """Veritabanından gelmiş gibi ham değerlerle ilan sözlükleri."""
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    types = [ListingType.SALE, ListingType.RENT, ListingType.SWAP]
+    listings = []
+    for i in range(count):
+        listing_type = types[i % 3]
+        listing = {
+            'listing_id': i,
+            'listing_type': listing_type,
+            'is_active': True,
+            'created_at': base + timedelta(minutes=i),
+            'product_details': {
+                'product_id': i,
+                'title': f'Ürün {i}',
+                'description': 'Az kullanılmış, kutusuyla birlikte.',
+                'category': 'elektronik',
+                'image_url': None
+            },
+            'lister_details': {'username': f'kullanici{i % 500}'}
+        }
+        if listing_type == ListingType.SALE:
+            listing['price'] = Decimal('1499.90')
+        elif listing_type == ListingType.RENT:
+            listing['rental_price_per_day'] = Decimal('75.00')
+        else:
+            listing['swap_preference'] = 'Oyun konsolu'
+        listings.append(listing)
+    return listings
+
+
+def legacy_convert(listings):
+    """Eski endpoint'lerdeki elle dönüşüm (float(...) ve .value)."""
+    output = []
+    for listing in listings:
+        data = dict(listing)
+        data['listing_type'] = listing['listing_type'].value
+        if 'price' in data:
+            data['price'] = float(data['price'])
+        if 'rental_price_per_day' in data:
+            data['rental_price_per_day'] = float(data['rental_price_per_day'])
+        output.append(data)
+    return output
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    legacy_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    raw = build_raw_listings(args.count)
+
+    with app.app_context():
+        legacy = best_of(args.repeat, lambda: legacy_provider.response({'listings': legacy_convert(raw)}))
+        fast = best_of(args.repeat, lambda: fast_provider.response({'listings': raw}))
+
+        fast_provider.use_orjson = False
+        fast_stdlib = best_of(args.repeat, lambda: fast_provider.response({'listings': raw}))
+
+    print(f'{args.count} ilan, en iyi {args.repeat} tekrar:')
+    print(f'  eski yol (elle dönüşüm + DefaultJSONProvider): {legacy * 1000:8.1f} ms')
+    print(f'  FastJSONProvider (stdlib)                    : {fast_stdlib * 1000:8.1f} ms')
+    if FastJSONProvider.use_orjson:
+        print(f'  FastJSONProvider (orjson)                    : {fast * 1000:8.1f} ms '
+              f'({legacy / fast:.1f}x)')
+    else:
+        print('  orjson kurulu değil; hızlı yol ölçülemedi.')
+
+
+if __name__ == '__main__':
+    main()
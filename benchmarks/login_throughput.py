@@ -0,0 +1,121 @@
+# /benchmarks/login_throughput.py
+
+"""
+Giriş (login) fırtınası: farklı bcrypt maliyet faktörlerinde eşzamanlı
+POST /api/auth/login throughput'u ve gecikmesi ölçülür. Aynı anda ayrı bir
+thread ucuz bir okuma endpoint'ini (GET /api/listings/) çağırır; bcrypt
+işlerinin okuma isteklerini ne kadar aç bıraktığı da raporlanır.
+
+Her maliyet için hem 'pool' (sınırlı hash havuzu) hem 'inline' (istek
+thread'inde bcrypt) arka uçları çalıştırılır.
+
+Kullanım:
+    python -m benchmarks.login_throughput --costs 4,8,10,12 --threads 32 --iterations 5
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+
+from app import db
+from app.hashing import password_hasher
+from app.models import User
+from benchmarks.common import BenchmarkConfig, make_app, run_threads, percentile
+
+PASSWORD = 'dogru-sifre-123'
+
+
+def seed(app, user_count):
+    """Kullanıcıları, uygulamanın maliyet faktörüyle hash'lenmiş tek bir şifreyle oluşturur."""
+    with app.app_context():
+        password_hash = password_hasher.hash(PASSWORD)
+        db.session.add_all([
+            User(username=f'user{i}', email=f'user{i}@example.com', password_hash=password_hash)
+            for i in range(user_count)
+        ])
+        db.session.commit()
+
+
+def run_storm(cost, backend, args):
+    config = type('LoginBenchConfig', (BenchmarkConfig,), {
+        'BCRYPT_LOG_ROUNDS': cost,
+        'PASSWORD_HASH_BACKEND': backend,
+        'PASSWORD_HASH_WORKERS': args.workers or None,
+        'PASSWORD_HASH_MAX_QUEUE': args.threads,
+        'PASSWORD_HASH_QUEUE_TIMEOUT': 60
+    })
+    app = make_app(config)
+    seed(app, args.users)
+
+    counts = Counter()
+    latencies = []
+    read_latencies = []
+    lock = threading.Lock()
+    storm_done = threading.Event()
+
+    def reader():
+        client = app.test_client()
+        while not storm_done.is_set():
+            started = time.perf_counter()
+            client.get('/api/listings/')
+            read_latencies.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+    def worker(index):
+        rng = random.Random(args.seed + index)
+        client = app.test_client()
+        local_counts = Counter()
+        local_latencies = []
+        for _ in range(args.iterations):
+            # Her 5 denemeden biri var olmayan kullanıcı adıyla
+            if rng.random() < 0.2:
+                username = f'yok{rng.randrange(10 ** 6)}'
+            else:
+                username = f'user{rng.randrange(args.users)}'
+            started = time.perf_counter()
+            response = client.post('/api/auth/login', json={'username': username, 'password': PASSWORD})
+            local_latencies.append(time.perf_counter() - started)
+            local_counts[response.status_code] += 1
+        with lock:
+            counts.update(local_counts)
+            latencies.extend(local_latencies)
+
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    elapsed = run_threads(args.threads, worker)
+    storm_done.set()
+    reader_thread.join()
+    password_hasher.shutdown()
+
+    total = sum(counts.values())
+    print(f'maliyet={cost:<2} arka uç={backend:<6} istek={total} süre={elapsed:.2f}s '
+          f'throughput={total / elapsed:.1f} login/s '
+          f'(200={counts[200]} 401={counts[401]} 503={counts[503]})')
+    print(f'    login  p50={percentile(latencies, 50) * 1000:.1f}ms '
+          f'p95={percentile(latencies, 95) * 1000:.1f}ms '
+          f'p99={percentile(latencies, 99) * 1000:.1f}ms')
+    print(f'    okuma  p50={percentile(read_latencies, 50) * 1000:.1f}ms '
+          f'p95={percentile(read_latencies, 95) * 1000:.1f}ms '
+          f'p99={percentile(read_latencies, 99) * 1000:.1f}ms (n={len(read_latencies)})')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--costs', default='4,8,10,12', help='virgülle ayrılmış bcrypt maliyetleri')
+    parser.add_argument('--backends', default='pool,inline')
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--iterations', type=int, default=5, help='thread başına login sayısı')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=0, help='hash havuzu boyutu (0: CPU sayısı)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    for cost in [int(c) for c in args.costs.split(',')]:
+        for backend in args.backends.split(','):
+            run_storm(cost, backend, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# /benchmarks/matchmaking.py
+
+"""
+Takas eşleştirme (app/matchmaking.py): indeks kurulumu, GET /api/swap/matches ve artımlı güncelleme.
+
+Veritabanı app/seeding.py ile doldurulur; ilanların üçte biri takas ilanıdır
+ve her biri rastgele bir kategori ister. Ürün tokenları kategoriden gelir, yani
+8 kategorili yoğun bir istek grafiği: her ilanın binlerce komşusu vardır
+(arama için en kötü durum). Ölçülenler:
+
+  build     indeksin sıfırdan kurulumu (tek sorgu) ve Python tarafı bellek
+  matches   --requests farklı kullanıcı için GET /api/swap/matches p50 / p95
+  refresh   --changes takas ilanının tercihi değiştikten sonraki artımlı güncelleme
+
+Kullanım:
+    python -m benchmarks.matchmaking
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.matchmaking --users 50000 --products 900000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import select, func
+
+from app import db, seeding
+from app.matchmaking import swap_matcher
+from app.models import Listing, ListingType
+from benchmarks.common import BenchmarkConfig, make_app, auth_header, percentile
+
+
+class MatchConfig(BenchmarkConfig):
+    QUERY_BUDGET_MODE = 'off'
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+def measure_build(app):
+    with app.app_context():
+        swap_matcher.rebuild()
+        started = time.perf_counter()
+        swap_matcher.refresh()
+        elapsed = time.perf_counter() - started
+        # Bellek ayrı bir kurulumda ölçülür; tracemalloc süreyi birkaç kat uzatır
+        swap_matcher.rebuild()
+        tracemalloc.start()
+        swap_matcher.refresh()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, memory
+
+
+def measure_matches(app, client, user_ids):
+    latencies, found = [], {'mutual': 0, 'cycles': 0}
+    for user_id in user_ids:
+        headers = auth_header(app, user_id)
+        started = time.perf_counter()
+        response = client.get('/api/swap/matches', headers=headers)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise SystemExit(f'GET /api/swap/matches -> {response.status_code}')
+        for match in response.get_json()['matches']:
+            found['mutual'] += len(match['mutual'])
+            found['cycles'] += len(match['cycles'])
+    return latencies, found
+
+
+def measure_refresh(app, changes, rng):
+    with app.app_context():
+        ids = db.session.execute(
+            select(Listing.id).where(Listing.listing_type == ListingType.SWAP, Listing.is_active == True)
+        ).scalars().all()
+        for listing in db.session.execute(select(Listing).where(
+                Listing.id.in_(rng.sample(ids, min(changes, len(ids)))))).scalars():
+            listing.swap_preference = rng.choice(seeding.CATEGORIES)
+        db.session.commit()
+        started = time.perf_counter()
+        swap_matcher.refresh()
+        return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--products', type=int, default=90000, help='ilan sayısı (1/3 takas)')
+    parser.add_argument('--requests', type=int, default=200, help='ölçülecek kullanıcı sayısı')
+    parser.add_argument('--changes', type=int, default=100, help='artımlı güncelleme için değişen ilan')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    app = make_app(MatchConfig)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        seeding.seed(args.users, args.products, 0, 0, seed=args.seed, rebuild_analytics=False)
+        swaps = db.session.execute(select(func.count()).where(
+            Listing.listing_type == ListingType.SWAP, Listing.is_active == True)).scalar()
+        user_ids = db.session.execute(
+            select(Listing.lister_id).where(Listing.listing_type == ListingType.SWAP).distinct()
+        ).scalars().all()
+    print(f'Veri ({dialect}): {args.products} ilan, {swaps} aktif takas ilanı, {args.users} kullanıcı')
+
+    elapsed, memory = measure_build(app)
+    status = swap_matcher.status()
+    print(f'build     {_ms(elapsed):9.1f}ms  {memory / 2**20:7.1f} MiB  '
+          f'({status["listings"]} ilan, {status["supply_tokens"]} ürün tokenı)')
+
+    client = app.test_client()
+    latencies, found = measure_matches(app, client, rng.sample(user_ids, min(args.requests, len(user_ids))))
+    print(f'matches   p50 {_ms(percentile(latencies, 50)):7.2f}ms  p95 {_ms(percentile(latencies, 95)):7.2f}ms  '
+          f'({found["mutual"]} karşılıklı, {found["cycles"]} döngü)')
+
+    elapsed = measure_refresh(app, args.changes, rng)
+    print(f'refresh   {_ms(elapsed):9.1f}ms  ({swap_matcher.last_refresh["rows"]} satır)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# /benchmarks/rent_contention.py
+
+"""
+Tek bir kiralama ilanına çok sayıda eşzamanlı kiralama + onay isteği gönderir
+ve sonunda çakışan iki onaylı (COMPLETED) kiralama olmadığını doğrular.
+
+Her işçi thread'i döngüde:
+  1. Rastgele tarihler için POST /api/transactions/rent (kiracı olarak)
+  2. Talep oluştuysa hemen POST /api/transactions/rent/respond/<id> (ilan sahibi olarak)
+
+Kullanım:
+    python -m benchmarks.rent_contention --threads 16 --iterations 50
+"""
+
+import argparse
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from threading import Lock
+
+from sqlalchemy import text
+
+from app import db
+from app.models import User, Product, Listing, ListingType
+from benchmarks.common import make_app, auth_header, run_threads
+
+DOUBLE_BOOKING_SQL = text(
+    "SELECT COUNT(*) FROM transactions a JOIN transactions b "
+    "ON a.listing_id = b.listing_id AND a.id < b.id "
+    "AND a.start_date < b.end_date AND a.end_date > b.start_date "
+    "WHERE a.transaction_type = 'RENT' AND b.transaction_type = 'RENT' "
+    "AND a.status = 'COMPLETED' AND b.status = 'COMPLETED'"
+)
+
+
+def seed(app, renter_count):
+    with app.app_context():
+        owner = User(username='owner', email='owner@example.com', password_hash='x')
+        renters = [User(username=f'renter{i}', email=f'renter{i}@example.com', password_hash='x')
+                   for i in range(renter_count)]
+        db.session.add_all([owner] + renters)
+        db.session.flush()
+
+        product = Product(title='Kamp çadırı', category='kamp', owner_id=owner.id)
+        db.session.add(product)
+        db.session.flush()
+
+        listing = Listing(product_id=product.id, lister_id=owner.id,
+                          listing_type=ListingType.RENT, rental_price_per_day=50)
+        db.session.add(listing)
+        db.session.commit()
+        return owner.id, [r.id for r in renters], listing.id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--iterations', type=int, default=50, help='thread başına istek sayısı')
+    parser.add_argument('--renters', type=int, default=32)
+    parser.add_argument('--horizon-days', type=int, default=60, help='tarihlerin seçildiği aralık')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    app = make_app()
+    owner_id, renter_ids, listing_id = seed(app, args.renters)
+    owner_headers = auth_header(app, owner_id)
+    renter_headers = [auth_header(app, renter_id) for renter_id in renter_ids]
+    today = datetime.utcnow().date()
+
+    counts = Counter()
+    counts_lock = Lock()
+
+    def worker(index):
+        rng = random.Random(args.seed + index)
+        client = app.test_client()
+        local = Counter()
+        for _ in range(args.iterations):
+            start = today + timedelta(days=rng.randint(1, args.horizon_days))
+            end = start + timedelta(days=rng.randint(1, 5))
+            response = client.post('/api/transactions/rent', headers=rng.choice(renter_headers), json={
+                'listing_id': listing_id,
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat()
+            })
+            local[f'rent_{response.status_code}'] += 1
+            if response.status_code != 201:
+                continue
+
+            transaction_id = response.get_json()['transaction_id']
+            response = client.post(f'/api/transactions/rent/respond/{transaction_id}',
+                                   headers=owner_headers, json={'action': 'accept'})
+            local[f'accept_{response.status_code}'] += 1
+        with counts_lock:
+            counts.update(local)
+
+    elapsed = run_threads(args.threads, worker)
+
+    with app.app_context():
+        double_bookings = db.session.execute(DOUBLE_BOOKING_SQL).scalar()
+
+    total_requests = sum(counts.values())
+    print(f'thread={args.threads} istek={total_requests} süre={elapsed:.2f}s '
+          f'throughput={total_requests / elapsed:.1f} istek/s')
+    for key in sorted(counts):
+        print(f'  {key}: {counts[key]}')
+    print(f'çakışan onaylı kiralama çifti: {double_bookings}')
+
+    return 1 if double_bookings else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
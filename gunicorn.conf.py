@@ -0,0 +1,44 @@
+# /gunicorn.conf.py
+
+"""
+gunicorn ayarları (gunicorn -c gunicorn.conf.py wsgi:app).
+
+Ortam değişkenleri:
+  BIND                        dinlenecek adres (varsayılan 0.0.0.0:8000)
+  WEB_CONCURRENCY             worker süreci sayısı (varsayılan 2 x CPU + 1)
+  WEB_THREADS                 worker başına thread (varsayılan 4; >1 ise gthread worker).
+                              DB_POOL_SIZE en az bu kadar olmalıdır.
+  WEB_MAX_REQUESTS            worker bu kadar istekten sonra yeniden başlatılır (0: hiç)
+  WEB_MAX_REQUESTS_JITTER     yeniden başlatmalar aynı anda olmasın diye rastgele ek (0..N)
+  WEB_TIMEOUT                 cevap vermeyen worker'ın öldürülme süresi, saniye
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 4))
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = 5
+
+# Worker geri dönüşümü: yavaş bellek büyümesine (parçalanma, sızıntı) karşı
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 1000))
+
+# wsgi.py fork'tan önce bir kez yüklenir: import, create_app ve warmup ana süreçte
+preload_app = True
+
+
+def when_ready(server):
+    from app.warmup import startup_report
+    server.log.info('Uygulama hazır: %s ms, warmup: %s', startup_report.app_ready_ms, startup_report.warmup)
+
+
+def post_fork(server, worker):
+    # Ana süreçten devralınan bağlantı havuzları bırakılır, worker'ınkiler önceden açılır
+    from wsgi import app
+    from app.warmup import warm_worker
+    timings = warm_worker(app)
+    server.log.info('Worker %s ısıtıldı: %s', worker.pid, timings)
@@ -5,13 +5,16 @@ from flask import current_app
 
 from alembic import context
 
+from app.search import FTS_TABLE
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# This line sets up loggers basically. Uygulama içinden (flask db upgrade,
+# testler) çalışırken mevcut uygulama logger'ları kapatılmaz.
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 logger = logging.getLogger('alembic.env')
 
 
@@ -51,6 +54,23 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Autogenerate'in modelde olmayan arama yapılarını düşürmeye/eklemeye
+    çalışmasını önler (bkz. app/search.py): SQLite FTS5 sanal tablosu ve
+    gölge tabloları (products_fts, products_fts_data, ...) ile yalnızca
+    PostgreSQL'de bulunan products.search_vector kolonu ve indeksi.
+    """
+    if type_ == 'table' and name.startswith(FTS_TABLE):
+        return False
+    if get_engine().dialect.name != 'postgresql':
+        if type_ == 'column' and name == 'search_vector':
+            return False
+        if type_ == 'index' and name == 'ix_products_search_vector':
+            return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +85,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +114,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,53 @@
+"""Sicak sorgu indeksleri
+
+Revision ID: 1cb25f8d57d4
+Revises: 3f94c01b91bc
+Create Date: 2026-10-16 11:02:17.884310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1cb25f8d57d4'
+down_revision = '3f94c01b91bc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Herkese açık akış (GET /api/listings): WHERE is_active ORDER BY created_at DESC, id DESC
+    op.create_index('ix_listings_active_created_at', 'listings',
+                    [sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+                    postgresql_where=sa.text('is_active'),
+                    sqlite_where=sa.text('is_active = 1'))
+    # my_listings ve satıcı paneli: WHERE lister_id = ? ORDER BY created_at
+    op.create_index('ix_listings_lister_id_created_at', 'listings',
+                    ['lister_id', 'created_at'], unique=False)
+
+    # rent_listing tarih çakışması: listing_id, transaction_type, start_date, end_date
+    op.create_index('ix_transactions_rent_overlap', 'transactions',
+                    ['listing_id', 'transaction_type', 'start_date', 'end_date'], unique=False)
+    # my_purchases / my_rentals: WHERE buyer_or_renter_id = ? AND transaction_type = ?
+    op.create_index('ix_transactions_buyer_type_created_at', 'transactions',
+                    ['buyer_or_renter_id', 'transaction_type', 'created_at'], unique=False)
+
+    # offers/sent ve offers/received
+    op.create_index('ix_swap_offers_offerer_id_created_at', 'swap_offers',
+                    ['offerer_id', 'created_at'], unique=False)
+    op.create_index('ix_swap_offers_target_listing_id_status', 'swap_offers',
+                    ['target_listing_id', 'status'], unique=False)
+
+    # GET /api/products (kullanıcının ürünleri)
+    op.create_index('ix_products_owner_id', 'products', ['owner_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_products_owner_id', table_name='products')
+    op.drop_index('ix_swap_offers_target_listing_id_status', table_name='swap_offers')
+    op.drop_index('ix_swap_offers_offerer_id_created_at', table_name='swap_offers')
+    op.drop_index('ix_transactions_buyer_type_created_at', table_name='transactions')
+    op.drop_index('ix_transactions_rent_overlap', table_name='transactions')
+    op.drop_index('ix_listings_lister_id_created_at', table_name='listings')
+    op.drop_index('ix_listings_active_created_at', table_name='listings')
@@ -0,0 +1,56 @@
+"""Urun tam metin arama indeksi
+
+Revision ID: 3f94c01b91bc
+Revises: 25851f5863b0
+Create Date: 2026-10-16 10:12:41.503128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from flask import current_app
+
+from app.search import DEFAULT_TEXT_CONFIG, FTS_CREATE_SQL, FTS_TABLE
+
+
+# revision identifiers, used by Alembic.
+revision = '3f94c01b91bc'
+down_revision = '25851f5863b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # search_vector yalnızca PostgreSQL'de; SQLite aramayı products_fts üzerinden yapar
+    if bind.dialect.name == 'postgresql':
+        op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        # Mevcut ürünleri indeksle (başlık A, kategori B, açıklama C ağırlıklı);
+        # metin yapılandırması uygulamayla aynı (Config.SEARCH_TEXT_CONFIG)
+        op.execute(sa.text(
+            "UPDATE products SET search_vector = "
+            "setweight(to_tsvector(CAST(:config AS regconfig), coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector(CAST(:config AS regconfig), coalesce(category, '')), 'B') || "
+            "setweight(to_tsvector(CAST(:config AS regconfig), coalesce(description, '')), 'C')"
+        ).bindparams(config=current_app.config.get('SEARCH_TEXT_CONFIG', DEFAULT_TEXT_CONFIG)))
+        op.create_index('ix_products_search_vector', 'products', ['search_vector'],
+                        unique=False, postgresql_using='gin')
+
+    if bind.dialect.name == 'sqlite':
+        op.execute(FTS_CREATE_SQL)
+        op.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, category) "
+            "SELECT id, title, coalesce(description, ''), coalesce(category, '') FROM products"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_products_search_vector', table_name='products')
+        op.drop_column('products', 'search_vector')
@@ -0,0 +1,33 @@
+"""Artimli disa aktarim icin updated_at
+
+Revision ID: 544af50105b3
+Revises: ffe7a1e75268
+Create Date: 2026-10-16 13:20:08.411907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '544af50105b3'
+down_revision = 'ffe7a1e75268'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('transactions', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE transactions SET updated_at = created_at')
+
+    op.create_index('ix_transactions_updated_at', 'transactions', ['updated_at'], unique=False)
+    op.create_index('ix_listings_updated_at', 'listings', ['updated_at'], unique=False)
+    op.create_index('ix_products_updated_at', 'products', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_products_updated_at', table_name='products')
+    op.drop_index('ix_listings_updated_at', table_name='listings')
+    op.drop_index('ix_transactions_updated_at', table_name='transactions')
+
+    op.drop_column('transactions', 'updated_at')
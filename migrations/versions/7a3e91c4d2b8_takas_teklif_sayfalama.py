@@ -0,0 +1,26 @@
+"""Takas teklif sayfalama indeksi
+
+Revision ID: 7a3e91c4d2b8
+Revises: cf205faf4a1c
+Create Date: 2026-10-16 22:10:34.512907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e91c4d2b8'
+down_revision = 'cf205faf4a1c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # offers/received/<id>: WHERE target_listing_id = ? ORDER BY created_at DESC, id DESC (keyset)
+    op.create_index('ix_swap_offers_target_listing_id_created_at', 'swap_offers',
+                    ['target_listing_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_swap_offers_target_listing_id_created_at', table_name='swap_offers')
@@ -0,0 +1,44 @@
+"""Akis filtre ve facet indeksleri
+
+Revision ID: b4d19e6a07c3
+Revises: 7a3e91c4d2b8
+Create Date: 2026-10-16 23:05:41.208316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d19e6a07c3'
+down_revision = '7a3e91c4d2b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /api/listings?listing_type=...: WHERE is_active AND listing_type = ? ORDER BY created_at DESC, id DESC
+    op.create_index('ix_listings_active_type_created_at', 'listings',
+                    ['listing_type', sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+                    postgresql_where=sa.text('is_active'),
+                    sqlite_where=sa.text('is_active = 1'))
+    # ?sort=price_asc|price_desc ve ?min_price/?max_price: liste fiyatı (satış fiyatı veya günlük kira).
+    # listing_type ve product_id: fiyat aralıklı facet GROUP BY'ı tabloya gitmeden okunur
+    op.create_index('ix_listings_active_list_price', 'listings',
+                    [sa.text('coalesce(price, rental_price_per_day)'), 'id', 'listing_type', 'product_id'],
+                    unique=False,
+                    postgresql_where=sa.text('is_active'),
+                    sqlite_where=sa.text('is_active = 1'))
+    op.create_index('ix_listings_active_type_list_price', 'listings',
+                    ['listing_type', sa.text('coalesce(price, rental_price_per_day)'), 'id'], unique=False,
+                    postgresql_where=sa.text('is_active'),
+                    sqlite_where=sa.text('is_active = 1'))
+    # ?category=... ve kategori facet'leri
+    op.create_index('ix_products_category_id', 'products', ['category', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_products_category_id', table_name='products')
+    op.drop_index('ix_listings_active_type_list_price', table_name='listings')
+    op.drop_index('ix_listings_active_list_price', table_name='listings')
+    op.drop_index('ix_listings_active_type_created_at', table_name='listings')
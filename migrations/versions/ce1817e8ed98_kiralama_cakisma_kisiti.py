@@ -0,0 +1,61 @@
+"""Kiralama cakisma kisiti
+
+Revision ID: ce1817e8ed98
+Revises: 1cb25f8d57d4
+Create Date: 2026-10-16 11:48:03.127754
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce1817e8ed98'
+down_revision = '1cb25f8d57d4'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT_NAME = 'ex_transactions_rental_no_overlap'
+
+OVERLAP_WHEN = (
+    "NEW.transaction_type = 'RENT' AND NEW.status = 'COMPLETED' AND EXISTS ("
+    "SELECT 1 FROM transactions t WHERE t.listing_id = NEW.listing_id "
+    "AND t.id IS NOT NEW.id AND t.transaction_type = 'RENT' AND t.status = 'COMPLETED' "
+    "AND t.start_date < NEW.end_date AND t.end_date > NEW.start_date)"
+)
+
+
+def upgrade():
+    # Not: Mevcut veride çakışan onaylı kiralamalar varsa kısıt eklenemez;
+    # önce bunların elle temizlenmesi gerekir.
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        op.execute(
+            f"ALTER TABLE transactions ADD CONSTRAINT {CONSTRAINT_NAME} "
+            "EXCLUDE USING gist (listing_id WITH =, daterange(start_date, end_date, '[)') WITH &&) "
+            "WHERE (transaction_type = 'RENT' AND status = 'COMPLETED')"
+        )
+    elif bind.dialect.name == 'sqlite':
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {CONSTRAINT_NAME}_insert BEFORE INSERT ON transactions "
+            f"WHEN {OVERLAP_WHEN} "
+            f"BEGIN SELECT RAISE(ABORT, '{CONSTRAINT_NAME}'); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {CONSTRAINT_NAME}_update "
+            "BEFORE UPDATE OF status, start_date, end_date, listing_id ON transactions "
+            f"WHEN {OVERLAP_WHEN} "
+            f"BEGIN SELECT RAISE(ABORT, '{CONSTRAINT_NAME}'); END"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(f'ALTER TABLE transactions DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}')
+    elif bind.dialect.name == 'sqlite':
+        op.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT_NAME}_update')
+        op.execute(f'DROP TRIGGER IF EXISTS {CONSTRAINT_NAME}_insert')
@@ -0,0 +1,54 @@
+"""Satici analitigi ozet tablolari
+
+Mevcut veriler icin tablolar bos olusturulur; doldurmak icin:
+    flask rebuild-analytics
+
+Revision ID: cf205faf4a1c
+Revises: 544af50105b3
+Create Date: 2026-10-16 14:05:41.118263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cf205faf4a1c'
+down_revision = '544af50105b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seller_daily_stats',
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('sale_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sale_revenue', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('rental_request_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rental_completed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rental_cancelled_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rental_revenue', sa.Numeric(precision=12, scale=2), server_default='0', nullable=False),
+    sa.Column('swap_offer_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('swap_accepted_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('swap_rejected_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('seller_id', 'day')
+    )
+    op.create_table('listing_daily_occupancy',
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('booked_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], ),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('listing_id', 'day')
+    )
+    op.create_index('ix_listing_daily_occupancy_seller_id_day', 'listing_daily_occupancy',
+                    ['seller_id', 'day'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_listing_daily_occupancy_seller_id_day', table_name='listing_daily_occupancy')
+    op.drop_table('listing_daily_occupancy')
+    op.drop_table('seller_daily_stats')
@@ -0,0 +1,39 @@
+"""Surum takibi ve ETag sayaci
+
+Revision ID: ffe7a1e75268
+Revises: ce1817e8ed98
+Create Date: 2026-10-16 12:31:55.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ffe7a1e75268'
+down_revision = 'ce1817e8ed98'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ('products', 'listings'):
+        op.add_column(table_name, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.add_column(table_name, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+        # Mevcut satırlar için updated_at = created_at
+        op.execute(f'UPDATE {table_name} SET updated_at = created_at')
+
+    collection_versions = op.create_table('collection_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(collection_versions, [{'name': 'listings', 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('collection_versions')
+
+    for table_name in ('listings', 'products'):
+        op.drop_column(table_name, 'version')
+        op.drop_column(table_name, 'updated_at')
@@ -3,6 +3,8 @@
 from app import create_app, db
 # Modellerimizi migrate komutunun görebilmesi için buraya import ediyoruz
 from app.models import User, Product, Listing, Transaction, SwapOffer
+import click
+import time
 
 app = create_app()
 
@@ -18,5 +20,64 @@ def make_shell_context():
         'SwapOffer': SwapOffer
     }
 
+
+@app.cli.command('explain-check')
+def explain_check():
+    """Sıcak endpoint sorgularını EXPLAIN eder; tam tablo taraması varsa hata verir."""
+    from app.explain_check import run_explain_check, endpoint_queries
+
+    failures = run_explain_check()
+    for name, tables in failures:
+        click.echo(f'TAM TARAMA: {name} -> {", ".join(tables)}', err=True)
+
+    if failures:
+        raise click.ClickException(f'{len(failures)} endpoint sorgusu indeks kullanmıyor.')
+    click.echo(f'{len(endpoint_queries())} endpoint sorgusunun tamamı indeks kullanıyor.')
+
+
+@app.cli.command('rebuild-analytics')
+def rebuild_analytics():
+    """Satıcı analitiği özet tablolarını transactions/swap_offers'tan yeniden hesaplar."""
+    from app.analytics import rebuild_all
+
+    stats_rows, occupancy_rows = rebuild_all()
+    click.echo(f'seller_daily_stats: {stats_rows} satır, listing_daily_occupancy: {occupancy_rows} satır.')
+
+
+@app.cli.command('seed')
+@click.option('--users', default=1000, show_default=True, type=click.IntRange(min=1))
+@click.option('--products', default=10000, show_default=True, type=click.IntRange(min=0),
+              help='Ürün sayısı; her ürünün bir ilanı olur.')
+@click.option('--transactions', default=20000, show_default=True, type=click.IntRange(min=0))
+@click.option('--offers', default=5000, show_default=True, type=click.IntRange(min=0))
+@click.option('--seed', 'random_seed', default=42, show_default=True, help='Rastgele tohum (deterministik veri).')
+@click.option('--batch-size', default=10000, show_default=True, type=click.IntRange(min=1))
+@click.option('--reset', is_flag=True, help='Önce mevcut kullanıcı/ürün/ilan/işlem/teklif verisini siler.')
+@click.option('--no-analytics', is_flag=True, help='Analitik özet tablolarını yeniden hesaplama.')
+def seed(users, products, transactions, offers, random_seed, batch_size, reset, no_analytics):
+    """Sentetik pazar yeri verisi yükler (PostgreSQL'de COPY, SQLite'ta executemany)."""
+    from app import seeding
+
+    if reset:
+        click.confirm(f'{db.engine.url.render_as_string(hide_password=True)} içindeki veriler silinecek. '
+                      'Devam edilsin mi?', abort=True)
+        seeding.reset()
+        db.session.commit()
+
+    def progress(table, count, seconds):
+        rate = count / seconds * 60 if seconds else 0
+        click.echo(f'{table:14} {count:>10} satır {seconds:7.1f}s ({rate:,.0f} satır/dk)')
+
+    try:
+        started = time.perf_counter()
+        counts = seeding.seed(users, products, transactions, offers, seed=random_seed,
+                              batch_size=batch_size, rebuild_analytics=not no_analytics,
+                              progress=progress)
+    except seeding.DatabaseNotEmpty as e:
+        raise click.ClickException(f'{e} Önce --reset ile boşaltın.')
+    elapsed = time.perf_counter() - started
+    click.echo(f'Toplam {sum(counts.values())} satır, {elapsed:.1f}s. '
+               f'Tüm kullanıcıların şifresi: {seeding.DEFAULT_PASSWORD}')
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
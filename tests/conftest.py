@@ -0,0 +1,120 @@
+# /tests/conftest.py
+
+"""
+İstek seviyesinde testler için ortak fixture'lar.
+
+Her test geçici bir SQLite dosyasında, şeması sıfırdan kurulmuş bir uygulama
+alır: app db.create_all ile, migrated_app Alembic migration'larıyla. Süreç
+genelindeki tekiller (entity_cache, swap_matcher) testler arasında temizlenir. Sorgu bütçesi 'raise' modundadır: bütçeyi aşan bir
+endpoint testte hata verir.
+"""
+
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from flask_jwt_extended import create_access_token
+from flask_migrate import upgrade
+
+from app import create_app, db
+from app.cache import entity_cache
+from app.config import Config
+from app.matchmaking import swap_matcher
+from app.models import User, Product, Listing, ListingType
+
+INTERNAL_TOKEN = 'test-internal-token'
+MIGRATIONS_DIR = str(Path(__file__).resolve().parent.parent / 'migrations')
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'  # fixture'da geçici dosya ile değiştirilir
+    JWT_SECRET_KEY = 'test-secret-key-test-secret-key-test'
+    BCRYPT_LOG_ROUNDS = 4
+    QUERY_BUDGET_MODE = 'raise'
+    WARMUP_ENABLED = False
+    DB_REPLICA_URLS = []
+    INTERNAL_API_TOKEN = INTERNAL_TOKEN
+
+
+@pytest.fixture
+def app(tmp_path):
+    class Config_(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "test.db"}'
+
+    app = create_app(Config_)
+    with app.app_context():
+        db.create_all()
+    entity_cache.clear()
+    swap_matcher.rebuild()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    entity_cache.clear()
+    swap_matcher.rebuild()
+
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    """app gibi, ancak şema db.create_all yerine Alembic migration'larıyla kurulur."""
+    class Config_(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "migrated.db"}'
+
+    app = create_app(Config_)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    entity_cache.clear()
+    swap_matcher.rebuild()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    entity_cache.clear()
+    swap_matcher.rebuild()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make(username):
+        with app.app_context():
+            user = User(username=username, email=f'{username}@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make
+
+
+@pytest.fixture
+def make_listing(app):
+    """Bir ürün ve ilanı birlikte oluşturur; ilan id'sini döner."""
+    def make(owner_id, listing_type=ListingType.SALE, title='Ürün', category='elektronik',
+             price=None, rental_price_per_day=None, swap_preference=None, is_active=True):
+        with app.app_context():
+            product = Product(title=title, category=category, owner_id=owner_id)
+            db.session.add(product)
+            db.session.flush()
+            if listing_type == ListingType.SALE and price is None:
+                price = Decimal('100')
+            if listing_type == ListingType.RENT and rental_price_per_day is None:
+                rental_price_per_day = Decimal('10')
+            listing = Listing(product_id=product.id, lister_id=owner_id, listing_type=listing_type,
+                              price=price, rental_price_per_day=rental_price_per_day,
+                              swap_preference=swap_preference, is_active=is_active)
+            db.session.add(listing)
+            db.session.commit()
+            return listing.id
+    return make
+
+
+@pytest.fixture
+def auth(app):
+    def headers(user_id):
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+    return headers
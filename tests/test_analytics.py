@@ -0,0 +1,54 @@
+# /tests/test_analytics.py
+
+"""Satıcı analitiği: yeniden hesaplama artımlı değerlerle aynı sonucu verir ve yazmaları bekletir."""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import analytics, db
+from app.models import SellerDailyStats, ListingDailyOccupancy, ListingType
+
+
+def _snapshot():
+    stats = db.session.execute(select(SellerDailyStats.__table__)).all()
+    occupancy = db.session.execute(select(ListingDailyOccupancy.__table__)).all()
+    return sorted(map(tuple, stats)), sorted(map(tuple, occupancy))
+
+
+def test_rebuild_matches_incremental_updates(app, client, auth, make_user, make_listing):
+    seller, buyer = make_user('satici'), make_user('alici')
+    sale = make_listing(seller)
+    rent = make_listing(seller, ListingType.RENT)
+    start = date.today() + timedelta(days=2)
+
+    assert client.post('/api/transactions/buy', json={'listing_id': sale},
+                       headers=auth(buyer)).status_code == 201
+    response = client.post('/api/transactions/rent', headers=auth(buyer), json={
+        'listing_id': rent, 'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=2)).isoformat()})
+    assert response.status_code == 201
+    assert client.post(f'/api/transactions/rent/respond/{response.get_json()["transaction_id"]}',
+                       json={'action': 'accept'}, headers=auth(seller)).status_code == 200
+
+    with app.app_context():
+        incremental = _snapshot()
+        assert incremental[0] and incremental[1]
+        assert analytics.rebuild_all() == (len(incremental[0]), len(incremental[1]))
+        assert _snapshot() == incremental
+
+
+def test_rebuild_blocks_incremental_writes_until_commit(app, make_user):
+    seller = make_user('satici')
+    with app.app_context():
+        analytics._lock_summary_tables()
+        other = sqlite3.connect(db.engine.url.database, timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                other.execute('INSERT INTO seller_daily_stats (seller_id, day) VALUES (?, ?)',
+                              (seller, date.today().isoformat()))
+        finally:
+            other.close()
+        db.session.rollback()
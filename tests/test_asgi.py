@@ -0,0 +1,116 @@
+# /tests/test_asgi.py
+
+"""
+ASGI modu (app/asgi.py): native async handler'lar Flask yoluyla aynı yanıtı
+vermelidir. Her istek hem Flask test istemcisine hem AsyncApp'e gönderilir;
+durum kodu, gövde ve ETag karşılaştırılır.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from app.asgi import AsyncApp
+from app.async_db import async_db
+from app.models import ListingType
+
+
+@pytest.fixture
+def asgi_app(app):
+    """AsyncApp; Flask'a iletilen (async handler'ın cevaplamadığı) yollar 'forwarded'e yazılır."""
+    async_db.init_app(app)
+    asgi_app = AsyncApp(app)
+    asgi_app.forwarded = []
+    wsgi = asgi_app.wsgi
+
+    async def forward(scope, receive, send):
+        asgi_app.forwarded.append(scope['path'])
+        await wsgi(scope, receive, send)
+
+    asgi_app.wsgi = forward
+    yield asgi_app
+    asyncio.run(async_db.dispose())
+
+
+@pytest.fixture
+def compare(client, asgi_app):
+    """Aynı isteği iki yoldan yapar, ikisinin de aynı olduğunu doğrular; Flask yanıtını döner."""
+    async def asgi_get(path, headers):
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as async_client:
+            return await async_client.get(path, headers=headers)
+
+    def check(path, headers=None, native=True):
+        headers = headers or {}
+        expected = client.get(path, headers=headers)
+        asgi_app.forwarded.clear()
+        actual = asyncio.run(asgi_get(path, headers))
+        assert bool(asgi_app.forwarded) != native, path
+        assert actual.status_code == expected.status_code, path
+        assert actual.headers.get('etag') == expected.headers.get('ETag'), path
+        assert actual.content.strip() == expected.get_data().strip(), path
+        return expected
+    return check
+
+
+@pytest.fixture
+def marketplace(client, make_user, make_listing, auth):
+    """İki satıcı, bir alıcı; bir satış ve bir kiralama işlemi."""
+    seller, other, buyer = make_user('satici'), make_user('diger'), make_user('alici')
+    sale = make_listing(seller, title='Kamera', category='elektronik', price=250)
+    rent = make_listing(seller, ListingType.RENT, title='Çadır', category='kamp', rental_price_per_day=15)
+    make_listing(other, title='Bisiklet', category='spor', price=900)
+    make_listing(other, ListingType.SWAP, title='Gitar', category='muzik', swap_preference='Keman')
+
+    assert client.post('/api/transactions/buy', json={'listing_id': sale},
+                       headers=auth(buyer)).status_code == 201
+    start = date.today() + timedelta(days=1)
+    assert client.post('/api/transactions/rent', headers=auth(buyer), json={
+        'listing_id': rent, 'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=3)).isoformat()}).status_code == 201
+    return {'seller': seller, 'buyer': buyer, 'sale': sale, 'rent': rent}
+
+
+def test_listings_feed_parity(compare, marketplace):
+    first = compare('/api/listings/?limit=1')
+    assert first.get_json()['next_cursor']
+    compare(f'/api/listings/?limit=1&after={first.get_json()["next_cursor"]}')
+    compare('/api/listings/?listing_type=rent&facets=1')
+    compare('/api/listings/?sort=price_desc&min_price=10&category=spor')
+    compare('/api/listings/?sort=fiyat')
+    compare('/api/listings/?limit=abc')
+    compare('/api/listings/', headers={'If-None-Match': first.headers['ETag'].replace('limit=1', '')})
+    not_modified = compare('/api/listings/?limit=1', headers={'If-None-Match': first.headers['ETag']})
+    assert not_modified.status_code == 304
+
+
+def test_listing_details_parity(compare, marketplace):
+    found = compare(f'/api/listings/{marketplace["rent"]}')
+    assert found.status_code == 200
+    assert compare(f'/api/listings/{marketplace["rent"]}',
+                   headers={'If-None-Match': found.headers['ETag']}).status_code == 304
+    assert compare('/api/listings/9999').status_code == 404
+
+
+def test_my_purchases_parity(compare, marketplace, auth):
+    response = compare('/api/transactions/my_purchases', headers=auth(marketplace['buyer']))
+    assert len(response.get_json()['purchases']) == 1
+    assert compare('/api/transactions/my_purchases', native=False).status_code == 401
+
+
+def test_my_rentals_parity(compare, marketplace, auth):
+    response = compare('/api/transactions/my_rentals', headers=auth(marketplace['buyer']))
+    assert len(response.get_json()['rentals']) == 1
+    assert compare('/api/transactions/my_rentals',
+                   headers={'Authorization': 'Bearer gecersiz'}, native=False).status_code == 422
+
+
+def test_received_parity(compare, marketplace, auth):
+    headers = auth(marketplace['seller'])
+    response = compare('/api/transactions/received', headers=headers)
+    assert len(response.get_json()['received_transactions']) == 2
+    compare('/api/transactions/received?type=rent&status=pending', headers=headers)
+    compare('/api/transactions/received?limit=1', headers=headers)
+    assert compare('/api/transactions/received?status=bilinmiyor', headers=headers).status_code == 400
@@ -0,0 +1,61 @@
+# /tests/test_auth.py
+
+"""Giriş: bilinmeyen kullanıcı adları bcrypt havuzunu kullanmaz ama aynı sürede yanıtlanır."""
+
+import statistics
+import time
+
+from app import create_app, db
+from app.hashing import password_hasher
+from app.models import User
+from tests.conftest import TestConfig
+
+
+def test_login_unknown_user_skips_hash_pool(app, client):
+    password_hasher.shutdown()
+    response = client.post('/api/auth/login', json={'username': 'yok', 'password': 'gizli-sifre'})
+    assert response.status_code == 401
+    assert password_hasher._executor is None
+
+
+def test_login_known_user(app, client):
+    with app.app_context():
+        user = User(username='ayse', email='ayse@example.com')
+        user.set_password('gizli-sifre')
+        db.session.add(user)
+        db.session.commit()
+
+    wrong = client.post('/api/auth/login', json={'username': 'ayse', 'password': 'yanlis'})
+    assert wrong.status_code == 401
+    response = client.post('/api/auth/login', json={'username': 'ayse', 'password': 'gizli-sifre'})
+    assert response.status_code == 200
+    assert response.get_json()['access_token']
+
+
+def test_unknown_and_known_logins_take_about_the_same_time(tmp_path):
+    class SlowHashConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "auth.db"}'
+        BCRYPT_LOG_ROUNDS = 10  # ~50 ms: ölçüm gürültüsünden belirgin şekilde büyük
+
+    app = create_app(SlowHashConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username='ayse', email='ayse@example.com')
+        user.set_password('gizli-sifre')
+        db.session.add(user)
+        db.session.commit()
+    client = app.test_client()
+
+    def median_login_seconds(username):
+        durations = []
+        for _ in range(5):
+            started = time.perf_counter()
+            response = client.post('/api/auth/login', json={'username': username, 'password': 'yanlis'})
+            durations.append(time.perf_counter() - started)
+            assert response.status_code == 401
+        return statistics.median(durations)
+
+    known, unknown = median_login_seconds('ayse'), median_login_seconds('yok')
+    assert 0.6 < unknown / known < 1.6
+    with app.app_context():
+        db.engine.dispose()
@@ -0,0 +1,98 @@
+# /tests/test_availability.py
+
+"""Kiralama takvimi: IntervalIndex ve GET /api/listings/<id>/availability."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.availability import IntervalIndex
+from app.models import ListingType, Transaction, TransactionStatus
+
+
+def d(day, month=7):
+    return date(2026, month, day)
+
+
+# --- IntervalIndex ---
+
+def test_intervals_are_merged_and_sorted():
+    index = IntervalIndex([(d(10), d(12)), (d(1), d(3)), (d(2), d(5)), (d(5), d(7)), (d(20), d(20))])
+    # Çakışan ve uç uca değen aralıklar birleşir; boş aralık (start == end) atılır
+    assert index.busy == [(d(1), d(7)), (d(10), d(12))]
+    assert len(index) == 2
+
+
+@pytest.mark.parametrize('start, end, free', [
+    (d(7), d(10), True),     # iki dolu aralığın tam arası (uçlar yarı açık)
+    (d(6), d(8), False),     # ilk aralığın sonuyla çakışır
+    (d(9), d(11), False),    # ikinci aralığın başıyla çakışır
+    (d(1), d(2), False),     # aynı gün başlar
+    (d(8), d(9), True),
+    (d(12), d(30), True),    # son aralığın bitiş günü başlayabilir
+    (d(1, 6), d(1), True),   # ilk aralık başlangıcında biter
+    (d(1, 6), d(20), False)  # tüm aralıkları kapsar
+])
+def test_is_free(start, end, free):
+    index = IntervalIndex([(d(1), d(7)), (d(10), d(12))])
+    assert index.is_free(start, end) is free
+
+
+def test_busy_and_free_are_clipped_to_window():
+    index = IntervalIndex([(d(1), d(7)), (d(10), d(12)), (d(20), d(25))])
+    assert index.busy_between(d(5), d(21)) == [(d(5), d(7)), (d(10), d(12)), (d(20), d(21))]
+    assert index.free_between(d(5), d(21)) == [(d(7), d(10)), (d(12), d(20))]
+    # Pencere dolu bir aralıkla bitiyor / başlıyor
+    assert index.free_between(d(7), d(10)) == [(d(7), d(10))]
+    assert index.free_between(d(2), d(6)) == []
+    assert IntervalIndex().free_between(d(1), d(2)) == [(d(1), d(2))]
+
+
+# --- Endpoint ---
+
+@pytest.fixture
+def rental(app, make_user, make_listing):
+    owner, renter = make_user('sahip'), make_user('kiraci')
+    listing_id = make_listing(owner, ListingType.RENT)
+    rows = [(d(1), d(5), TransactionStatus.COMPLETED), (d(5), d(8), TransactionStatus.PENDING),
+            (d(15), d(20), TransactionStatus.CANCELLED), (d(25), d(28), TransactionStatus.COMPLETED)]
+    with app.app_context():
+        for start, end, status in rows:
+            db.session.add(Transaction(listing_id=listing_id, buyer_or_renter_id=renter,
+                                       transaction_type=ListingType.RENT, total_price=Decimal('10'),
+                                       status=status, start_date=start, end_date=end))
+        db.session.commit()
+    return listing_id
+
+
+def test_availability_window(client, rental):
+    body = client.get(f'/api/listings/{rental}/availability?from=2026-07-03&to=2026-07-27').get_json()
+    # İptal edilenler dolu sayılmaz; bekleyen talepler sayılır
+    assert body['busy'] == [{'start': '2026-07-03', 'end': '2026-07-08'},
+                            {'start': '2026-07-25', 'end': '2026-07-27'}]
+    assert body['free'] == [{'start': '2026-07-08', 'end': '2026-07-25'}]
+    assert 'checks' not in body
+
+
+def test_availability_checks(client, rental):
+    response = client.get(f'/api/listings/{rental}/availability?from=2026-07-01&to=2026-07-10'
+                          '&check=2026-07-08..2026-07-25,2026-07-07..2026-07-09,2026-07-27..2026-08-02')
+    assert response.status_code == 200
+    assert [check['free'] for check in response.get_json()['checks']] == [True, False, False]
+
+
+@pytest.mark.parametrize('query', [
+    'from=2026-13-01', 'from=dun', 'to=2026-07-01&from=2026-07-01', 'from=2026-07-10&to=2026-07-01',
+    'from=2026-01-01&to=2027-06-01', 'check=2026-07-01', 'check=2026-07-05..2026-07-01',
+    'check=2026-07-01..x', 'check=' + ','.join(['2026-07-01..2026-07-02'] * 51)
+])
+def test_availability_rejects_bad_params(client, rental, query):
+    assert client.get(f'/api/listings/{rental}/availability?{query}').status_code == 400
+
+
+def test_availability_only_for_rent_listings(client, make_user, make_listing):
+    sale = make_listing(make_user('satici'))
+    assert client.get(f'/api/listings/{sale}/availability').status_code == 400
+    assert client.get('/api/listings/9999/availability').status_code == 404
@@ -0,0 +1,112 @@
+# /tests/test_booking.py
+
+"""
+Kiralama çakışma koruması (app/booking.py) — migration'la kurulmuş şemada:
+SQLite BEFORE INSERT/UPDATE tetikleyicileri, bekleyen çakışan taleplerin
+toplu iptali ve iptal edilen talebin tarihleri boşaltması.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.booking import is_rental_overlap_error
+from app.models import ListingType, Transaction, TransactionStatus
+
+
+@pytest.fixture
+def app(migrated_app):
+    return migrated_app
+
+
+@pytest.fixture
+def rent_setup(app, make_user, make_listing):
+    owner, ali, ayse = make_user('sahip'), make_user('ali'), make_user('ayse')
+    return {'owner': owner, 'ali': ali, 'ayse': ayse, 'listing': make_listing(owner, ListingType.RENT)}
+
+
+def _day(offset):
+    return date.today() + timedelta(days=offset)
+
+
+def _add_request(app, listing_id, renter, start, end, status=TransactionStatus.PENDING):
+    """rent_listing'in erken kontrolünü atlayan (aynı anda gelmiş gibi) bir kiralama satırı."""
+    with app.app_context():
+        transaction = Transaction(listing_id=listing_id, buyer_or_renter_id=renter,
+                                  transaction_type=ListingType.RENT, total_price=Decimal('10'),
+                                  status=status, start_date=start, end_date=end)
+        db.session.add(transaction)
+        db.session.commit()
+        return transaction.id
+
+
+def _status(app, transaction_id):
+    with app.app_context():
+        return db.session.get(Transaction, transaction_id).status
+
+
+def _respond(client, auth, owner, transaction_id, action='accept'):
+    return client.post(f'/api/transactions/rent/respond/{transaction_id}',
+                       json={'action': action}, headers=auth(owner))
+
+
+def test_migration_installs_overlap_triggers(app, rent_setup):
+    listing = rent_setup['listing']
+    _add_request(app, listing, rent_setup['ali'], _day(1), _day(5), TransactionStatus.COMPLETED)
+    # Uç uca değen aralık serbest ([start, end))
+    _add_request(app, listing, rent_setup['ayse'], _day(5), _day(8), TransactionStatus.COMPLETED)
+
+    with pytest.raises(IntegrityError) as error:
+        _add_request(app, listing, rent_setup['ayse'], _day(4), _day(6), TransactionStatus.COMPLETED)
+    assert is_rental_overlap_error(error.value)
+
+
+def test_accept_cancels_overlapping_pending_requests(app, client, auth, rent_setup):
+    listing = rent_setup['listing']
+    first = _add_request(app, listing, rent_setup['ali'], _day(1), _day(5))
+    overlapping = _add_request(app, listing, rent_setup['ayse'], _day(3), _day(7))
+    separate = _add_request(app, listing, rent_setup['ayse'], _day(5), _day(9))
+
+    response = _respond(client, auth, rent_setup['owner'], first)
+    assert response.status_code == 200
+    assert response.get_json()['auto_cancelled_requests'] == 1
+    assert _status(app, first) == TransactionStatus.COMPLETED
+    assert _status(app, overlapping) == TransactionStatus.CANCELLED
+    assert _status(app, separate) == TransactionStatus.PENDING
+
+
+def test_second_overlapping_accept_is_rejected_by_trigger(app, client, auth, rent_setup):
+    listing = rent_setup['listing']
+    first = _add_request(app, listing, rent_setup['ali'], _day(1), _day(5))
+    second = _add_request(app, listing, rent_setup['ayse'], _day(3), _day(7))
+
+    # Aynı anda gelen başka bir onay: ilk talep, ikinciyi iptal etme fırsatı olmadan onaylandı
+    with app.app_context():
+        db.session.execute(update(Transaction).where(Transaction.id == first)
+                           .values(status=TransactionStatus.COMPLETED))
+        db.session.commit()
+
+    response = _respond(client, auth, rent_setup['owner'], second)
+    assert response.status_code == 409
+    assert _status(app, second) == TransactionStatus.PENDING
+
+
+def test_cancelled_request_frees_its_dates(app, client, auth, rent_setup):
+    listing, owner = rent_setup['listing'], rent_setup['owner']
+    body = {'listing_id': listing, 'start_date': _day(1).isoformat(), 'end_date': _day(5).isoformat()}
+
+    first = client.post('/api/transactions/rent', json=body, headers=auth(rent_setup['ali']))
+    assert first.status_code == 201
+    assert client.post('/api/transactions/rent', json=body, headers=auth(rent_setup['ayse'])).status_code == 409
+
+    assert _respond(client, auth, owner, first.get_json()['transaction_id'], 'reject').status_code == 200
+    availability = client.get(f'/api/listings/{listing}/availability?from={_day(0)}&to={_day(10)}')
+    assert availability.get_json()['busy'] == []
+
+    second = client.post('/api/transactions/rent', json=body, headers=auth(rent_setup['ayse']))
+    assert second.status_code == 201
+    assert _respond(client, auth, owner, second.get_json()['transaction_id']).status_code == 200
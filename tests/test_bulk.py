@@ -0,0 +1,115 @@
+# /tests/test_bulk.py
+
+"""Toplu ürün / ilan oluşturma (app/bulk.py): önce doğrulama, öğe bazında hatalar."""
+
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import Listing, Product
+
+
+def _product(**listing):
+    item = {'title': 'Kamera', 'category': 'elektronik'}
+    if listing:
+        item['listing'] = listing
+    return item
+
+
+def test_products_bulk_creates_products_and_listings(app, client, auth, make_user):
+    owner = make_user('ayse')
+    response = client.post('/api/products/bulk', headers=auth(owner), json={'items': [
+        _product(listing_type='sale', price='19.99'),
+        _product(listing_type='rent', rental_price_per_day=15),
+        _product(listing_type='swap', swap_preference='bisiklet'),
+        _product()
+    ]})
+    assert response.status_code == 201
+    results = response.get_json()['results']
+    assert [result['listing_id'] is not None for result in results] == [True, True, True, False]
+
+    with app.app_context():
+        assert db.session.get(Listing, results[0]['listing_id']).price == Decimal('19.99')
+        assert db.session.get(Listing, results[1]['listing_id']).rental_price_per_day == Decimal('15')
+
+
+@pytest.mark.parametrize('listing', [
+    {'listing_type': 'sale', 'price': 'abc'},
+    {'listing_type': 'sale', 'price': -5},
+    {'listing_type': 'sale', 'price': 0},
+    {'listing_type': 'sale', 'price': True},
+    {'listing_type': 'sale', 'price': 'NaN'},
+    {'listing_type': 'sale', 'price': '1.999'},
+    {'listing_type': 'sale', 'price': '1000000000'},
+    {'listing_type': 'sale', 'price': [1]},
+    {'listing_type': 'rent', 'rental_price_per_day': 'on'},
+    {'listing_type': 'rent'},
+    {'listing_type': 'swap', 'swap_preference': {'a': 1}},
+    {'listing_type': 'kiralık'},
+])
+def test_products_bulk_reports_invalid_listing_per_item(app, client, auth, make_user, listing):
+    owner = make_user('ayse')
+    response = client.post('/api/products/bulk', headers=auth(owner),
+                           json={'items': [_product(listing_type='sale', price=10), _product(**listing)]})
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [1]
+    with app.app_context():
+        assert db.session.query(Product).count() == 0
+
+
+@pytest.mark.parametrize('item', [
+    {'title': 'Kamera'},
+    {'title': ['Kamera'], 'category': 'elektronik'},
+    {'title': 'Kamera', 'category': 'elektronik', 'image_url': 5},
+    {'title': 'K' * 201, 'category': 'elektronik'},
+    'Kamera',
+])
+def test_products_bulk_rejects_invalid_product_fields(client, auth, make_user, item):
+    response = client.post('/api/products/bulk', headers=auth(make_user('ayse')), json={'items': [item]})
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['index'] == 0
+
+
+@pytest.mark.parametrize('body', [{}, {'items': []}, {'items': 'x'}, [1, 2]])
+def test_products_bulk_rejects_bad_envelope(client, auth, make_user, body):
+    response = client.post('/api/products/bulk', headers=auth(make_user('ayse')), json=body)
+    assert response.status_code == 400
+
+
+def test_listings_bulk_validates_prices_and_ownership(app, client, auth, make_user):
+    owner, other = make_user('ayse'), make_user('mehmet')
+    with app.app_context():
+        products = [Product(title=f'Ürün {i}', category='ev', owner_id=owner) for i in range(3)]
+        foreign = Product(title='Başkasının', category='ev', owner_id=other)
+        db.session.add_all(products + [foreign])
+        db.session.commit()
+        product_ids, foreign_id = [product.id for product in products], foreign.id
+
+    response = client.post('/api/listings/bulk', headers=auth(owner), json={'items': [
+        {'product_id': product_ids[0], 'listing_type': 'sale', 'price': 'abc'},
+        {'product_id': foreign_id, 'listing_type': 'sale', 'price': 10},
+        {'product_id': [product_ids[1]], 'listing_type': 'sale', 'price': 10},
+        {'product_id': product_ids[2], 'listing_type': 'rent', 'rental_price_per_day': -1},
+    ]})
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [0, 1, 2, 3]
+
+    response = client.post('/api/listings/bulk', headers=auth(owner), json={'items': [
+        {'product_id': product_ids[0], 'listing_type': 'sale', 'price': '25.50'},
+        {'product_id': product_ids[1], 'listing_type': 'swap', 'swap_preference': 'kitap'},
+    ]})
+    assert response.status_code == 201
+
+
+def test_create_listing_validates_price(app, client, auth, make_user):
+    owner = make_user('ayse')
+    with app.app_context():
+        product = Product(title='Kamera', category='elektronik', owner_id=owner)
+        db.session.add(product)
+        db.session.commit()
+        product_id = product.id
+
+    response = client.post('/api/listings/', headers=auth(owner),
+                           json={'product_id': product_id, 'listing_type': 'sale', 'price': 'abc'})
+    assert response.status_code == 400
@@ -0,0 +1,53 @@
+# /tests/test_buy.py
+
+"""
+POST /api/transactions/buy: ilan tek bir compare-and-set UPDATE ile
+"kapılır" (app/atomic.py). Yarışı kaybeden istek 410 alır ve geride
+işlem satırı bırakmaz.
+"""
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import atomic, db
+from app.models import Listing, Transaction
+
+BUY = '/api/transactions/buy'
+
+
+@pytest.fixture
+def sale(make_user, make_listing):
+    seller, buyer = make_user('satici'), make_user('alici')
+    return {'buyer': buyer, 'rival': make_user('rakip'), 'listing': make_listing(seller)}
+
+
+def _transaction_count(app):
+    with app.app_context():
+        return db.session.scalar(select(func.count(Transaction.id)))
+
+
+def test_cas_loser_gets_410_and_leaves_no_transaction(app, client, auth, sale, monkeypatch):
+    real_deactivate = atomic.deactivate_listing
+
+    def deactivate_after_rival(listing_id, *criteria, **kwargs):
+        # Rakip alıcı, bu isteğin UPDATE'inden hemen önce ilanı kendi bağlantısında kapar
+        with db.engine.begin() as connection:
+            connection.execute(update(Listing).where(Listing.id == listing_id).values(is_active=False))
+        return real_deactivate(listing_id, *criteria, **kwargs)
+
+    monkeypatch.setattr(atomic, 'deactivate_listing', deactivate_after_rival)
+
+    response = client.post(BUY, json={'listing_id': sale['listing']}, headers=auth(sale['buyer']))
+    assert response.status_code == 410
+    assert _transaction_count(app) == 0
+    with app.app_context():
+        assert db.session.get(Listing, sale['listing']).is_active is False
+
+
+def test_second_buyer_gets_410(app, client, auth, sale):
+    first = client.post(BUY, json={'listing_id': sale['listing']}, headers=auth(sale['buyer']))
+    assert first.status_code == 201
+
+    second = client.post(BUY, json={'listing_id': sale['listing']}, headers=auth(sale['rival']))
+    assert second.status_code == 410
+    assert _transaction_count(app) == 1
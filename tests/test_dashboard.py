@@ -0,0 +1,115 @@
+# /tests/test_dashboard.py
+
+"""
+Satıcı paneli (GET /api/transactions/received, app/dashboard.py): sayfa ve
+filtrelenmiş kümenin toplamları tek sorguda; boş sayfada da toplamlar;
+cursor ile sayfalama.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import ListingType, Transaction, TransactionStatus
+
+RECEIVED = '/api/transactions/received'
+
+
+@pytest.fixture
+def seller_data(app, make_user, make_listing):
+    """
+    Satıcının ilanlarına gelen 5 işlem (en yenisi en büyük id), ayrıca başka
+    bir satıcıya gelen ve toplamlara girmemesi gereken bir işlem.
+    """
+    seller, buyer, other = make_user('satici'), make_user('alici'), make_user('baska')
+    sale = make_listing(seller, ListingType.SALE, title='Kamera')
+    rent = make_listing(seller, ListingType.RENT, title='Çadır')
+    foreign = make_listing(other, ListingType.SALE, title='Saat')
+
+    rows = [
+        (sale, ListingType.SALE, TransactionStatus.COMPLETED, '100'),
+        (rent, ListingType.RENT, TransactionStatus.COMPLETED, '30'),
+        (rent, ListingType.RENT, TransactionStatus.PENDING, '20'),
+        (sale, ListingType.SALE, TransactionStatus.CANCELLED, '100'),
+        (rent, ListingType.RENT, TransactionStatus.COMPLETED, '45'),
+        (foreign, ListingType.SALE, TransactionStatus.COMPLETED, '999'),
+    ]
+    created = datetime(2026, 1, 1)
+    with app.app_context():
+        ids = []
+        for offset, (listing_id, listing_type, status, price) in enumerate(rows):
+            rental = listing_type == ListingType.RENT
+            transaction = Transaction(
+                listing_id=listing_id, buyer_or_renter_id=buyer, transaction_type=listing_type,
+                total_price=Decimal(price), status=status, created_at=created + timedelta(days=offset),
+                start_date=date(2026, 2, 1) + timedelta(days=10 * offset) if rental else None,
+                end_date=date(2026, 2, 4) + timedelta(days=10 * offset) if rental else None)
+            db.session.add(transaction)
+            db.session.flush()
+            ids.append(transaction.id)
+        db.session.commit()
+    return {'seller': seller, 'ids': ids[:5]}
+
+
+def _get(client, auth, seller, **params):
+    response = client.get(RECEIVED, headers=auth(seller), query_string=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_page_and_totals_in_one_query(client, auth, seller_data):
+    response = _get(client, auth, seller_data['seller'])
+    body = response.get_json()
+
+    assert response.headers['Server-Timing'].endswith('desc="1 queries"')
+    assert [row['transaction_id'] for row in body['received_transactions']] == seller_data['ids'][::-1]
+    assert body['totals']['count'] == 5
+    assert Decimal(str(body['totals']['revenue'])) == Decimal('175')
+    assert body['totals']['by_status'] == {'pending': 1, 'completed': 3, 'cancelled': 1}
+    assert body['next_cursor'] is None
+
+
+def test_totals_follow_filters_not_page(client, auth, seller_data):
+    body = _get(client, auth, seller_data['seller'], type='rent', limit=1).get_json()
+
+    assert [row['transaction_id'] for row in body['received_transactions']] == [seller_data['ids'][4]]
+    assert body['totals']['count'] == 3
+    assert Decimal(str(body['totals']['revenue'])) == Decimal('75')
+    assert body['totals']['by_status'] == {'pending': 1, 'completed': 2, 'cancelled': 0}
+
+
+def test_empty_page_still_has_totals(client, auth, make_user, seller_data):
+    body = _get(client, auth, seller_data['seller'], status='completed', to='2025-12-31').get_json()
+    assert body['received_transactions'] == []
+    assert body['totals'] == {'count': 0, 'revenue': 0,
+                              'by_status': {'pending': 0, 'completed': 0, 'cancelled': 0}}
+    assert body['next_cursor'] is None
+
+    # Hiç işlemi olmayan satıcı
+    body = _get(client, auth, make_user('yeni')).get_json()
+    assert body['received_transactions'] == [] and body['totals']['count'] == 0
+
+
+def test_cursor_paging_walks_every_row_once(client, auth, seller_data):
+    seen, after = [], None
+    while True:
+        params = {'limit': 2, **({'after': after} if after else {})}
+        response = _get(client, auth, seller_data['seller'], **params)
+        assert response.headers['Server-Timing'].endswith('desc="1 queries"')
+        body = response.get_json()
+        # Her sayfada toplamlar kümenin tamamına aittir
+        assert body['totals']['count'] == 5
+        seen.extend(row['transaction_id'] for row in body['received_transactions'])
+        after = body['next_cursor']
+        if after is None:
+            break
+
+    assert seen == seller_data['ids'][::-1]
+    assert len(seen) == 5
+
+
+def test_invalid_cursor_is_rejected(client, auth, seller_data):
+    response = client.get(RECEIVED, headers=auth(seller_data['seller']), query_string={'after': 'bozuk'})
+    assert response.status_code == 400
@@ -0,0 +1,26 @@
+# /tests/test_db_pool.py
+
+"""Veritabanı desteği başlangıçta kontrol edilir."""
+
+import pytest
+
+from app import create_app
+from app.db_pool import UnsupportedDatabase, check_dialects
+from tests.conftest import TestConfig
+
+
+@pytest.mark.parametrize('config', [
+    {'SQLALCHEMY_DATABASE_URI': 'mysql+pymysql://root@localhost/kiralama'},
+    {'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'DB_REPLICA_URLS': ['mssql://sa@localhost/kiralama']},
+    {'SQLALCHEMY_DATABASE_URI': 'veritabani'}
+])
+def test_unsupported_database_fails_at_startup(config):
+    with pytest.raises(UnsupportedDatabase):
+        check_dialects(config)
+    with pytest.raises(UnsupportedDatabase):
+        create_app(type('Config_', (TestConfig,), config))
+
+
+def test_supported_databases():
+    check_dialects({'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg2://postgres@localhost/kiralama',
+                    'DB_REPLICA_URLS': ['sqlite:////tmp/replica.db']})
@@ -0,0 +1,29 @@
+# /tests/test_explain_check.py
+
+"""
+'flask explain-check' (app/explain_check.py): sıcak endpoint sorguları test
+şemasında (create_all ve migration'lar) tam tablo taraması yapmamalıdır.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.explain_check import run_explain_check
+
+
+@pytest.fixture(params=['app', 'migrated_app'])
+def schema_app(request):
+    return request.getfixturevalue(request.param)
+
+
+def test_hot_queries_use_indexes(schema_app):
+    with schema_app.app_context():
+        assert run_explain_check() == []
+
+
+def test_missing_index_is_reported(app):
+    with app.app_context():
+        db.session.execute(text('DROP INDEX ix_products_owner_id'))
+        db.session.commit()
+        assert ('GET /api/products', ['products']) in run_explain_check()
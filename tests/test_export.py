@@ -0,0 +1,61 @@
+# /tests/test_export.py
+
+"""İlan kataloğu dışa aktarımı (GET /api/listings/export)."""
+
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import db
+from app.models import Listing, Product
+from tests.conftest import INTERNAL_TOKEN
+
+HEADERS = {'X-Internal-Token': INTERNAL_TOKEN}
+
+
+def _rows(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_requires_internal_token(client):
+    assert client.get('/api/listings/export').status_code == 403
+    assert client.get('/api/listings/export', headers={'X-Internal-Token': 'yanlis'}).status_code == 403
+
+
+def test_export_streams_whole_catalogue(client, make_user, make_listing):
+    owner = make_user('ayse')
+    ids = [make_listing(owner), make_listing(owner, is_active=False)]
+
+    response = client.get('/api/listings/export', headers=HEADERS)
+    assert response.status_code == 200
+    assert [row['listing_id'] for row in _rows(response)] == ids
+
+    csv_response = client.get('/api/listings/export?format=csv', headers=HEADERS)
+    assert csv_response.get_data(as_text=True).splitlines()[0].startswith('listing_id,')
+
+
+def test_export_updated_since_unions_listing_and_product_changes(app, client, make_user, make_listing):
+    owner = make_user('ayse')
+    unchanged, listing_changed, product_changed, both_changed = (make_listing(owner) for _ in range(4))
+    old, recent = datetime(2020, 1, 1), datetime.utcnow() + timedelta(days=1)
+
+    with app.app_context():
+        db.session.execute(update(Listing).values(updated_at=old))
+        db.session.execute(update(Product).values(updated_at=old))
+        db.session.execute(update(Listing).where(Listing.id.in_([listing_changed, both_changed]))
+                           .values(updated_at=recent))
+        product_ids = db.session.query(Listing.product_id) \
+            .filter(Listing.id.in_([product_changed, both_changed])).scalar_subquery()
+        db.session.execute(update(Product).where(Product.id.in_(product_ids)).values(updated_at=recent))
+        db.session.commit()
+
+    since = (recent - timedelta(hours=1)).isoformat()
+    response = client.get(f'/api/listings/export?updated_since={since}', headers=HEADERS)
+    assert response.status_code == 200
+    assert [row['listing_id'] for row in _rows(response)] == [listing_changed, product_changed, both_changed]
+
+
+def test_export_rejects_bad_params(client):
+    assert client.get('/api/listings/export?format=xml', headers=HEADERS).status_code == 400
+    assert client.get('/api/listings/export?updated_since=dun', headers=HEADERS).status_code == 400
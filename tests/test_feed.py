@@ -0,0 +1,82 @@
+# /tests/test_feed.py
+
+"""GET /api/listings/: filtreler, fiyat sıralaması, keyset sayfalama ve facet'ler."""
+
+import pytest
+
+from app.models import ListingType
+
+
+@pytest.fixture
+def catalogue(make_user, make_listing):
+    seller = make_user('satici')
+    return {
+        'kamera': make_listing(seller, title='Kamera', category='elektronik', price=300),
+        'telefon': make_listing(seller, title='Telefon', category='elektronik', price=150),
+        'bisiklet': make_listing(seller, title='Bisiklet', category='spor', price=150),
+        'cadir': make_listing(seller, ListingType.RENT, title='Çadır', category='spor', rental_price_per_day=20),
+        'gitar': make_listing(seller, ListingType.SWAP, title='Gitar', category='muzik', swap_preference='kamera'),
+        'eski': make_listing(seller, title='Eski', category='elektronik', price=50, is_active=False)
+    }
+
+
+def _ids(response):
+    assert response.status_code == 200, response.get_json()
+    return [listing['listing_id'] for listing in response.get_json()['listings']]
+
+
+def _all_pages(client, query):
+    ids, after = [], ''
+    while True:
+        response = client.get(f'/api/listings/?{query}&limit=2&after={after}')
+        ids += _ids(response)
+        after = response.get_json()['next_cursor']
+        if after is None:
+            return ids
+
+
+@pytest.mark.parametrize('query', [
+    'listing_type=auction', 'sort=cheapest', 'min_price=abc', 'max_price=-1', 'min_price=NaN',
+    'min_price=100&max_price=50', 'limit=0', 'after=bozuk', 'sort=price_asc&after=bozuk'
+])
+def test_feed_rejects_invalid_params(client, catalogue, query):
+    response = client.get(f'/api/listings/?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['message']
+
+
+def test_feed_filters(client, catalogue):
+    assert set(_ids(client.get('/api/listings/'))) == set(catalogue.values()) - {catalogue['eski']}
+    assert _ids(client.get('/api/listings/?listing_type=rent')) == [catalogue['cadir']]
+    assert set(_ids(client.get('/api/listings/?category=spor'))) == {catalogue['bisiklet'], catalogue['cadir']}
+    # Liste fiyatı: satışta fiyat, kiralamada günlük kira; takas ilanının fiyatı yok
+    assert set(_ids(client.get('/api/listings/?min_price=20&max_price=150'))) == \
+        {catalogue['telefon'], catalogue['bisiklet'], catalogue['cadir']}
+
+
+def test_feed_price_sort_pages(client, catalogue):
+    # Aynı fiyatta (150) id sıralamayla aynı yönde; fiyatı olmayan takas ilanı kümede yok
+    assert _all_pages(client, 'sort=price_asc') == \
+        [catalogue['cadir'], catalogue['telefon'], catalogue['bisiklet'], catalogue['kamera']]
+    descending = _all_pages(client, 'sort=price_desc')
+    assert descending == [catalogue['kamera'], catalogue['bisiklet'], catalogue['telefon'], catalogue['cadir']]
+    assert _all_pages(client, 'sort=newest') == sorted(set(catalogue.values()) - {catalogue['eski']}, reverse=True)
+
+
+def test_feed_facets_are_disjunctive(client, catalogue):
+    facets = client.get('/api/listings/?category=spor&listing_type=sale&facets=1').get_json()['facets']
+    assert facets['total'] == 1
+    # Kategori sayıları seçili kategoriyi yok sayar (türe göre filtreli)
+    assert facets['category'] == [{'value': 'elektronik', 'count': 2}, {'value': 'spor', 'count': 1}]
+    # Tür sayıları seçili türü yok sayar (kategoriye göre filtreli)
+    assert facets['listing_type'] == [{'value': 'sale', 'count': 1}, {'value': 'rent', 'count': 1},
+                                      {'value': 'swap', 'count': 0}]
+    assert 'facets' not in client.get('/api/listings/').get_json()
+
+
+def test_feed_etag_depends_on_filters(client, catalogue):
+    spor = client.get('/api/listings/?category=spor')
+    elektronik = client.get('/api/listings/?category=elektronik')
+    assert spor.headers['ETag'] != elektronik.headers['ETag']
+    assert client.get('/api/listings/?category=elektronik',
+                      headers={'If-None-Match': spor.headers['ETag']}).status_code == 200
@@ -0,0 +1,29 @@
+# /tests/test_internal.py
+
+"""/api/internal/* erişimi: X-Internal-Token zorunlu, token ayarlı değilse kapalı."""
+
+import pytest
+
+from tests.conftest import INTERNAL_TOKEN
+
+INTERNAL_PATHS = ['/api/internal/cache', '/api/internal/db-pool', '/api/internal/queries',
+                  '/api/internal/startup', '/api/internal/matchmaking']
+
+
+@pytest.mark.parametrize('path', INTERNAL_PATHS)
+def test_requires_token(client, path):
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={'X-Internal-Token': 'yanlis'}).status_code == 403
+    assert client.get(path, headers={'X-Internal-Token': INTERNAL_TOKEN}).status_code == 200
+
+
+@pytest.mark.parametrize('path', INTERNAL_PATHS)
+def test_closed_without_configured_token(app, client, path):
+    app.config.update(INTERNAL_API_TOKEN=None, TESTING=False, DEBUG=False)
+    assert client.get(path).status_code == 404
+    assert client.get(path, headers={'X-Internal-Token': ''}).status_code == 404
+
+
+def test_open_without_token_in_testing(app, client):
+    app.config.update(INTERNAL_API_TOKEN=None)
+    assert client.get('/api/internal/cache').status_code == 200
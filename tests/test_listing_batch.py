@@ -0,0 +1,78 @@
+# /tests/test_listing_batch.py
+
+"""Çoklu okuma: GET /api/listings/?ids= ve POST /api/listings/batch."""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from app.models import Listing
+from app.versioning import bump_collection_version
+
+
+@pytest.fixture
+def two_listings(make_user, make_listing):
+    owner = make_user('ayse')
+    return make_listing(owner, title='Bir'), make_listing(owner, title='İki')
+
+
+def test_batch_accepts_object_body(client, two_listings):
+    first, second = two_listings
+    response = client.post('/api/listings/batch', json={'ids': [second, first, 999]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [listing['listing_id'] for listing in body['listings']] == [second, first]
+    assert body['missing_ids'] == [999]
+
+
+def test_batch_accepts_bare_list(client, two_listings):
+    first, second = two_listings
+    response = client.post('/api/listings/batch', json=[first, str(second)])
+    assert response.status_code == 200
+    assert [listing['listing_id'] for listing in response.get_json()['listings']] == [first, second]
+
+
+@pytest.mark.parametrize('body', [
+    {'ids': [True, 1]},
+    {'ids': [1.5]},
+    {'ids': ['1e3']},
+    {'ids': ['²']},
+    {'ids': [None]},
+    {'ids': []},
+    {'ids': 'abc'},
+    {},
+    'metin',
+    42,
+])
+def test_batch_rejects_invalid_ids(client, two_listings, body):
+    response = client.post('/api/listings/batch', json=body)
+    assert response.status_code == 400
+
+
+def test_batch_rejects_too_many_ids(client):
+    response = client.post('/api/listings/batch', json={'ids': list(range(1, 102))})
+    assert response.status_code == 400
+
+
+def test_query_string_ids(client, two_listings):
+    first, second = two_listings
+    assert client.get(f'/api/listings/?ids={first},{second}').status_code == 200
+    assert client.get('/api/listings/?ids=1,x').status_code == 400
+
+
+def test_batch_does_not_serve_entries_older_than_a_primary_commit(app, client, two_listings):
+    """Başka bir worker'ın commit'i bu sürecin L1'ini temizlemez; /batch yine yeni değeri döner."""
+    first, _ = two_listings
+    assert client.post('/api/listings/batch', json=[first]).status_code == 200  # önbelleğe yazılır
+
+    with app.app_context():
+        db.session.execute(update(Listing).where(Listing.id == first)
+                           .values(price=Decimal('300'), is_active=False))
+        bump_collection_version()
+        db.session.commit()
+
+    [listing] = client.post('/api/listings/batch', json=[first]).get_json()['listings']
+    assert listing['is_active'] is False
+    assert Decimal(str(listing['price'])) == Decimal('300')
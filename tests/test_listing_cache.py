@@ -0,0 +1,132 @@
+# /tests/test_listing_cache.py
+
+"""ETag (app/versioning.py) ve entity_cache (app/cache.py) sözleşmesi."""
+
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from app import db
+from app.cache import entity_cache, LocalSharedCache
+from app.models import Listing
+from app.versioning import bump_collection_version, get_collection_version
+
+
+def _get(client, listing_id, etag=None):
+    headers = {'If-None-Match': f'"{etag}"'} if etag else {}
+    return client.get(f'/api/listings/{listing_id}', headers=headers)
+
+
+def test_detail_etag_and_not_modified(client, make_user, make_listing):
+    listing_id = make_listing(make_user('ayse'))
+
+    first = _get(client, listing_id)
+    assert first.status_code == 200
+    etag = first.headers['ETag'].strip('"')
+
+    again = _get(client, listing_id, etag)
+    assert again.status_code == 304
+    assert again.headers['ETag'].strip('"') == etag
+
+
+def test_update_changes_etag_and_body(client, auth, make_user, make_listing):
+    owner = make_user('ayse')
+    listing_id = make_listing(owner, price=Decimal('100'))
+    etag = _get(client, listing_id).headers['ETag'].strip('"')
+
+    response = client.put(f'/api/listings/{listing_id}', headers=auth(owner), json={'price': '250'})
+    assert response.status_code == 200
+
+    fresh = _get(client, listing_id, etag)
+    assert fresh.status_code == 200
+    assert fresh.headers['ETag'].strip('"') != etag
+    assert Decimal(str(fresh.get_json()['listing']['price'])) == Decimal('250')
+
+
+def test_commit_in_another_process_is_not_served_under_new_etag(app, client, make_user, make_listing):
+    """Başka bir worker'ın commit'i bu sürecin L1'ini temizlemez; sürüm damgası eski kaydı eler."""
+    listing_id = make_listing(make_user('ayse'), price=Decimal('100'))
+    _get(client, listing_id)  # önbelleğe yazılır
+
+    # ORM olayları çalışmadan (L1 temizlenmeden) değişiklik + sürüm artışı
+    with app.app_context():
+        db.session.execute(update(Listing).where(Listing.id == listing_id).values(price=Decimal('300')))
+        bump_collection_version()
+        db.session.commit()
+
+    response = _get(client, listing_id)
+    assert response.status_code == 200
+    assert Decimal(str(response.get_json()['listing']['price'])) == Decimal('300')
+
+
+def test_entry_from_older_version_is_a_miss(app, client, make_user, make_listing):
+    """Gecikmeli replikadan eski sürümle yazılmış kayıt, yeni sürümdeki okumada kullanılmaz."""
+    listing_id = make_listing(make_user('ayse'), price=Decimal('100'))
+    with app.app_context():
+        version = get_collection_version()
+    stale_before = entity_cache.stats_dict()['stale']
+    entity_cache.get_or_load(f'listing:{listing_id}',
+                             lambda: ({'listing_id': listing_id, 'price': 'eski'}, ()),
+                             version=version - 1)
+
+    response = _get(client, listing_id)
+    assert response.get_json()['listing']['price'] != 'eski'
+    assert entity_cache.stats_dict()['stale'] == stale_before + 1
+
+
+def test_multi_get_uses_versioned_entries(app, client, make_user, make_listing):
+    listing_id = make_listing(make_user('ayse'), price=Decimal('100'))
+    client.get(f'/api/listings/?ids={listing_id}')
+
+    with app.app_context():
+        db.session.execute(update(Listing).where(Listing.id == listing_id).values(price=Decimal('120')))
+        bump_collection_version()
+        db.session.commit()
+
+    body = client.get(f'/api/listings/?ids={listing_id}').get_json()
+    assert Decimal(str(body['listings'][0]['price'])) == Decimal('120')
+
+
+def test_compare_and_set_write_invalidates_detail(client, auth, make_user, make_listing):
+    """ORM flush'ı olmayan yazma (satın alma CAS'ı) da sürümü artırır ve kaydı siler."""
+    seller, buyer = make_user('ayse'), make_user('ali')
+    listing_id = make_listing(seller)
+    etag = _get(client, listing_id).headers['ETag'].strip('"')
+
+    assert client.post('/api/transactions/buy', json={'listing_id': listing_id},
+                       headers=auth(buyer)).status_code == 201
+
+    response = _get(client, listing_id, etag)
+    assert response.status_code == 200
+    assert response.get_json()['listing']['is_active'] is False
+
+
+def test_product_update_invalidates_listing_detail(client, auth, make_user, make_listing):
+    owner = make_user('ayse')
+    listing_id = make_listing(owner, title='Kamera')
+    first = _get(client, listing_id).get_json()['listing']
+
+    response = client.put(f'/api/products/{first["product_details"]["product_id"]}',
+                          json={'title': 'Aynasız kamera'}, headers=auth(owner))
+    assert response.status_code == 200
+    assert _get(client, listing_id).get_json()['listing']['product_details']['title'] == 'Aynasız kamera'
+
+
+def test_entry_promoted_from_shared_cache_is_invalidated_on_commit(app, client, auth, make_user, make_listing):
+    """L2'den L1'e alınan kayıt etiketlerini korur; sonraki commit onu da siler."""
+    owner = make_user('ayse')
+    listing_id = make_listing(owner, price=Decimal('100'))
+    entity_cache.shared = LocalSharedCache()
+    try:
+        assert client.post('/api/listings/batch', json=[listing_id]).status_code == 200
+        entity_cache.local.clear()  # başka bir worker gibi: L1 boş, kayıt sadece L2'de
+        assert client.post('/api/listings/batch', json=[listing_id]).status_code == 200
+        assert f'listing:{listing_id}' in entity_cache.local._entries
+
+        assert client.put(f'/api/listings/{listing_id}', headers=auth(owner),
+                          json={'price': '250'}).status_code == 200
+        assert f'listing:{listing_id}' not in entity_cache.local._entries
+        [listing] = client.post('/api/listings/batch', json=[listing_id]).get_json()['listings']
+        assert Decimal(str(listing['price'])) == Decimal('250')
+    finally:
+        entity_cache.shared = None
@@ -0,0 +1,115 @@
+# /tests/test_query_budget.py
+
+"""
+Sorgu bütçesi / N+1 dedektörü (app/query_budget.py): her QUERY_BUDGET_MODE
+için endpoint düzeyinde davranış. Uygulamaya sadece teste ait rotalar eklenir.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app, db
+from app.models import Listing, ListingType, Product, User
+from app.query_budget import QueryBudgetExceeded, query_budget, query_monitor
+from tests.conftest import TestConfig
+
+LISTINGS = 6
+
+
+@query_budget(1)
+def _over_budget():
+    for _ in range(3):
+        db.session.execute(text('SELECT 1'))
+    return {'ok': True}
+
+
+@query_budget(1)
+def _within_budget():
+    db.session.execute(text('SELECT 1'))
+    return {'ok': True}
+
+
+def _n_plus_one():
+    # Bütçe bildirmez (QUERY_BUDGET_DEFAULT None); her ilan için ürün ayrı yüklenir
+    return {'titles': [listing.product.title for listing in Listing.query.all()]}
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Verilen modda, test rotaları eklenmiş ve LISTINGS ilanla doldurulmuş bir uygulama."""
+    apps = []
+
+    def make(mode):
+        config = type('BudgetConfig', (TestConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / f"{mode}.db"}',
+            'QUERY_BUDGET_MODE': mode})
+        app = create_app(config)
+        app.add_url_rule('/budget-test/over', view_func=_over_budget)
+        app.add_url_rule('/budget-test/within', view_func=_within_budget)
+        app.add_url_rule('/budget-test/n-plus-one', view_func=_n_plus_one)
+        with app.app_context():
+            db.create_all()
+            user = User(username='satici', email='satici@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            for index in range(LISTINGS):
+                product = Product(title=f'Ürün {index}', category='elektronik', owner_id=user.id)
+                db.session.add(product)
+                db.session.flush()
+                db.session.add(Listing(product_id=product.id, lister_id=user.id,
+                                       listing_type=ListingType.SALE, price=100))
+            db.session.commit()
+        query_monitor.stats.clear()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    query_monitor.stats.clear()
+
+
+def test_raise_mode_raises_on_budget_overrun(make_app):
+    client = make_app('raise').test_client()
+
+    response = client.get('/budget-test/within')
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].endswith('desc="1 queries"')
+
+    with pytest.raises(QueryBudgetExceeded, match='3 sorgu çalıştı, bütçe 1'):
+        client.get('/budget-test/over')
+
+
+def test_warn_mode_logs_and_still_responds(make_app, caplog):
+    client = make_app('warn').test_client()
+
+    with caplog.at_level(logging.WARNING):
+        response = client.get('/budget-test/over')
+    assert response.status_code == 200
+    assert 'Sorgu bütçesi' in caplog.text and '3 sorgu çalıştı, bütçe 1' in caplog.text
+    assert query_monitor.stats.as_dict()['_over_budget']['violations'] == 1
+
+
+def test_n_plus_one_loop_is_detected(make_app, caplog):
+    with pytest.raises(QueryBudgetExceeded, match=f'olası N\\+1: aynı sorgu {LISTINGS} kez'):
+        make_app('raise').test_client().get('/budget-test/n-plus-one')
+
+    with caplog.at_level(logging.WARNING):
+        response = make_app('warn').test_client().get('/budget-test/n-plus-one')
+    assert response.status_code == 200
+    assert f'olası N+1: aynı sorgu {LISTINGS} kez' in caplog.text
+
+
+def test_off_mode_does_not_measure(make_app, caplog):
+    client = make_app('off').test_client()
+
+    with caplog.at_level(logging.WARNING):
+        response = client.get('/budget-test/n-plus-one')
+    assert response.status_code == 200
+    assert 'Server-Timing' not in response.headers
+    assert 'Sorgu bütçesi' not in caplog.text
+    assert query_monitor.stats.as_dict() == {}
@@ -0,0 +1,148 @@
+# /tests/test_replicas.py
+
+"""
+Replika yönlendirmesi: yapışıklık arka ucunun başlangıç kontrolü ve iki
+SQLite dosyasıyla (primary + replika) okuma/yazma ayrımı.
+"""
+
+import logging
+import shutil
+import sqlite3
+
+import pytest
+
+from app import create_app, db
+from app.cache import LocalSharedCache, LRUCache, entity_cache
+from app.replicas import ReplicaConfigError, replica_router
+from tests.conftest import TestConfig
+
+
+@pytest.fixture(autouse=True)
+def _forget_replica_binds():
+    # db.init_app her bind için (boş) bir MetaData açar; sonraki testlerin
+    # db.create_all()'u replika bind'i aramasın
+    yield
+    for key in [key for key in db.metadatas if key and key.startswith('replica_')]:
+        del db.metadatas[key]
+
+
+def _config(tmp_path, **overrides):
+    attrs = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+             'DB_REPLICA_URLS': [f'sqlite:///{tmp_path / "replica.db"}'], **overrides}
+    return type('ReplicaConfig', (TestConfig,), attrs)
+
+
+def test_replicas_require_shared_sticky_backend(tmp_path):
+    with pytest.raises(ReplicaConfigError):
+        create_app(_config(tmp_path, TESTING=False))
+
+
+def test_replicas_accept_shared_sticky_backend(tmp_path):
+    backend = LocalSharedCache()
+    create_app(_config(tmp_path, TESTING=False, REPLICA_STICKY_BACKEND=backend))
+    assert replica_router.sticky is backend
+
+
+def test_replicas_fall_back_to_local_sticky_in_testing(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING):
+        create_app(_config(tmp_path))
+    assert isinstance(replica_router.sticky, LRUCache)
+    assert 'REPLICA_STICKY_BACKEND' in caplog.text
+
+
+def test_no_replicas_needs_no_sticky_backend(tmp_path):
+    create_app(_config(tmp_path, TESTING=False, DB_REPLICA_URLS=[]))
+    assert isinstance(replica_router.sticky, LRUCache)
+
+
+# --- Yönlendirme: primary.db'ye yazılır, replica.db onun eski bir kopyasıdır ---
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(_config(tmp_path, REPLICA_STICKY_BACKEND=LocalSharedCache()))
+    with app.app_context():
+        db.create_all()
+    entity_cache.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    entity_cache.clear()
+
+
+@pytest.fixture
+def replicate(app, tmp_path):
+    """Primary'nin o anki halini replikaya kopyalar; sonraki yazmalar replikaya ulaşmaz."""
+    def copy():
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        shutil.copy(tmp_path / 'primary.db', tmp_path / 'replica.db')
+    return copy
+
+
+def _count(path, table):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f'SELECT count(*) FROM {table}').fetchone()[0]
+
+
+def _feed_ids(client, headers=None):
+    response = client.get('/api/listings/', headers=headers)
+    assert response.status_code == 200
+    return [listing['listing_id'] for listing in response.get_json()['listings']]
+
+
+def test_read_only_endpoint_reads_from_replica(app, client, auth, make_user, make_listing, replicate):
+    seller = make_user('satici')
+    replicated = make_listing(seller, title='Eski')
+    replicate()
+    primary_only = make_listing(seller, title='Yeni')
+    before = replica_router.stats.as_dict()
+
+    assert _feed_ids(client) == [replicated]
+    assert replica_router.stats.as_dict()['replica'] == before['replica'] + 1
+
+    # @read_only olmayan endpoint primary'den okur
+    response = client.get('/api/listings/my_listings', headers=auth(seller))
+    assert [listing['listing_id'] for listing in response.get_json()['my_listings']] == [primary_only, replicated]
+    assert primary_only not in _feed_ids(client)
+
+
+def test_flush_and_dml_writes_go_to_primary(app, client, auth, make_user, tmp_path, replicate):
+    seller = make_user('satici')
+    replicate()
+
+    # ORM flush
+    assert client.post('/api/products/', headers=auth(seller),
+                       json={'title': 'Kamera', 'category': 'elektronik'}).status_code == 201
+    # Flush'sız toplu INSERT
+    assert client.post('/api/products/bulk', headers=auth(seller), json={'items': [
+        {'title': 'Tripod', 'category': 'elektronik',
+         'listing': {'listing_type': 'sale', 'price': 50}}]}).status_code == 201
+
+    assert _count(tmp_path / 'primary.db', 'products') == 2
+    assert _count(tmp_path / 'primary.db', 'listings') == 1
+    assert _count(tmp_path / 'replica.db', 'products') == 0
+    assert _count(tmp_path / 'replica.db', 'listings') == 0
+
+
+def test_writer_reads_own_write_from_primary(app, client, auth, make_user, make_listing, tmp_path, replicate):
+    seller, buyer = make_user('satici'), make_user('alici')
+    replicated = make_listing(seller, title='Eski')
+    replicate()
+
+    response = client.post('/api/products/bulk', headers=auth(seller), json={'items': [
+        {'title': 'Kamera', 'category': 'elektronik',
+         'listing': {'listing_type': 'sale', 'price': 100}}]})
+    assert response.status_code == 201
+    assert _count(tmp_path / 'replica.db', 'listings') == 1  # replika henüz almadı
+    before = replica_router.stats.as_dict()
+
+    writer_feed = _feed_ids(client, headers=auth(seller))
+    assert len(writer_feed) == 2 and replicated in writer_feed
+    assert replica_router.stats.as_dict()['primary_sticky'] == before['primary_sticky'] + 1
+
+    # Yazmayan kullanıcı ve anonim okumalar replikada kalır
+    assert _feed_ids(client, headers=auth(buyer)) == [replicated]
+    assert _feed_ids(client) == [replicated]
@@ -0,0 +1,73 @@
+# /tests/test_search.py
+
+"""
+GET /api/listings/search — migration'la kurulmuş şemada (products_fts):
+sıralama, çok kelimeli aramanın VE anlamı ve ürün düzenlenince indeksin
+güncellenmesi.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app import db
+from app.models import Listing, ListingType
+
+
+@pytest.fixture
+def app(migrated_app):
+    return migrated_app
+
+
+@pytest.fixture
+def seller(make_user):
+    return make_user('satici')
+
+
+@pytest.fixture
+def add_listing(app, client, auth, seller):
+    """Ürünü API üzerinden (arama indeksiyle birlikte) ekler, aktif bir ilan açar."""
+    def add(title, category='elektronik', description=None):
+        response = client.post('/api/products/', headers=auth(seller), json={
+            'title': title, 'category': category, 'description': description})
+        assert response.status_code == 201
+        product_id = response.get_json()['product']['id']
+        with app.app_context():
+            listing = Listing(product_id=product_id, lister_id=seller,
+                              listing_type=ListingType.SALE, price=Decimal('100'))
+            db.session.add(listing)
+            db.session.commit()
+            return product_id, listing.id
+    return add
+
+
+def _search(client, q):
+    response = client.get('/api/listings/search', query_string={'q': q})
+    assert response.status_code == 200
+    return [listing['listing_id'] for listing in response.get_json()['listings']]
+
+
+def test_title_match_ranks_above_description_match(client, add_listing):
+    _, in_description = add_listing('Tripod', description='kamera için sağlam ayak')
+    _, in_title = add_listing('Kamera', description='aynasız gövde')
+
+    assert _search(client, 'kamera') == [in_title, in_description]
+
+
+def test_multi_word_query_requires_every_word(client, add_listing):
+    _, both = add_listing('Dijital kamera', description='aynasız')
+    add_listing('Dijital saat')
+    add_listing('Film kamera')
+
+    assert _search(client, 'dijital kamera') == [both]
+
+
+def test_product_edit_updates_search_index(client, auth, seller, add_listing):
+    product_id, listing_id = add_listing('Bisiklet', category='spor')
+    assert _search(client, 'bisiklet') == [listing_id]
+
+    response = client.put(f'/api/products/{product_id}', headers=auth(seller),
+                          json={'title': 'Scooter'})
+    assert response.status_code == 200
+    assert _search(client, 'bisiklet') == []
+    assert _search(client, 'scooter') == [listing_id]
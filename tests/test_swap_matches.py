@@ -0,0 +1,61 @@
+# /tests/test_swap_matches.py
+
+"""GET /api/swap/matches: parametre doğrulaması ve karşılıklı / döngü eşleşmeleri."""
+
+import pytest
+
+from app.models import ListingType
+
+
+@pytest.fixture
+def swap_ring(make_user, make_listing):
+    """Üç kullanıcı: kamera -> bisiklet -> gitar -> kamera döngüsü, ayrıca kamera <-> saat karşılıklı."""
+    ali, ayse, mehmet, zeynep = (make_user(name) for name in ('ali', 'ayse', 'mehmet', 'zeynep'))
+    listings = {
+        'kamera': make_listing(ali, ListingType.SWAP, title='Kamera', category='foto',
+                               swap_preference='bisiklet veya saat'),
+        'bisiklet': make_listing(ayse, ListingType.SWAP, title='Bisiklet', category='spor',
+                                 swap_preference='gitar'),
+        'gitar': make_listing(mehmet, ListingType.SWAP, title='Gitar', category='muzik',
+                              swap_preference='kamera'),
+        'saat': make_listing(zeynep, ListingType.SWAP, title='Saat', category='aksesuar',
+                             swap_preference='kamera')
+    }
+    return {'users': {'ali': ali, 'ayse': ayse}, 'listings': listings}
+
+
+@pytest.mark.parametrize('query', [
+    'listing_id=abc', 'listing_id=-1', 'listing_id=1.5',
+    'max_length=abc', 'max_length=1', 'limit=0', 'limit=abc'
+])
+def test_matches_rejects_invalid_params(client, auth, make_user, query):
+    response = client.get(f'/api/swap/matches?{query}', headers=auth(make_user('ali')))
+    assert response.status_code == 400
+
+
+def test_matches_requires_auth(client):
+    assert client.get('/api/swap/matches').status_code == 401
+
+
+def test_mutual_and_cycle_matches(client, auth, swap_ring):
+    listings = swap_ring['listings']
+    response = client.get('/api/swap/matches', headers=auth(swap_ring['users']['ali']))
+    assert response.status_code == 200
+    [match] = response.get_json()['matches']
+    assert match['listing']['listing_id'] == listings['kamera']
+    assert [item['listing_id'] for item in match['mutual']] == [listings['saat']]
+    [cycle] = [cycle for cycle in match['cycles'] if cycle['length'] == 3]
+    assert {item['listing_id'] for item in cycle['listings']} == \
+        {listings['kamera'], listings['bisiklet'], listings['gitar']}
+
+
+def test_matches_max_length_and_listing_filter(client, auth, swap_ring):
+    headers = auth(swap_ring['users']['ali'])
+    listings = swap_ring['listings']
+
+    response = client.get('/api/swap/matches?max_length=2', headers=headers)
+    assert all(cycle['length'] == 2 for cycle in response.get_json()['matches'][0]['cycles'])
+
+    # Başkasının ilanı: boş sonuç
+    response = client.get(f'/api/swap/matches?listing_id={listings["gitar"]}', headers=headers)
+    assert response.get_json() == {'matches': []}
@@ -0,0 +1,90 @@
+# /tests/test_swap_offers.py
+
+"""Takas teklifi listeleri: ?status filtresi, keyset sayfalama, yetki ve gelen kutusu."""
+
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models import Listing, ListingType, OfferStatus, SwapOffer
+
+
+@pytest.fixture
+def offers_setup(app, make_user, make_listing):
+    """Bir takas ilanına iki kullanıcıdan beş teklif (aynı created_at; sıra id'den)."""
+    owner, ali, ayse = make_user('sahip'), make_user('ali'), make_user('ayse')
+    target = make_listing(owner, ListingType.SWAP, title='Gitar', swap_preference='kamera')
+    products = {user: make_listing(user, title='Kamera') for user in (ali, ayse)}
+    statuses = [OfferStatus.PENDING, OfferStatus.REJECTED, OfferStatus.PENDING,
+                OfferStatus.ACCEPTED, OfferStatus.PENDING]
+    created_at = datetime(2026, 1, 1, 12, 0)
+
+    with app.app_context():
+        product_ids = {user: db.session.get(Listing, listing_id).product_id
+                       for user, listing_id in products.items()}
+        offer_ids = []
+        for index, status in enumerate(statuses):
+            offerer = ali if index % 2 == 0 else ayse
+            offer = SwapOffer(target_listing_id=target, offerer_id=offerer,
+                              offered_product_id=product_ids[offerer], status=status,
+                              created_at=created_at)
+            db.session.add(offer)
+            db.session.flush()
+            offer_ids.append(offer.id)
+        db.session.commit()
+    return {'owner': owner, 'ali': ali, 'target': target, 'offer_ids': offer_ids}
+
+
+def _ids(response, key):
+    return [offer['offer_id'] for offer in response.get_json()[key]]
+
+
+@pytest.mark.parametrize('query', ['status=beklemede', 'status=PENDING', 'limit=0', 'limit=abc', 'after=bozuk'])
+def test_offer_lists_reject_invalid_params(client, auth, offers_setup, query):
+    owner = auth(offers_setup['owner'])
+    received = client.get(f'/api/swap/offers/received/{offers_setup["target"]}?{query}', headers=owner)
+    assert received.status_code == 400
+    sent = client.get(f'/api/swap/offers/sent?{query}', headers=auth(offers_setup['ali']))
+    assert sent.status_code == 400
+
+
+def test_received_offers_status_filter_and_pages(client, auth, offers_setup):
+    headers = auth(offers_setup['owner'])
+    url = f'/api/swap/offers/received/{offers_setup["target"]}'
+    newest_first = offers_setup['offer_ids'][::-1]
+
+    pending = client.get(f'{url}?status=pending', headers=headers)
+    assert _ids(pending, 'offers') == [offer_id for index, offer_id in enumerate(newest_first)
+                                       if index % 2 == 0]
+
+    seen, after = [], ''
+    while True:
+        response = client.get(f'{url}?limit=2&after={after}', headers=headers)
+        assert response.status_code == 200
+        seen += _ids(response, 'offers')
+        after = response.get_json()['next_cursor']
+        if after is None:
+            break
+    assert seen == newest_first
+
+
+def test_received_offers_owner_only(client, auth, offers_setup):
+    url = f'/api/swap/offers/received/{offers_setup["target"]}'
+    assert client.get(url, headers=auth(offers_setup['ali'])).status_code == 403
+    assert client.get('/api/swap/offers/received/9999', headers=auth(offers_setup['owner'])).status_code == 404
+
+
+def test_sent_offers_status_filter(client, auth, offers_setup):
+    headers = auth(offers_setup['ali'])
+    ali_offers = offers_setup['offer_ids'][::2][::-1]
+    assert _ids(client.get('/api/swap/offers/sent', headers=headers), 'sent_offers') == ali_offers
+    assert _ids(client.get('/api/swap/offers/sent?status=accepted', headers=headers), 'sent_offers') == []
+
+
+def test_inbox_counts_pending_offers(client, auth, offers_setup):
+    response = client.get('/api/swap/offers/inbox', headers=auth(offers_setup['owner']))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total_pending'] == 3
+    assert [item['listing_id'] for item in body['listings']] == [offers_setup['target']]
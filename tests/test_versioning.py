@@ -0,0 +1,69 @@
+# /tests/test_versioning.py
+
+"""Koleksiyon sürüm artışı: commit'ten önceki son ifade olmalı, rollback'te yapılmamalı."""
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Listing
+from app.versioning import get_collection_version
+
+
+@pytest.fixture
+def statements(app):
+    """Birincil engine'de çalışan SQL ifadeleri ve COMMIT'ler (sırasıyla)."""
+    log = []
+    with app.app_context():
+        engine = db.engine
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        log.append(' '.join(statement.split()))
+
+    def on_commit(conn):
+        log.append('COMMIT')
+
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    event.listen(engine, 'commit', on_commit)
+    yield log
+    event.remove(engine, 'before_cursor_execute', on_execute)
+    event.remove(engine, 'commit', on_commit)
+
+
+def _statement_before_commit(log):
+    return log[log.index('COMMIT') - 1]
+
+
+def test_orm_write_bumps_version_last(client, auth, make_user, make_listing, statements):
+    owner = make_user('ayse')
+    listing_id = make_listing(owner)
+    statements.clear()
+
+    response = client.put(f'/api/listings/{listing_id}', json={'price': '120'}, headers=auth(owner))
+    assert response.status_code == 200
+    assert _statement_before_commit(statements).startswith('UPDATE collection_versions')
+
+
+def test_compare_and_set_bumps_version_last(client, auth, make_user, make_listing, statements):
+    seller, buyer = make_user('ayse'), make_user('ali')
+    listing_id = make_listing(seller)
+    statements.clear()
+
+    response = client.post('/api/transactions/buy', json={'listing_id': listing_id}, headers=auth(buyer))
+    assert response.status_code == 201
+    writes = [sql for sql in statements[:statements.index('COMMIT')] if not sql.startswith('SELECT')]
+    assert writes[0].startswith('UPDATE listings')
+    assert writes[-1].startswith('UPDATE collection_versions')
+    assert sum(sql.startswith('UPDATE collection_versions') for sql in writes) == 1
+
+
+def test_rollback_discards_pending_bump(app, make_user, make_listing):
+    owner = make_user('ayse')
+    listing_id = make_listing(owner)
+    with app.app_context():
+        before = get_collection_version()
+        db.session.get(Listing, listing_id).is_active = False
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        assert get_collection_version() == before
@@ -0,0 +1,26 @@
+# /wsgi.py
+
+"""
+Production WSGI giriş noktası.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preload_app ile bu modülü worker'lar fork edilmeden önce
+ana süreçte bir kez yükler: uygulama kurulur, ısıtılır (app/warmup.py) ve
+worker'lar hazır durumu devralır. Geliştirme için run.py kullanılmaya devam eder.
+"""
+
+import time
+
+_started = time.perf_counter()
+
+from app import create_app
+from app.warmup import startup_report, warmup, release_connections
+
+app = create_app()
+startup_report.app_ready(time.perf_counter() - _started)
+
+if app.config.get('WARMUP_ENABLED', True):
+    warmup(app)
+    # Bağlantılar worker'larda (post_fork) yeniden açılır
+    release_connections(app)